@@ -182,12 +182,12 @@ class AsyncAgentBase(ABC):
         await self.timeout_handler.acknowledge_message(message_id)
         
         # Create ACK message
-        ack_header = MessageHeader(
+        ack_header = MessageHeader.reply_for(
+            header,
             sender=self.agent_name,
             receiver=sender,
             message_type=MessageType.ACK.value,
-            priority=MessagePriority.LOW.value,
-            reply_to=message_id
+            priority=MessagePriority.LOW.value
         )
         
         ack_message = AcknowledgmentMessage(
@@ -210,13 +210,12 @@ class AsyncAgentBase(ABC):
         """Send error message"""
         header = original_message.get("header", {})
         
-        error_header = MessageHeader(
+        error_header = MessageHeader.reply_for(
+            header,
             sender=self.agent_name,
             receiver=AgentType.MASTER_ORCHESTRATOR.value,
             message_type=MessageType.ERROR.value,
-            priority=MessagePriority.HIGH.value,
-            correlation_id=header.get("correlation_id", ""),
-            reply_to=header.get("message_id")
+            priority=MessagePriority.HIGH.value
         )
         
         error_message = ErrorMessage(
@@ -4,11 +4,17 @@ Aggregates feedback and diagnosis data to identify quality issues and generate C
 """
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
+import os
+import threading
+from bisect import bisect_right
+from itertools import islice
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from collections import defaultdict, Counter
 from dataclasses import dataclass, field, asdict
 from enum import Enum
+from heapq import nlargest
+from operator import attrgetter, itemgetter
 import json
 import statistics
 
@@ -17,6 +23,66 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _to_epoch(dt: datetime) -> float:
+    """Convert a datetime to epoch seconds, treating naive values as UTC"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _cutoff_epoch(days: float) -> float:
+    """Epoch seconds for ``days`` before the current UTC time"""
+    return _to_epoch(datetime.utcnow() - timedelta(days=days))
+
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+
+
+def _json_array_chunks(header: Dict[str, Any], key: str, items: Iterable[Any]) -> Iterator[bytes]:
+    """Yield a JSON object as byte chunks: header fields, then ``key`` as an array of items"""
+    yield json.dumps(header)[:-1].encode() + f", {json.dumps(key)}: [".encode()
+    separator = b""
+    for item in items:
+        yield separator + json.dumps(item).encode()
+        separator = b", "
+    yield b"]}"
+
+
+def _write_chunks(filepath: str, chunks: Iterable[bytes]):
+    """
+    Write byte chunks to filepath without joining them first
+    
+    Uses scatter-gather os.writev in batches of at most IOV_MAX buffers
+    where available, falling back to buffered writes elsewhere.
+    """
+    if not hasattr(os, "writev"):
+        with open(filepath, 'wb') as f:
+            f.writelines(chunks)
+        return
+    
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        chunks = iter(chunks)
+        while True:
+            batch = list(islice(chunks, _IOV_MAX))
+            if not batch:
+                break
+            remaining = sum(map(len, batch))
+            written = os.writev(fd, batch)
+            if written < remaining:
+                # Short write: push out the unwritten tail of the batch
+                tail = memoryview(b"".join(batch))[written:]
+                while tail:
+                    tail = tail[os.write(fd, tail):]
+    finally:
+        os.close(fd)
+
+
 class FailureSeverity(Enum):
     """Failure severity levels"""
     LOW = 1
@@ -34,6 +100,13 @@ class ActionStatus(Enum):
     REJECTED = "rejected"
 
 
+# Plain status strings for hot loops (CAPA/action records store .value)
+_STATUS_PENDING = ActionStatus.PENDING.value
+_STATUS_IN_PROGRESS = ActionStatus.IN_PROGRESS.value
+_STATUS_COMPLETED = ActionStatus.COMPLETED.value
+_STATUS_VERIFIED = ActionStatus.VERIFIED.value
+
+
 @dataclass
 class FailureRecord:
     """Individual failure record"""
@@ -50,6 +123,10 @@ class FailureRecord:
     diagnosis_data: Dict[str, Any] = field(default_factory=dict)
     customer_feedback: Dict[str, Any] = field(default_factory=dict)
     
+    def __post_init__(self):
+        # Parsed once so time-window filters compare floats, not ISO strings
+        self._ts_epoch = _to_epoch(datetime.fromisoformat(self.timestamp))
+    
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
@@ -69,8 +146,17 @@ class ComponentAnalysis:
     severity_distribution: Dict[str, int]
     trend: str  # "increasing", "stable", "decreasing"
     
+    def __setattr__(self, name, value):
+        # Any field assignment invalidates the cached to_dict() result
+        object.__setattr__(self, name, value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
+    
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        """Serialized view, rebuilt only after a field is reassigned (treat as read-only)"""
+        if self._dict_cache is None:
+            self._dict_cache = asdict(self)
+        return self._dict_cache
 
 
 @dataclass
@@ -118,6 +204,7 @@ class ManufacturingInsightsModule:
         
         # Data storage
         self.failure_records: List[FailureRecord] = []
+        self._failure_epochs: List[float] = []  # Sorted, parallel to failure_records
         self.capa_reports: List[CAPAReport] = []
         self.component_analyses: Dict[str, ComponentAnalysis] = {}
         
@@ -125,9 +212,10 @@ class ManufacturingInsightsModule:
         self.action_tracking: Dict[str, Dict[str, Any]] = {}
         self.impact_measurements: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         
-        # Callbacks
-        self.urgent_alert_callbacks: List[callable] = []
-        self.report_callbacks: List[callable] = []
+        # Callbacks (immutable snapshots, replaced under lock on registration)
+        self.urgent_alert_callbacks: Tuple[Callable, ...] = ()
+        self.report_callbacks: Tuple[Callable, ...] = ()
+        self._callback_lock = threading.Lock()
         
         # Running state
         self.is_running = False
@@ -191,7 +279,7 @@ class ManufacturingInsightsModule:
             customer_feedback=customer_feedback or {}
         )
         
-        self.failure_records.append(record)
+        self._add_failure_record(record)
         logger.info(f"Ingested failure record: {record.record_id} - {component}/{failure_mode}")
         
         # Check for urgent issues
@@ -199,16 +287,30 @@ class ManufacturingInsightsModule:
 
 
     
+    def _add_failure_record(self, record: FailureRecord):
+        """Insert a record keeping failure_records ordered by timestamp"""
+        epoch = record._ts_epoch
+        if not self._failure_epochs or epoch >= self._failure_epochs[-1]:
+            self.failure_records.append(record)
+            self._failure_epochs.append(epoch)
+        else:
+            idx = bisect_right(self._failure_epochs, epoch)
+            self.failure_records.insert(idx, record)
+            self._failure_epochs.insert(idx, epoch)
+    
+    def _records_since(self, cutoff_epoch: float) -> List[FailureRecord]:
+        """Records strictly newer than cutoff_epoch (a contiguous suffix)"""
+        return self.failure_records[bisect_right(self._failure_epochs, cutoff_epoch):]
+
     async def _check_urgent_issues(self, component: str, failure_mode: str):
         """Check if component/failure mode requires immediate attention"""
         # Count recent failures (last 7 days)
-        cutoff_date = datetime.utcnow() - timedelta(days=7)
+        cutoff_epoch = _cutoff_epoch(7)
         
         recent_failures = [
-            r for r in self.failure_records
+            r for r in self._records_since(cutoff_epoch)
             if r.component == component
             and r.failure_mode == failure_mode
-            and datetime.fromisoformat(r.timestamp) > cutoff_date
         ]
         
         if len(recent_failures) >= self.urgent_failure_threshold:
@@ -244,13 +346,10 @@ class ManufacturingInsightsModule:
         """
         logger.info(f"Performing RCA for last {time_window_days} days")
         
-        cutoff_date = datetime.utcnow() - timedelta(days=time_window_days)
+        cutoff_epoch = _cutoff_epoch(time_window_days)
         
         # Filter records within time window
-        recent_records = [
-            r for r in self.failure_records
-            if datetime.fromisoformat(r.timestamp) > cutoff_date
-        ]
+        recent_records = self._records_since(cutoff_epoch)
         
         if not recent_records:
             logger.warning("No failure records in time window")
@@ -328,18 +427,17 @@ class ManufacturingInsightsModule:
         failures: List[FailureRecord]
     ) -> str:
         """Calculate failure trend"""
-        now = datetime.utcnow()
-        last_30_days = now - timedelta(days=30)
-        previous_30_days = now - timedelta(days=60)
+        last_30_days = _cutoff_epoch(30)
+        previous_30_days = _cutoff_epoch(60)
         
         recent_failures = [
             f for f in failures
-            if datetime.fromisoformat(f.timestamp) > last_30_days
+            if f._ts_epoch > last_30_days
         ]
         
         previous_failures = [
             f for f in failures
-            if previous_30_days < datetime.fromisoformat(f.timestamp) <= last_30_days
+            if previous_30_days < f._ts_epoch <= last_30_days
         ]
         
         recent_count = len(recent_failures)
@@ -389,8 +487,9 @@ class ManufacturingInsightsModule:
         logger.info(f"Generated {len(reports)} CAPA reports")
         
         # Trigger callbacks
+        callbacks = self.report_callbacks
         for report in reports:
-            for callback in self.report_callbacks:
+            for callback in callbacks:
                 try:
                     await callback(report)
                 except Exception as e:
@@ -599,7 +698,7 @@ class ManufacturingInsightsModule:
         affected_batches = list(set(f.manufacturing_batch for f in failures))
         
         severity_dist = Counter(f.severity for f in failures)
-        dominant_severity = self._get_dominant_severity(dict(severity_dist))
+        dominant_severity = self._get_dominant_severity(severity_dist)
         
         report = CAPAReport(
             report_id=f"CAPA-URGENT-{len(self.capa_reports)+1:06d}",
@@ -692,7 +791,7 @@ class ManufacturingInsightsModule:
         
         # Check if all actions completed
         all_completed = all(
-            a["status"] in [ActionStatus.COMPLETED.value, ActionStatus.VERIFIED.value]
+            a["status"] in (_STATUS_COMPLETED, _STATUS_VERIFIED)
             for a in actions
         )
         
@@ -707,7 +806,7 @@ class ManufacturingInsightsModule:
                     break
         
         # Check if any in progress
-        elif any(a["status"] == ActionStatus.IN_PROGRESS.value for a in actions):
+        elif any(a["status"] == _STATUS_IN_PROGRESS for a in actions):
             tracking["overall_status"] = ActionStatus.IN_PROGRESS.value
             
             for report in self.capa_reports:
@@ -748,21 +847,22 @@ class ManufacturingInsightsModule:
             logger.warning(f"CAPA report {report_id} not yet implemented")
             return {}
         
-        implementation_date = datetime.fromisoformat(report.implementation_date)
-        measurement_end = implementation_date + timedelta(days=measurement_period_days)
+        implementation_epoch = _to_epoch(datetime.fromisoformat(report.implementation_date))
+        period_seconds = timedelta(days=measurement_period_days).total_seconds()
+        measurement_start = implementation_epoch - period_seconds
+        measurement_end = implementation_epoch + period_seconds
         
         # Get failures before and after implementation
         before_failures = [
             f for f in self.failure_records
             if f.component == report.component
-            and datetime.fromisoformat(f.timestamp) < implementation_date
-            and datetime.fromisoformat(f.timestamp) > (implementation_date - timedelta(days=measurement_period_days))
+            and measurement_start < f._ts_epoch < implementation_epoch
         ]
         
         after_failures = [
             f for f in self.failure_records
             if f.component == report.component
-            and implementation_date < datetime.fromisoformat(f.timestamp) < measurement_end
+            and implementation_epoch < f._ts_epoch < measurement_end
         ]
         
         before_count = len(before_failures)
@@ -849,17 +949,17 @@ class ManufacturingInsightsModule:
         total_capas = len(self.capa_reports)
         
         # CAPA status breakdown
-        capa_status = Counter(r.status for r in self.capa_reports)
+        capa_status = Counter(map(attrgetter('status'), self.capa_reports))
         
         # Priority breakdown
-        capa_priority = Counter(r.priority for r in self.capa_reports)
+        capa_priority = Counter(map(attrgetter('priority'), self.capa_reports))
         
         # Top failing components
-        component_failures = Counter(r.component for r in self.failure_records)
-        top_components = component_failures.most_common(10)
+        component_failures = Counter(map(attrgetter('component'), self.failure_records))
+        top_components = nlargest(10, component_failures.items(), key=itemgetter(1))
         
         # Severity distribution
-        severity_dist = Counter(r.severity for r in self.failure_records)
+        severity_dist = Counter(map(attrgetter('severity'), self.failure_records))
         
         # Impact summary
         total_reduction = 0
@@ -874,13 +974,13 @@ class ManufacturingInsightsModule:
             "generated_date": datetime.utcnow().isoformat(),
             "total_failure_records": total_failures,
             "total_capa_reports": total_capas,
-            "capa_status_breakdown": dict(capa_status),
-            "capa_priority_breakdown": dict(capa_priority),
+            "capa_status_breakdown": capa_status,
+            "capa_priority_breakdown": capa_priority,
             "top_failing_components": [
                 {"component": comp, "failures": count}
                 for comp, count in top_components
             ],
-            "severity_distribution": dict(severity_dist),
+            "severity_distribution": severity_dist,
             "impact_summary": {
                 "measured_capas": measured_capas,
                 "total_failure_reduction": total_reduction,
@@ -896,16 +996,25 @@ class ManufacturingInsightsModule:
 
 
     
-    def export_capa_reports(self, filepath: str, status_filter: Optional[str] = None):
-        """Export CAPA reports to JSON file"""
-        
-        reports_to_export = self.capa_reports
-        
+    def _capa_reports_for_export(self, status_filter: Optional[str]) -> List[CAPAReport]:
+        """CAPA reports selected by an export call"""
         if status_filter:
-            reports_to_export = [
+            return [
                 r for r in self.capa_reports
                 if r.status == status_filter
             ]
+        return self.capa_reports
+    
+    def _failure_records_for_export(self, days: Optional[int]) -> List[FailureRecord]:
+        """Failure records selected by an export call"""
+        if days:
+            return self._records_since(_cutoff_epoch(days))
+        return self.failure_records
+    
+    def export_capa_reports(self, filepath: str, status_filter: Optional[str] = None):
+        """Export CAPA reports to JSON file"""
+        
+        reports_to_export = self._capa_reports_for_export(status_filter)
         
         data = {
             "export_date": datetime.utcnow().isoformat(),
@@ -921,14 +1030,7 @@ class ManufacturingInsightsModule:
     def export_failure_records(self, filepath: str, days: Optional[int] = None):
         """Export failure records to JSON file"""
         
-        records_to_export = self.failure_records
-        
-        if days:
-            cutoff = datetime.utcnow() - timedelta(days=days)
-            records_to_export = [
-                r for r in self.failure_records
-                if datetime.fromisoformat(r.timestamp) > cutoff
-            ]
+        records_to_export = self._failure_records_for_export(days)
         
         data = {
             "export_date": datetime.utcnow().isoformat(),
@@ -954,35 +1056,82 @@ class ManufacturingInsightsModule:
         
         logger.info(f"Exported impact measurements to {filepath}")
     
-    def register_urgent_alert_callback(self, callback: callable):
+    def export_capa_reports_streaming(self, filepath: str, status_filter: Optional[str] = None):
+        """Export CAPA reports to compact JSON, serializing and writing one report at a time"""
+        
+        reports_to_export = self._capa_reports_for_export(status_filter)
+        header = {
+            "export_date": datetime.utcnow().isoformat(),
+            "total_reports": len(reports_to_export)
+        }
+        
+        _write_chunks(
+            filepath,
+            _json_array_chunks(header, "reports", (r.to_dict() for r in reports_to_export))
+        )
+        
+        logger.info(f"Exported {len(reports_to_export)} CAPA reports to {filepath}")
+    
+    def export_failure_records_streaming(self, filepath: str, days: Optional[int] = None):
+        """Export failure records to compact JSON, serializing and writing one record at a time"""
+        
+        records_to_export = self._failure_records_for_export(days)
+        header = {
+            "export_date": datetime.utcnow().isoformat(),
+            "total_records": len(records_to_export)
+        }
+        
+        _write_chunks(
+            filepath,
+            _json_array_chunks(header, "records", (r.to_dict() for r in records_to_export))
+        )
+        
+        logger.info(f"Exported {len(records_to_export)} failure records to {filepath}")
+    
+    def export_impact_measurements_streaming(self, filepath: str):
+        """Export impact measurements to compact JSON, writing one report's measurements at a time"""
+        
+        def chunks() -> Iterator[bytes]:
+            header = {"export_date": datetime.utcnow().isoformat()}
+            yield json.dumps(header)[:-1].encode() + b', "measurements": {'
+            separator = b""
+            for report_id, measurements in self.impact_measurements.items():
+                yield separator + f"{json.dumps(report_id)}: {json.dumps(measurements)}".encode()
+                separator = b", "
+            yield b"}}"
+        
+        _write_chunks(filepath, chunks())
+        
+        logger.info(f"Exported impact measurements to {filepath}")
+    
+    def register_urgent_alert_callback(self, callback: Callable):
         """Register callback for urgent alerts"""
-        self.urgent_alert_callbacks.append(callback)
+        with self._callback_lock:
+            self.urgent_alert_callbacks = self.urgent_alert_callbacks + (callback,)
     
-    def register_report_callback(self, callback: callable):
+    def register_report_callback(self, callback: Callable):
         """Register callback for new CAPA reports"""
-        self.report_callbacks.append(callback)
+        with self._callback_lock:
+            self.report_callbacks = self.report_callbacks + (callback,)
     
     def generate_summary_report(self) -> Dict[str, Any]:
         """Generate summary report of manufacturing insights"""
         
-        # Count CAPAs by status
-        pending_capas = sum(1 for r in self.capa_reports if r.status == ActionStatus.PENDING.value)
-        in_progress_capas = sum(1 for r in self.capa_reports if r.status == ActionStatus.IN_PROGRESS.value)
-        completed_capas = sum(1 for r in self.capa_reports if r.status == ActionStatus.COMPLETED.value)
+        # Count CAPAs by status (single pass)
+        capa_status = Counter(map(attrgetter('status'), self.capa_reports))
+        pending_capas = capa_status[_STATUS_PENDING]
+        in_progress_capas = capa_status[_STATUS_IN_PROGRESS]
+        completed_capas = capa_status[_STATUS_COMPLETED]
         
         # Top failing components
-        component_failures = Counter(r.component for r in self.failure_records)
-        top_components = component_failures.most_common(10)
+        component_failures = Counter(map(attrgetter('component'), self.failure_records))
+        top_components = nlargest(10, component_failures.items(), key=itemgetter(1))
         
         # Recent failures (last 30 days)
-        cutoff_date = datetime.utcnow() - timedelta(days=30)
-        recent_failures = [
-            r for r in self.failure_records
-            if datetime.fromisoformat(r.timestamp) > cutoff_date
-        ]
+        recent_failures = self._records_since(_cutoff_epoch(30))
         
         # Severity distribution
-        severity_dist = Counter(r.severity for r in self.failure_records)
+        severity_dist = Counter(map(attrgetter('severity'), self.failure_records))
         
         return {
             "total_failure_records": len(self.failure_records),
@@ -992,7 +1141,7 @@ class ManufacturingInsightsModule:
             "in_progress_capas": in_progress_capas,
             "completed_capas": completed_capas,
             "top_failing_components": top_components,
-            "severity_distribution": dict(severity_dist),
+            "severity_distribution": severity_dist,
             "total_components_analyzed": len(self.component_analyses),
             "total_impact_measurements": sum(len(m) for m in self.impact_measurements.values())
         }
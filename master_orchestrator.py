@@ -3,30 +3,72 @@ Master Orchestrator for Vehicle Maintenance Multi-Agent System
 Manages workflow state machines, task queuing, and agent coordination
 """
 
+import atexit
+import contextlib
 import logging
 import json
 import uuid
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, field, asdict
-from queue import PriorityQueue
-from collections import defaultdict
+from typing import Dict, List, Optional, Any, Callable, ClassVar
+from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue, Empty
+from collections import deque
+import functools
+import heapq
+import itertools
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # Configure logging for UEBA monitoring
+# Callers only enqueue records; a background listener thread does the file/console I/O
+_log_queue: Queue = Queue(-1)
+_log_listener = QueueListener(
+    _log_queue,
+    logging.FileHandler('orchestrator_audit.log'),
+    logging.StreamHandler()
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('orchestrator_audit.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger('MasterOrchestrator')
 
+# Audit records are pre-serialized JSON, one object per line
+_audit_handler = QueueHandler(_log_queue)
+_audit_handler.setFormatter(logging.Formatter('%(message)s'))
+audit_logger = logging.getLogger('MasterOrchestrator.audit')
+audit_logger.setLevel(logging.INFO)
+audit_logger.addHandler(_audit_handler)
+audit_logger.propagate = False
+
+
+def _audit_json(record: Dict[str, Any], indent: bool = False) -> str:
+    """Serialize an audit record (orjson when available, stdlib json otherwise)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(record, default=str, option=option).decode()
+    return json.dumps(record, default=str, indent=2 if indent else None)
+
+# Interactions kept on each workflow; the complete history is in the audit log
+MAX_RECENT_INTERACTIONS = 64
+
 
 class WorkflowState(Enum):
     """Vehicle maintenance workflow states"""
@@ -44,6 +86,12 @@ class WorkflowState(Enum):
     RETRY = "retry"
 
 
+# Cache each state's ordinal on the member for the transition bitmask table
+for _ordinal, _state in enumerate(WorkflowState):
+    _state._ordinal = _ordinal
+del _ordinal, _state
+
+
 class TaskPriority(Enum):
     """Task priority levels"""
     URGENT = 1      # Critical safety issues
@@ -62,7 +110,12 @@ class AgentType(Enum):
     MANUFACTURING_QUALITY = "manufacturing_quality_agent"
 
 
-@dataclass
+# Telemetry flags that raise a new workflow's initial priority
+_CRITICAL_INDICATORS = ('brake_failure', 'engine_critical', 'safety_system_fault')
+_WARNING_INDICATORS = ('check_engine_light', 'battery_low', 'tire_pressure_low')
+
+
+@dataclass(slots=True)
 class VehicleWorkflow:
     """Represents a single vehicle's maintenance workflow"""
     workflow_id: str
@@ -81,19 +134,58 @@ class VehicleWorkflow:
     retry_count: int = 0
     max_retries: int = 3
     error_log: List[str] = field(default_factory=list)
-    agent_interactions: List[Dict[str, Any]] = field(default_factory=list)
+    agent_interactions: deque = field(default_factory=lambda: deque(maxlen=MAX_RECENT_INTERACTIONS))
+    # Cached enum values; change state/priority via set_state/set_priority
+    state_value: str = field(init=False, repr=False, compare=False)
+    priority_value: int = field(init=False, repr=False, compare=False)
+    # Built by MasterOrchestrator.get_workflow_status, cleared on every mutation
+    status_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.state_value = self.state.value
+        self.priority_value = self.priority.value
+    
+    def set_state(self, state: WorkflowState):
+        """Set state and its cached value"""
+        self.state = state
+        self.state_value = state.value
+        self.status_cache = None
+    
+    def set_priority(self, priority: TaskPriority):
+        """Set priority and its cached value"""
+        self.priority = priority
+        self.priority_value = priority.value
+        self.status_cache = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert workflow to dictionary for logging"""
-        data = asdict(self)
-        data['state'] = self.state.value
-        data['priority'] = self.priority.value
-        data['created_at'] = self.created_at.isoformat()
-        data['updated_at'] = self.updated_at.isoformat()
-        return data
+        """
+        Convert workflow to dictionary for logging
+        
+        Nested containers are shared with the workflow, not copied;
+        copy them before mutating the result.
+        """
+        return {
+            'workflow_id': self.workflow_id,
+            'vehicle_id': self.vehicle_id,
+            'state': self.state_value,
+            'priority': self.priority_value,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'telemetry_data': self.telemetry_data,
+            'analysis_results': self.analysis_results,
+            'diagnosis_results': self.diagnosis_results,
+            'urgency_score': self.urgency_score,
+            'customer_engagement_status': self.customer_engagement_status,
+            'appointment_details': self.appointment_details,
+            'feedback_data': self.feedback_data,
+            'retry_count': self.retry_count,
+            'max_retries': self.max_retries,
+            'error_log': self.error_log,
+            'agent_interactions': list(self.agent_interactions)
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a task in the queue"""
     priority: int
@@ -102,11 +194,94 @@ class Task:
     payload: Dict[str, Any]
     created_at: datetime
     
+    # Freelist of executed tasks, reused by acquire()
+    _pool: ClassVar[deque] = deque(maxlen=1024)
+    
+    @classmethod
+    def acquire(
+        cls,
+        priority: int,
+        workflow_id: str,
+        agent_type: AgentType,
+        payload: Dict[str, Any],
+        created_at: datetime
+    ) -> 'Task':
+        """Initialize a pooled Task, allocating only when the freelist is empty"""
+        try:
+            task = cls._pool.pop()
+        except IndexError:
+            return cls(priority, workflow_id, agent_type, payload, created_at)
+        task.priority = priority
+        task.workflow_id = workflow_id
+        task.agent_type = agent_type
+        task.payload = payload
+        task.created_at = created_at
+        return task
+    
+    @classmethod
+    def release(cls, task: 'Task'):
+        """Return a finished task to the freelist; it must not be used afterwards"""
+        task.payload = None
+        cls._pool.append(task)
+    
     def __lt__(self, other):
         """Priority queue comparison"""
         return self.priority < other.priority
 
 
+def _orchestration_step(method):
+    """
+    Pin the orchestrator clock for one step (an entry point and everything it calls)
+    
+    Nested steps on the same thread reuse the outer step's timestamp.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        clock = self._clock
+        if getattr(clock, 'now', None) is not None:
+            return method(self, *args, **kwargs)
+        clock.now = datetime.now()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            clock.now = None
+    return wrapper
+
+
+class _TaskHeap:
+    """
+    Priority queue of Tasks: a bare heap guarded by a single Condition
+    
+    Covers the subset of queue.PriorityQueue the orchestrator uses without
+    its extra not_full/all_tasks_done bookkeeping. Entries are
+    (priority, seq, task) so ordering is FIFO within a priority and heap
+    comparisons never call Task.__lt__.
+    """
+    
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._not_empty = threading.Condition(threading.Lock())
+    
+    def put(self, task: Task):
+        with self._not_empty:
+            heapq.heappush(self._heap, (task.priority, next(self._seq), task))
+            self._not_empty.notify()
+    
+    def get(self, timeout: Optional[float] = None) -> Task:
+        """Pop the highest-priority task, raising queue.Empty after timeout"""
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self._heap, timeout):
+                raise Empty
+            return heapq.heappop(self._heap)[2]
+    
+    def qsize(self) -> int:
+        return len(self._heap)
+    
+    def empty(self) -> bool:
+        return not self._heap
+
+
 class MasterOrchestrator:
     """
     Master Orchestrator for Vehicle Maintenance Multi-Agent System
@@ -121,16 +296,63 @@ class MasterOrchestrator:
     - Make final scheduling decisions
     """
     
-    def __init__(self, max_workers: int = 10):
+    def __init__(self, max_workers: int = 10, single_threaded: bool = False):
         self.workflows: Dict[str, VehicleWorkflow] = {}
-        self.task_queue = PriorityQueue()
+        self.task_queue = _TaskHeap()
         self.max_workers = max_workers
-        self.active_tasks = 0
-        self.lock = threading.Lock()
+        
+        # single_threaded=True is for callers that drive the orchestrator from
+        # one thread without start(): the state lock becomes a no-op and due
+        # retries run via run_pending_retries() instead of a background thread
+        self.single_threaded = single_threaded
+        # self.lock guards workflow registration and the state/column indexes;
+        # the stats counters have their own lock so they never contend with it
+        self.lock = contextlib.nullcontext() if single_threaded else threading.Lock()
+        self._stats_lock = contextlib.nullcontext() if single_threaded else threading.Lock()
+        self._clock = threading.local()
+        
+        # Workflow IDs: one random per-instance prefix plus a counter
+        self._id_prefix = uuid.uuid4().hex[:16]
+        self._id_counter = itertools.count(1)
+        self._worker_slots = threading.BoundedSemaphore(max_workers)
+        self._running = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher_thread: Optional[threading.Thread] = None
+        
+        # Delayed retries: (due monotonic time, seq, workflow_id, agent_type),
+        # drained by a single scheduler thread started on first use
+        self._retry_heap: List[tuple] = []
+        self._retry_cond = threading.Condition()
+        self._retry_seq = itertools.count()
+        self._retry_thread: Optional[threading.Thread] = None
+        
+        # Hot workflow fields as parallel columns indexed by an integer slot
+        # (struct-of-arrays), kept in sync by _log_interaction; see find_workflows
+        self._slot_by_id: Dict[str, int] = {}
+        self._slot_ids: List[str] = []
+        self._state_col = np.zeros(64, dtype=np.int8)
+        self._priority_col = np.zeros(64, dtype=np.int8)
+        self._urgency_col = np.full(64, np.nan, dtype=np.float32)
+        self._retry_col = np.zeros(64, dtype=np.int16)
+        
+        # Workflow IDs partitioned by current state, maintained by _transition_state
+        # (dicts used as insertion-ordered sets)
+        self._by_state: Dict[WorkflowState, Dict[str, None]] = {state: {} for state in WorkflowState}
         
         # Agent registry - maps agent types to handler functions
         self.agent_handlers: Dict[AgentType, Callable] = {}
         
+        # Result processors - maps agent types to the method that consumes their output
+        self._result_processors: Dict[AgentType, Callable[[str, Dict[str, Any]], None]] = {
+            AgentType.DATA_ANALYSIS: self.process_data_analysis_results,
+            AgentType.DIAGNOSIS: self.process_diagnosis_results,
+            AgentType.CUSTOMER_ENGAGEMENT: self.process_customer_engagement_results,
+            # Scheduling agent returns options, orchestrator makes decision
+            AgentType.SCHEDULING: lambda workflow_id, result: self.make_scheduling_decision(
+                workflow_id, result.get('options', [])),
+            AgentType.FEEDBACK: self.process_feedback_results,
+        }
+        
         # Workflow statistics
         self.stats = {
             'total_workflows': 0,
@@ -155,13 +377,26 @@ class MasterOrchestrator:
             WorkflowState.RETRY: [WorkflowState.DATA_ANALYSIS]
         }
         
+        # Bit N of _transition_mask[state._ordinal] is set when the state with
+        # ordinal N is an allowed target (built once from state_transitions)
+        self._transition_mask = [0] * len(WorkflowState)
+        for src, targets in self.state_transitions.items():
+            for target in targets:
+                self._transition_mask[src._ordinal] |= 1 << target._ordinal
+        
         logger.info("Master Orchestrator initialized")
     
+    def _now(self) -> datetime:
+        """Current time, shared by everything inside one orchestration step"""
+        now = getattr(self._clock, 'now', None)
+        return now if now is not None else datetime.now()
+    
     def register_agent(self, agent_type: AgentType, handler: Callable):
         """Register a worker agent handler"""
         self.agent_handlers[agent_type] = handler
         logger.info(f"Registered agent: {agent_type.value}")
     
+    @_orchestration_step
     def receive_vehicle_telemetry(self, vehicle_id: str, telemetry_data: Dict[str, Any]) -> str:
         """
         Entry point: Receive vehicle telemetry and initiate workflow
@@ -173,7 +408,7 @@ class MasterOrchestrator:
         Returns:
             workflow_id: Unique workflow identifier
         """
-        workflow_id = str(uuid.uuid4())
+        workflow_id = f"{self._id_prefix}-{next(self._id_counter):016x}"
         
         # Determine initial priority based on telemetry indicators
         priority = self._assess_initial_priority(telemetry_data)
@@ -184,20 +419,27 @@ class MasterOrchestrator:
             vehicle_id=vehicle_id,
             state=WorkflowState.PENDING,
             priority=priority,
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            created_at=self._now(),
+            updated_at=self._now(),
             telemetry_data=telemetry_data
         )
         
         with self.lock:
             self.workflows[workflow_id] = workflow
+            self._add_hot_fields(workflow)
+            self._by_state[workflow.state][workflow_id] = None
+        with self._stats_lock:
             self.stats['total_workflows'] += 1
         
         # Log workflow creation
         self._log_interaction(workflow_id, "WORKFLOW_CREATED", {
             'vehicle_id': vehicle_id,
             'priority': priority.value,
-            'telemetry_summary': self._summarize_telemetry(telemetry_data)
+            # Only the audit trail reads the summary; skip the key scan when it is off
+            'telemetry_summary': (
+                self._summarize_telemetry(telemetry_data)
+                if audit_logger.isEnabledFor(logging.INFO) else None
+            )
         })
         
         # Route to Data Analysis Agent
@@ -209,24 +451,14 @@ class MasterOrchestrator:
     
     def _assess_initial_priority(self, telemetry_data: Dict[str, Any]) -> TaskPriority:
         """Assess initial priority from telemetry data"""
-        # Check for critical indicators
-        critical_indicators = [
-            telemetry_data.get('brake_failure', False),
-            telemetry_data.get('engine_critical', False),
-            telemetry_data.get('safety_system_fault', False)
-        ]
+        get = telemetry_data.get
         
-        if any(critical_indicators):
+        # Check for critical indicators
+        if any(get(key) for key in _CRITICAL_INDICATORS):
             return TaskPriority.URGENT
         
         # Check for warning indicators
-        warning_indicators = [
-            telemetry_data.get('check_engine_light', False),
-            telemetry_data.get('battery_low', False),
-            telemetry_data.get('tire_pressure_low', False)
-        ]
-        
-        if any(warning_indicators):
+        if any(get(key) for key in _WARNING_INDICATORS):
             return TaskPriority.HIGH
         
         # Check if scheduled maintenance is due
@@ -239,7 +471,7 @@ class MasterOrchestrator:
         """Create summary of telemetry for logging"""
         return {
             'sensor_count': len(telemetry_data),
-            'has_errors': any(k.endswith('_error') for k in telemetry_data.keys()),
+            'has_errors': any(k.endswith('_error') for k in telemetry_data),
             'timestamp': telemetry_data.get('timestamp', 'unknown')
         }
     
@@ -251,20 +483,38 @@ class MasterOrchestrator:
         self._transition_state(workflow_id, WorkflowState.DATA_ANALYSIS)
         
         # Create task
-        task = Task(
-            priority=workflow.priority.value,
-            workflow_id=workflow_id,
-            agent_type=AgentType.DATA_ANALYSIS,
-            payload={
-                'vehicle_id': workflow.vehicle_id,
-                'telemetry_data': workflow.telemetry_data
-            },
-            created_at=datetime.now()
+        self._enqueue(
+            workflow, AgentType.DATA_ANALYSIS,
+            telemetry_data=workflow.telemetry_data
         )
-        
-        self.task_queue.put(task)
         logger.info(f"Routed workflow {workflow_id} to Data Analysis Agent")
     
+    def _enqueue(
+        self,
+        workflow: VehicleWorkflow,
+        agent_type: AgentType,
+        priority: Optional[int] = None,
+        **payload: Any
+    ):
+        """
+        Queue a task for an agent (single construction site for all tasks)
+        
+        Args:
+            workflow: Workflow the task belongs to
+            agent_type: Agent that should handle the task
+            priority: Task priority value (defaults to the workflow's priority)
+            **payload: Payload fields; vehicle_id is added automatically
+        """
+        payload['vehicle_id'] = workflow.vehicle_id
+        self.task_queue.put(Task.acquire(
+            workflow.priority_value if priority is None else priority,
+            workflow.workflow_id,
+            agent_type,
+            payload,
+            self._now()
+        ))
+    
+    @_orchestration_step
     def process_data_analysis_results(self, workflow_id: str, analysis_results: Dict[str, Any]):
         """
         Handle results from Data Analysis Agent
@@ -276,8 +526,6 @@ class MasterOrchestrator:
             return
         
         workflow.analysis_results = analysis_results
-        workflow.updated_at = datetime.now()
-        
         self._log_interaction(workflow_id, "DATA_ANALYSIS_COMPLETED", {
             'anomalies_detected': analysis_results.get('anomalies_detected', 0),
             'confidence_score': analysis_results.get('confidence_score', 0)
@@ -292,21 +540,14 @@ class MasterOrchestrator:
         
         self._transition_state(workflow_id, WorkflowState.DIAGNOSIS)
         
-        task = Task(
-            priority=workflow.priority.value,
-            workflow_id=workflow_id,
-            agent_type=AgentType.DIAGNOSIS,
-            payload={
-                'vehicle_id': workflow.vehicle_id,
-                'analysis_results': workflow.analysis_results,
-                'telemetry_data': workflow.telemetry_data
-            },
-            created_at=datetime.now()
+        self._enqueue(
+            workflow, AgentType.DIAGNOSIS,
+            analysis_results=workflow.analysis_results,
+            telemetry_data=workflow.telemetry_data
         )
-        
-        self.task_queue.put(task)
         logger.info(f"Routed workflow {workflow_id} to Diagnosis Agent")
     
+    @_orchestration_step
     def process_diagnosis_results(self, workflow_id: str, diagnosis_results: Dict[str, Any]):
         """
         Handle results from Diagnosis Agent
@@ -318,8 +559,6 @@ class MasterOrchestrator:
             return
         
         workflow.diagnosis_results = diagnosis_results
-        workflow.updated_at = datetime.now()
-        
         self._log_interaction(workflow_id, "DIAGNOSIS_COMPLETED", {
             'predicted_failures': diagnosis_results.get('predicted_failures', []),
             'failure_probability': diagnosis_results.get('failure_probability', 0)
@@ -357,12 +596,13 @@ class MasterOrchestrator:
         if urgency_score > 0.7 or workflow.priority == TaskPriority.URGENT:
             # Critical: Immediate action
             logger.warning(f"CRITICAL: Workflow {workflow_id} requires immediate attention")
-            workflow.priority = TaskPriority.URGENT
-            self.stats['urgent_handled'] += 1
+            workflow.set_priority(TaskPriority.URGENT)
+            with self._stats_lock:
+                self.stats['urgent_handled'] += 1
             self._activate_customer_engagement_immediate(workflow_id)
         elif urgency_score > 0.4:
             # High priority: Fast track
-            workflow.priority = TaskPriority.HIGH
+            workflow.set_priority(TaskPriority.HIGH)
             self._activate_customer_engagement_immediate(workflow_id)
         else:
             # Non-urgent: Queue for batch processing
@@ -374,20 +614,12 @@ class MasterOrchestrator:
         
         self._transition_state(workflow_id, WorkflowState.CUSTOMER_ENGAGEMENT)
         
-        task = Task(
-            priority=workflow.priority.value,
-            workflow_id=workflow_id,
-            agent_type=AgentType.CUSTOMER_ENGAGEMENT,
-            payload={
-                'vehicle_id': workflow.vehicle_id,
-                'diagnosis_results': workflow.diagnosis_results,
-                'urgency_score': workflow.urgency_score,
-                'immediate': True
-            },
-            created_at=datetime.now()
+        self._enqueue(
+            workflow, AgentType.CUSTOMER_ENGAGEMENT,
+            diagnosis_results=workflow.diagnosis_results,
+            urgency_score=workflow.urgency_score,
+            immediate=True
         )
-        
-        self.task_queue.put(task)
         logger.info(f"Activated immediate customer engagement for workflow {workflow_id}")
     
     def _queue_for_batch_processing(self, workflow_id: str):
@@ -395,22 +627,16 @@ class MasterOrchestrator:
         workflow = self.workflows[workflow_id]
         
         # Schedule for batch processing (e.g., daily batch)
-        task = Task(
-            priority=TaskPriority.ROUTINE.value,
-            workflow_id=workflow_id,
-            agent_type=AgentType.CUSTOMER_ENGAGEMENT,
-            payload={
-                'vehicle_id': workflow.vehicle_id,
-                'diagnosis_results': workflow.diagnosis_results,
-                'urgency_score': workflow.urgency_score,
-                'batch_mode': True
-            },
-            created_at=datetime.now()
+        self._enqueue(
+            workflow, AgentType.CUSTOMER_ENGAGEMENT,
+            diagnosis_results=workflow.diagnosis_results,
+            urgency_score=workflow.urgency_score,
+            batch_mode=True,
+            priority=TaskPriority.ROUTINE.value
         )
-        
-        self.task_queue.put(task)
         logger.info(f"Queued workflow {workflow_id} for batch processing")
     
+    @_orchestration_step
     def process_customer_engagement_results(self, workflow_id: str, engagement_results: Dict[str, Any]):
         """
         Handle results from Customer Engagement Agent
@@ -422,8 +648,6 @@ class MasterOrchestrator:
             return
         
         workflow.customer_engagement_status = engagement_results.get('status', 'unknown')
-        workflow.updated_at = datetime.now()
-        
         self._log_interaction(workflow_id, "CUSTOMER_ENGAGEMENT_COMPLETED", {
             'status': engagement_results.get('status'),
             'customer_response': engagement_results.get('customer_response'),
@@ -439,22 +663,15 @@ class MasterOrchestrator:
         
         self._transition_state(workflow_id, WorkflowState.SCHEDULING)
         
-        task = Task(
-            priority=workflow.priority.value,
-            workflow_id=workflow_id,
-            agent_type=AgentType.SCHEDULING,
-            payload={
-                'vehicle_id': workflow.vehicle_id,
-                'diagnosis_results': workflow.diagnosis_results,
-                'customer_preferences': engagement_results.get('customer_preferences', {}),
-                'urgency_score': workflow.urgency_score
-            },
-            created_at=datetime.now()
+        self._enqueue(
+            workflow, AgentType.SCHEDULING,
+            diagnosis_results=workflow.diagnosis_results,
+            customer_preferences=engagement_results.get('customer_preferences', {}),
+            urgency_score=workflow.urgency_score
         )
-        
-        self.task_queue.put(task)
         logger.info(f"Activated scheduling agent for workflow {workflow_id}")
 
+    @_orchestration_step
     def make_scheduling_decision(self, workflow_id: str, scheduling_options: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Make final decision on service scheduling based on agent recommendations
@@ -483,10 +700,17 @@ class MasterOrchestrator:
             best_option = min(scheduling_options, key=lambda x: x.get('datetime', datetime.max))
         else:
             # For non-urgent: balance customer preference and service center load
-            best_option = max(scheduling_options, key=lambda x: (
-                x.get('customer_preference_score', 0) * 0.6 +
-                (1 - x.get('service_center_load', 1)) * 0.4
-            ))
+            count = len(scheduling_options)
+            preference = np.fromiter(
+                (o.get('customer_preference_score', 0) for o in scheduling_options),
+                dtype=np.float64, count=count
+            )
+            load = np.fromiter(
+                (o.get('service_center_load', 1) for o in scheduling_options),
+                dtype=np.float64, count=count
+            )
+            scores = preference * 0.6 + (1 - load) * 0.4
+            best_option = scheduling_options[int(scores.argmax())]
         
         # Finalize appointment
         appointment = {
@@ -501,8 +725,6 @@ class MasterOrchestrator:
         }
         
         workflow.appointment_details = appointment
-        workflow.updated_at = datetime.now()
-        
         self._transition_state(workflow_id, WorkflowState.SCHEDULED)
         
         self._log_interaction(workflow_id, "SCHEDULING_DECISION_MADE", appointment)
@@ -514,13 +736,15 @@ class MasterOrchestrator:
         
         return appointment
     
+    @_orchestration_step
     def mark_service_in_progress(self, workflow_id: str):
         """Mark workflow as in service"""
         self._transition_state(workflow_id, WorkflowState.IN_SERVICE)
         self._log_interaction(workflow_id, "SERVICE_STARTED", {
-            'timestamp': datetime.now().isoformat()
+            'timestamp': self._now().isoformat()
         })
     
+    @_orchestration_step
     def mark_service_completed(self, workflow_id: str, service_results: Dict[str, Any]):
         """
         Mark service as completed and trigger Feedback Agent
@@ -534,8 +758,6 @@ class MasterOrchestrator:
             logger.error(f"Workflow {workflow_id} not found")
             return
         
-        workflow.updated_at = datetime.now()
-        
         self._log_interaction(workflow_id, "SERVICE_COMPLETED", service_results)
         
         # Trigger Feedback Agent
@@ -547,21 +769,15 @@ class MasterOrchestrator:
         
         self._transition_state(workflow_id, WorkflowState.FEEDBACK)
         
-        task = Task(
-            priority=TaskPriority.ROUTINE.value,
-            workflow_id=workflow_id,
-            agent_type=AgentType.FEEDBACK,
-            payload={
-                'vehicle_id': workflow.vehicle_id,
-                'service_results': service_results,
-                'appointment_details': workflow.appointment_details
-            },
-            created_at=datetime.now()
+        self._enqueue(
+            workflow, AgentType.FEEDBACK,
+            service_results=service_results,
+            appointment_details=workflow.appointment_details,
+            priority=TaskPriority.ROUTINE.value
         )
-        
-        self.task_queue.put(task)
         logger.info(f"Activated feedback agent for workflow {workflow_id}")
     
+    @_orchestration_step
     def process_feedback_results(self, workflow_id: str, feedback_data: Dict[str, Any]):
         """
         Handle results from Feedback Agent
@@ -573,8 +789,6 @@ class MasterOrchestrator:
             return
         
         workflow.feedback_data = feedback_data
-        workflow.updated_at = datetime.now()
-        
         self._log_interaction(workflow_id, "FEEDBACK_COLLECTED", {
             'satisfaction_score': feedback_data.get('satisfaction_score'),
             'comments': feedback_data.get('comments', '')[:100]  # Truncate for logging
@@ -594,7 +808,7 @@ class MasterOrchestrator:
         # Calculate completion time
         completion_time = (workflow.updated_at - workflow.created_at).total_seconds() / 3600  # hours
         
-        with self.lock:
+        with self._stats_lock:
             self.stats['completed'] += 1
             # Update average completion time
             total = self.stats['completed']
@@ -615,22 +829,16 @@ class MasterOrchestrator:
         """
         workflow = self.workflows[workflow_id]
         
-        task = Task(
-            priority=TaskPriority.ROUTINE.value,
-            workflow_id=workflow_id,
-            agent_type=AgentType.MANUFACTURING_QUALITY,
-            payload={
-                'vehicle_id': workflow.vehicle_id,
-                'telemetry_data': workflow.telemetry_data,
-                'diagnosis_results': workflow.diagnosis_results,
-                'analysis_results': workflow.analysis_results
-            },
-            created_at=datetime.now()
+        self._enqueue(
+            workflow, AgentType.MANUFACTURING_QUALITY,
+            telemetry_data=workflow.telemetry_data,
+            diagnosis_results=workflow.diagnosis_results,
+            analysis_results=workflow.analysis_results,
+            priority=TaskPriority.ROUTINE.value
         )
-        
-        self.task_queue.put(task)
         logger.info(f"Sent workflow {workflow_id} data to Manufacturing Quality Module")
     
+    @_orchestration_step
     def handle_agent_failure(self, workflow_id: str, agent_type: AgentType, error: Exception):
         """
         Handle agent failures with retry logic
@@ -648,8 +856,6 @@ class MasterOrchestrator:
         error_msg = f"{agent_type.value} failed: {str(error)}"
         workflow.error_log.append(error_msg)
         workflow.retry_count += 1
-        workflow.updated_at = datetime.now()
-        
         self._log_interaction(workflow_id, "AGENT_FAILURE", {
             'agent_type': agent_type.value,
             'error': str(error),
@@ -665,20 +871,68 @@ class MasterOrchestrator:
             
             # Re-queue task with exponential backoff
             backoff_delay = 2 ** workflow.retry_count  # 2, 4, 8 seconds
-            
-            def retry_task():
-                time.sleep(backoff_delay)
-                self._retry_from_failure(workflow_id, agent_type)
-            
-            retry_thread = threading.Thread(target=retry_task)
-            retry_thread.daemon = True
-            retry_thread.start()
+            self._schedule_retry(backoff_delay, workflow_id, agent_type)
             
             logger.info(f"Scheduled retry {workflow.retry_count} for workflow {workflow_id} after {backoff_delay}s")
         else:
             # Max retries exceeded - mark as failed
             self._fail_workflow(workflow_id, f"Max retries exceeded for {agent_type.value}")
     
+    def _schedule_retry(self, delay: float, workflow_id: str, agent_type: AgentType):
+        """Schedule _retry_from_failure after delay seconds on the shared retry thread"""
+        with self._retry_cond:
+            heapq.heappush(
+                self._retry_heap,
+                (time.monotonic() + delay, next(self._retry_seq), workflow_id, agent_type)
+            )
+            if self._retry_thread is None and not self.single_threaded:
+                self._retry_thread = threading.Thread(target=self._retry_loop)
+                self._retry_thread.daemon = True
+                self._retry_thread.start()
+            self._retry_cond.notify()
+    
+    def _retry_loop(self):
+        """Run scheduled retries as they fall due"""
+        while True:
+            with self._retry_cond:
+                while True:
+                    if self._retry_heap:
+                        wait = self._retry_heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            _, _, workflow_id, agent_type = heapq.heappop(self._retry_heap)
+                            break
+                        self._retry_cond.wait(wait)
+                    else:
+                        self._retry_cond.wait()
+            
+            try:
+                self._retry_from_failure(workflow_id, agent_type)
+            except Exception as e:
+                logger.error(f"Retry failed for workflow {workflow_id}: {e}")
+    
+    def run_pending_retries(self) -> int:
+        """
+        Run retries whose backoff has elapsed on the calling thread
+        
+        Only needed in single_threaded mode, where no retry thread runs.
+        
+        Returns:
+            Number of retries executed
+        """
+        executed = 0
+        while True:
+            with self._retry_cond:
+                if not self._retry_heap or self._retry_heap[0][0] > time.monotonic():
+                    return executed
+                _, _, workflow_id, agent_type = heapq.heappop(self._retry_heap)
+            
+            try:
+                self._retry_from_failure(workflow_id, agent_type)
+            except Exception as e:
+                logger.error(f"Retry failed for workflow {workflow_id}: {e}")
+            executed += 1
+    
+    @_orchestration_step
     def _retry_from_failure(self, workflow_id: str, failed_agent: AgentType):
         """Retry workflow from the point of failure"""
         workflow = self.workflows[workflow_id]
@@ -707,7 +961,7 @@ class MasterOrchestrator:
         
         workflow.error_log.append(f"PERMANENT FAILURE: {reason}")
         
-        with self.lock:
+        with self._stats_lock:
             self.stats['failed'] += 1
         
         self._log_interaction(workflow_id, "WORKFLOW_FAILED", {
@@ -744,14 +998,15 @@ class MasterOrchestrator:
         current_state = workflow.state
         
         # Validate transition
-        allowed_transitions = self.state_transitions.get(current_state, [])
-        if new_state not in allowed_transitions:
+        if not (self._transition_mask[current_state._ordinal] >> new_state._ordinal) & 1:
             logger.warning(f"Invalid state transition: {current_state.value} -> {new_state.value}")
             return False
         
         # Perform transition
-        workflow.state = new_state
-        workflow.updated_at = datetime.now()
+        workflow.set_state(new_state)
+        with self.lock:
+            self._by_state[current_state].pop(workflow_id, None)
+            self._by_state[new_state][workflow_id] = None
         
         self._log_interaction(workflow_id, "STATE_TRANSITION", {
             'from_state': current_state.value,
@@ -775,20 +1030,88 @@ class MasterOrchestrator:
         if not workflow:
             return
         
+        # Every mutation path ends here, so this is the one place that stamps
+        # updated_at; the interaction reuses the same instant.
+        now = self._now()
+        workflow.updated_at = now
+        workflow.status_cache = None
+        
         interaction = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'workflow_id': workflow_id,
             'vehicle_id': workflow.vehicle_id,
             'event_type': event_type,
-            'state': workflow.state.value,
-            'priority': workflow.priority.value,
+            'state': workflow.state_value,
+            'priority': workflow.priority_value,
             'details': details
         }
         
         workflow.agent_interactions.append(interaction)
+        self._sync_hot_fields(workflow)
         
-        # Log to audit file for UEBA
-        logger.info(f"AUDIT: {json.dumps(interaction)}")
+        # Log to audit file for UEBA (skip serializing when the record would be dropped)
+        if audit_logger.isEnabledFor(logging.INFO):
+            audit_logger.info(_audit_json(interaction))
+    
+    def _add_hot_fields(self, workflow: VehicleWorkflow):
+        """Assign a column slot to a new workflow (caller holds self.lock)"""
+        slot = len(self._slot_ids)
+        if slot == len(self._state_col):
+            capacity = slot * 2
+            self._state_col = np.resize(self._state_col, capacity)
+            self._priority_col = np.resize(self._priority_col, capacity)
+            self._urgency_col = np.resize(self._urgency_col, capacity)
+            self._retry_col = np.resize(self._retry_col, capacity)
+        self._slot_by_id[workflow.workflow_id] = slot
+        self._slot_ids.append(workflow.workflow_id)
+        self._write_hot_fields(slot, workflow)
+    
+    def _sync_hot_fields(self, workflow: VehicleWorkflow):
+        """Copy a workflow's hot fields into its column slot"""
+        with self.lock:
+            slot = self._slot_by_id.get(workflow.workflow_id)
+            if slot is not None:
+                self._write_hot_fields(slot, workflow)
+    
+    def _write_hot_fields(self, slot: int, workflow: VehicleWorkflow):
+        """Write hot fields into column slot (caller holds self.lock)"""
+        self._state_col[slot] = workflow.state._ordinal
+        self._priority_col[slot] = workflow.priority_value
+        self._urgency_col[slot] = np.nan if workflow.urgency_score is None else workflow.urgency_score
+        self._retry_col[slot] = workflow.retry_count
+    
+    def find_workflows(
+        self,
+        state: Optional[WorkflowState] = None,
+        priority: Optional[TaskPriority] = None,
+        min_urgency: Optional[float] = None,
+        min_retries: Optional[int] = None
+    ) -> List[str]:
+        """
+        Find workflow IDs matching all given criteria with one vectorized scan
+        
+        Args:
+            state: Only workflows currently in this state
+            priority: Only workflows with this priority
+            min_urgency: Only workflows with urgency_score >= min_urgency
+            min_retries: Only workflows with retry_count >= min_retries
+            
+        Returns:
+            Matching workflow IDs in creation order
+        """
+        with self.lock:
+            count = len(self._slot_ids)
+            mask = np.ones(count, dtype=bool)
+            if state is not None:
+                mask &= self._state_col[:count] == state._ordinal
+            if priority is not None:
+                mask &= self._priority_col[:count] == priority.value
+            if min_urgency is not None:
+                mask &= self._urgency_col[:count] >= min_urgency
+            if min_retries is not None:
+                mask &= self._retry_col[:count] >= min_retries
+            slot_ids = self._slot_ids
+            return [slot_ids[slot] for slot in np.flatnonzero(mask)]
     
     def get_workflow_status(self, workflow_id: str) -> Optional[Dict[str, Any]]:
         """Get current status of a workflow"""
@@ -796,11 +1119,18 @@ class MasterOrchestrator:
         if not workflow:
             return None
         
+        status = workflow.status_cache
+        if status is None:
+            status = workflow.status_cache = self._build_workflow_status(workflow)
+        return dict(status)
+    
+    def _build_workflow_status(self, workflow: VehicleWorkflow) -> Dict[str, Any]:
+        """Build the status dict cached on the workflow by get_workflow_status"""
         return {
-            'workflow_id': workflow_id,
+            'workflow_id': workflow.workflow_id,
             'vehicle_id': workflow.vehicle_id,
-            'state': workflow.state.value,
-            'priority': workflow.priority.value,
+            'state': workflow.state_value,
+            'priority': workflow.priority_value,
             'urgency_score': workflow.urgency_score,
             'created_at': workflow.created_at.isoformat(),
             'updated_at': workflow.updated_at.isoformat(),
@@ -811,53 +1141,52 @@ class MasterOrchestrator:
     
     def get_all_workflows_by_state(self, state: WorkflowState) -> List[Dict[str, Any]]:
         """Get all workflows in a specific state"""
-        return [
-            self.get_workflow_status(wf_id)
-            for wf_id, wf in self.workflows.items()
-            if wf.state == state
-        ]
+        with self.lock:
+            workflow_ids = list(self._by_state[state])
+        return [self.get_workflow_status(wf_id) for wf_id in workflow_ids]
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get orchestrator statistics"""
+        # Current state counts (sizes of the per-state index, not a scan)
         with self.lock:
-            stats = self.stats.copy()
-        
-        # Add current state counts
-        state_counts = defaultdict(int)
-        for workflow in self.workflows.values():
-            state_counts[workflow.state.value] += 1
-        
-        stats['workflows_by_state'] = dict(state_counts)
-        stats['active_workflows'] = len(self.workflows)
-        stats['queue_size'] = self.task_queue.qsize()
-        
-        return stats
+            workflows_by_state = {
+                state.value: len(workflow_ids)
+                for state, workflow_ids in self._by_state.items() if workflow_ids
+            }
+            active_workflows = len(self.workflows)
+        queue_size = self.task_queue.qsize()
+        
+        # Counters and derived fields go into the result in one build
+        with self._stats_lock:
+            return {
+                **self.stats,
+                'workflows_by_state': workflows_by_state,
+                'active_workflows': active_workflows,
+                'queue_size': queue_size
+            }
     
     def process_task_queue(self):
         """
         Process tasks from the queue
         This should be run in a separate thread/process
+        
+        Blocks on the queue instead of polling it, and waits for a free
+        worker slot before dequeuing so tasks never bounce back into the
+        queue while all workers are busy.
         """
-        while True:
+        while self._running:
             try:
-                if not self.task_queue.empty():
+                # Reserve a worker before dequeuing so waiting tasks keep their priority order
+                if not self._worker_slots.acquire(timeout=1):
+                    continue
+                try:
                     task = self.task_queue.get(timeout=1)
-                    
-                    # Check if we have capacity
-                    with self.lock:
-                        if self.active_tasks >= self.max_workers:
-                            # Re-queue task
-                            self.task_queue.put(task)
-                            time.sleep(0.1)
-                            continue
-                        self.active_tasks += 1
-                    
-                    # Process task in separate thread
-                    thread = threading.Thread(target=self._execute_task, args=(task,))
-                    thread.daemon = True
-                    thread.start()
-                else:
-                    time.sleep(0.1)
+                except Empty:
+                    self._worker_slots.release()
+                    continue
+                
+                # Hand the task to a pooled worker; the slot is released when it finishes
+                self._executor.submit(self._execute_task, task)
             except Exception as e:
                 logger.error(f"Error processing task queue: {e}")
     
@@ -874,33 +1203,32 @@ class MasterOrchestrator:
             result = handler(task.payload)
             
             # Route result to appropriate processor
-            if task.agent_type == AgentType.DATA_ANALYSIS:
-                self.process_data_analysis_results(task.workflow_id, result)
-            elif task.agent_type == AgentType.DIAGNOSIS:
-                self.process_diagnosis_results(task.workflow_id, result)
-            elif task.agent_type == AgentType.CUSTOMER_ENGAGEMENT:
-                self.process_customer_engagement_results(task.workflow_id, result)
-            elif task.agent_type == AgentType.SCHEDULING:
-                # Scheduling agent returns options, orchestrator makes decision
-                self.make_scheduling_decision(task.workflow_id, result.get('options', []))
-            elif task.agent_type == AgentType.FEEDBACK:
-                self.process_feedback_results(task.workflow_id, result)
+            processor = self._result_processors.get(task.agent_type)
+            if processor:
+                processor(task.workflow_id, result)
             
         except Exception as e:
             logger.error(f"Task execution failed: {e}")
             self.handle_agent_failure(task.workflow_id, task.agent_type, e)
         finally:
-            with self.lock:
-                self.active_tasks -= 1
+            Task.release(task)
+            self._worker_slots.release()
     
     def start(self):
         """Start the orchestrator"""
+        if self.single_threaded:
+            raise RuntimeError("start() spawns worker threads; construct with single_threaded=False")
+        
         logger.info("Starting Master Orchestrator")
         
+        self._running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="orchestrator-agent")
+        
         # Start task queue processor
-        processor_thread = threading.Thread(target=self.process_task_queue)
-        processor_thread.daemon = True
-        processor_thread.start()
+        self._dispatcher_thread = threading.Thread(target=self.process_task_queue)
+        self._dispatcher_thread.daemon = True
+        self._dispatcher_thread.start()
         
         logger.info("Master Orchestrator started successfully")
     
@@ -908,13 +1236,21 @@ class MasterOrchestrator:
         """Gracefully shutdown the orchestrator"""
         logger.info("Shutting down Master Orchestrator")
         
+        # Stop dispatching new tasks
+        self._running = False
+        
+        if self._dispatcher_thread is not None:
+            self._dispatcher_thread.join()
+            self._dispatcher_thread = None
+        
         # Wait for active tasks to complete
-        while self.active_tasks > 0:
-            logger.info(f"Waiting for {self.active_tasks} active tasks to complete...")
-            time.sleep(1)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
         
         # Log final statistics
-        logger.info(f"Final statistics: {json.dumps(self.get_statistics(), indent=2)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Final statistics: %s", _audit_json(self.get_statistics(), indent=True))
         logger.info("Master Orchestrator shutdown complete")
 
 
@@ -1008,4 +1344,4 @@ if __name__ == "__main__":
     # Let it run for a bit
     time.sleep(5)
     
-    print(f"Statistics: {json.dumps(orchestrator.get_statistics(), indent=2)}")
+    print(f"Statistics: {_audit_json(orchestrator.get_statistics(), indent=True)}")
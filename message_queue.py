@@ -3,20 +3,26 @@ Message Queue Implementation for Inter-Agent Communication
 Supports both in-memory queue and external message brokers (RabbitMQ, Kafka)
 """
 import asyncio
+import heapq
+import itertools
 import json
 import logging
-from typing import Dict, Any, Optional, Callable, List
+import time
+from typing import Dict, Any, Optional, Callable, List, Deque, Set, Tuple, Union
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from abc import ABC, abstractmethod
 import threading
 
-from message_schemas import MessageHeader, MessagePriority
+from message_schemas import MessageHeader, MessagePriority, MessageEnvelope
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Number of most recent message log entries kept for UEBA monitoring
+MESSAGE_LOG_SIZE = 50000
+
 
 class MessageQueue(ABC):
     """Abstract base class for message queue implementations"""
@@ -44,15 +50,22 @@ class InMemoryMessageQueue(MessageQueue):
     """
     
     def __init__(self, max_queue_size: int = 10000):
-        self.channels: Dict[str, List[deque]] = defaultdict(
-            lambda: [deque() for _ in range(5)]  # 5 priority levels
-        )
+        # Per-channel heap of (-priority, seq, message, header): highest priority first,
+        # FIFO within a priority. Channels are created on first publish.
+        self.channels: Dict[str, List[tuple]] = {}
+        self._seq = itertools.count()
         self.subscribers: Dict[str, List[Callable]] = defaultdict(list)
-        self.message_log: List[Dict[str, Any]] = []
+        # Ring buffer: once full, each append drops the oldest entry
+        self.message_log: Deque[Dict[str, Any]] = deque(maxlen=MESSAGE_LOG_SIZE)
+        # Raw (time, channel, action, message) records appended on the hot path;
+        # turned into log entries in batches by _flush_message_log
+        self._pending_log: Deque[Tuple[float, str, str, Dict[str, Any]]] = deque(maxlen=MESSAGE_LOG_SIZE)
         self.max_queue_size = max_queue_size
-        self.lock = asyncio.Lock()
+        # One lock per channel so traffic on one channel never waits on another
+        self._channel_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
         self._running = False
-        self._tasks: List[asyncio.Task] = []
+        # Subscriber tasks still running; each removes itself when done
+        self._tasks: Set[asyncio.Task] = set()
         
     async def start(self):
         """Start the message queue processing"""
@@ -62,38 +75,44 @@ class InMemoryMessageQueue(MessageQueue):
     async def stop(self):
         """Stop the message queue processing"""
         self._running = False
-        for task in self._tasks:
+        for task in list(self._tasks):
             task.cancel()
         logger.info("InMemoryMessageQueue stopped")
     
-    async def publish(self, channel: str, message: Dict[str, Any]) -> bool:
+    async def publish(self, channel: str, message: Union[Dict[str, Any], MessageEnvelope]) -> bool:
         """
         Publish a message to a channel with priority support
         
         Args:
             channel: Channel name
-            message: Message dictionary with header and payload
+            message: Message dictionary with header and payload, or any
+                message object with a MessageHeader header and to_dict()
+                (MessageEnvelope or a typed message from message_schemas)
             
         Returns:
             bool: True if published successfully
         """
         try:
-            async with self.lock:
+            async with self._channel_locks[channel]:
                 # Extract priority from message header
-                priority = message.get("header", {}).get("priority", MessagePriority.NORMAL.value)
-                priority_index = min(max(priority - 1, 0), 4)
-                
-                # Add to appropriate priority queue
-                queue = self.channels[channel][priority_index]
+                if isinstance(message, dict):
+                    header = message.get("header", {})
+                    priority = header.get("priority", MessagePriority.NORMAL.value)
+                else:
+                    # Keep the header object for logging; subscribers get the dict form
+                    header = message.header
+                    priority = header.priority
+                    message = message.to_dict()
                 
-                if len(queue) >= self.max_queue_size:
-                    logger.warning(f"Queue for channel {channel} is full, dropping oldest message")
-                    queue.popleft()
+                queue = self._get_or_create_channel(channel)
+                heapq.heappush(queue, (-priority, next(self._seq), message, header))
                 
-                queue.append(message)
+                if len(queue) > self.max_queue_size:
+                    logger.warning(f"Queue for channel {channel} is full, dropping oldest lowest-priority message")
+                    self._drop_lowest_priority(queue)
                 
                 # Log the message
-                self._log_message(channel, message, "published")
+                self._log_message(channel, header, "published")
                 
                 logger.info(f"Published message to {channel} with priority {priority}")
                 
@@ -106,6 +125,21 @@ class InMemoryMessageQueue(MessageQueue):
             logger.error(f"Error publishing message to {channel}: {e}")
             return False
     
+    def _get_or_create_channel(self, channel: str) -> List[tuple]:
+        """Get the message heap for a channel, creating it on first use"""
+        queue = self.channels.get(channel)
+        if queue is None:
+            queue = self.channels[channel] = []
+        return queue
+    
+    @staticmethod
+    def _drop_lowest_priority(queue: List[tuple]) -> None:
+        """Remove the oldest entry of the lowest priority (O(n), only on overflow)"""
+        worst = max(range(len(queue)), key=lambda i: (queue[i][0], -queue[i][1]))
+        queue[worst] = queue[-1]
+        queue.pop()
+        heapq.heapify(queue)
+    
     async def subscribe(self, channel: str, callback: Callable) -> None:
         """
         Subscribe to a channel
@@ -114,7 +148,7 @@ class InMemoryMessageQueue(MessageQueue):
             channel: Channel name
             callback: Async callback function to handle messages
         """
-        async with self.lock:
+        async with self._channel_locks[channel]:
             if callback not in self.subscribers[channel]:
                 self.subscribers[channel].append(callback)
                 logger.info(f"Subscribed to channel: {channel}")
@@ -127,7 +161,7 @@ class InMemoryMessageQueue(MessageQueue):
             channel: Channel name
             callback: Callback function to remove
         """
-        async with self.lock:
+        async with self._channel_locks[channel]:
             if callback in self.subscribers[channel]:
                 self.subscribers[channel].remove(callback)
                 logger.info(f"Unsubscribed from channel: {channel}")
@@ -140,48 +174,65 @@ class InMemoryMessageQueue(MessageQueue):
             try:
                 # Create task for each subscriber
                 task = asyncio.create_task(callback(message))
-                self._tasks.append(task)
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
             except Exception as e:
                 logger.error(f"Error notifying subscriber on {channel}: {e}")
     
-    def _log_message(self, channel: str, message: Dict[str, Any], action: str) -> None:
-        """Log message for UEBA monitoring"""
-        log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "channel": channel,
-            "action": action,
-            "message_id": message.get("header", {}).get("message_id"),
-            "correlation_id": message.get("header", {}).get("correlation_id"),
-            "sender": message.get("header", {}).get("sender"),
-            "receiver": message.get("header", {}).get("receiver"),
-            "message_type": message.get("header", {}).get("message_type"),
-            "priority": message.get("header", {}).get("priority")
-        }
-        
-        self.message_log.append(log_entry)
-        
-        # Keep log size manageable
-        if len(self.message_log) > 100000:
-            self.message_log = self.message_log[-50000:]
+    def _log_message(self, channel: str, header: Union[Dict[str, Any], MessageHeader], action: str) -> None:
+        """Log message for UEBA monitoring (entry is built on the next flush)"""
+        self._pending_log.append((time.time(), channel, action, header))
+    
+    def _flush_message_log(self) -> None:
+        """Build log entries for all pending records"""
+        pending = self._pending_log
+        while pending:
+            logged_at, channel, action, header = pending.popleft()
+            if isinstance(header, MessageHeader):
+                self.message_log.append({
+                    "timestamp": datetime.utcfromtimestamp(logged_at).isoformat(),
+                    "channel": channel,
+                    "action": action,
+                    "message_id": header.message_id,
+                    "correlation_id": header.correlation_id,
+                    "sender": header.sender,
+                    "receiver": header.receiver,
+                    "message_type": header.message_type,
+                    "priority": header.priority
+                })
+                continue
+            self.message_log.append({
+                "timestamp": datetime.utcfromtimestamp(logged_at).isoformat(),
+                "channel": channel,
+                "action": action,
+                "message_id": header.get("message_id"),
+                "correlation_id": header.get("correlation_id"),
+                "sender": header.get("sender"),
+                "receiver": header.get("receiver"),
+                "message_type": header.get("message_type"),
+                "priority": header.get("priority")
+            })
     
     async def get_next_message(self, channel: str) -> Optional[Dict[str, Any]]:
         """Get next message from channel (highest priority first)"""
-        async with self.lock:
-            if channel in self.channels:
-                # Check priority queues from highest to lowest
-                for priority_queue in reversed(self.channels[channel]):
-                    if priority_queue:
-                        message = priority_queue.popleft()
-                        self._log_message(channel, message, "consumed")
-                        return message
-        return None
+        # No lock: nothing here awaits, so no other coroutine can interleave
+        queue = self.channels.get(channel)
+        if not queue:
+            return None
+        
+        _, _, message, header = heapq.heappop(queue)
+        self._log_message(channel, header, "consumed")
+        return message
     
     def get_message_log(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent message log entries"""
-        return self.message_log[-limit:]
+        self._flush_message_log()
+        log_size = len(self.message_log)
+        return list(itertools.islice(self.message_log, max(0, log_size - limit), log_size))
     
     def get_queue_stats(self) -> Dict[str, Any]:
         """Get queue statistics"""
+        self._flush_message_log()
         stats = {
             "total_channels": len(self.channels),
             "total_subscribers": sum(len(subs) for subs in self.subscribers.values()),
@@ -189,10 +240,9 @@ class InMemoryMessageQueue(MessageQueue):
             "channels": {}
         }
         
-        for channel, priority_queues in self.channels.items():
-            total_messages = sum(len(q) for q in priority_queues)
+        for channel, queue in self.channels.items():
             stats["channels"][channel] = {
-                "total_messages": total_messages,
+                "total_messages": len(queue),
                 "subscribers": len(self.subscribers.get(channel, []))
             }
         
@@ -202,6 +252,9 @@ class InMemoryMessageQueue(MessageQueue):
 class TimeoutHandler:
     """
     Handles message timeouts and escalation
+    
+    Deadlines live in one heap drained by a single reaper task that sleeps
+    until the earliest expiry, rather than one polling task per message.
     """
     
     def __init__(self, default_timeout: int = 30):
@@ -209,6 +262,10 @@ class TimeoutHandler:
         self.pending_messages: Dict[str, Dict[str, Any]] = {}
         self.timeout_callbacks: Dict[str, Callable] = {}
         self.lock = asyncio.Lock()
+        # (monotonic deadline, message_id); acknowledged entries are skipped when popped
+        self._deadlines: List[Tuple[float, str]] = []
+        self._wakeup = asyncio.Event()
+        self._reaper_task: Optional[asyncio.Task] = None
         
     async def register_message(
         self,
@@ -227,17 +284,23 @@ class TimeoutHandler:
         async with self.lock:
             timeout_seconds = timeout or self.default_timeout
             expiry_time = datetime.utcnow() + timedelta(seconds=timeout_seconds)
+            deadline = time.monotonic() + timeout_seconds
             
             self.pending_messages[message_id] = {
                 "expiry_time": expiry_time,
-                "timeout_seconds": timeout_seconds
+                "timeout_seconds": timeout_seconds,
+                "deadline": deadline
             }
             
             if callback:
                 self.timeout_callbacks[message_id] = callback
             
             # Schedule timeout check
-            asyncio.create_task(self._check_timeout(message_id))
+            heapq.heappush(self._deadlines, (deadline, message_id))
+            if self._reaper_task is None:
+                self._reaper_task = asyncio.create_task(self._reap_timeouts())
+            else:
+                self._wakeup.set()
     
     async def acknowledge_message(self, message_id: str) -> bool:
         """
@@ -258,34 +321,46 @@ class TimeoutHandler:
                 return True
             return False
     
-    async def _check_timeout(self, message_id: str) -> None:
-        """Check if message has timed out"""
+    async def _reap_timeouts(self) -> None:
+        """Fire timeouts as their deadlines pass; exits once nothing is pending"""
         while True:
+            expired = []
             async with self.lock:
-                if message_id not in self.pending_messages:
-                    return
-                
-                message_info = self.pending_messages[message_id]
-                
-                if datetime.utcnow() >= message_info["expiry_time"]:
-                    logger.warning(f"Message {message_id} timed out after {message_info['timeout_seconds']}s")
-                    
-                    # Execute timeout callback if registered
-                    if message_id in self.timeout_callbacks:
-                        callback = self.timeout_callbacks[message_id]
-                        try:
-                            await callback(message_id)
-                        except Exception as e:
-                            logger.error(f"Error executing timeout callback: {e}")
+                now = time.monotonic()
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    deadline, message_id = heapq.heappop(self._deadlines)
+                    message_info = self.pending_messages.get(message_id)
+                    # Acknowledged, or re-registered with a later deadline
+                    if message_info is None or message_info["deadline"] != deadline:
+                        continue
                     
                     # Remove from tracking
                     del self.pending_messages[message_id]
-                    if message_id in self.timeout_callbacks:
-                        del self.timeout_callbacks[message_id]
+                    expired.append((message_id, message_info, self.timeout_callbacks.pop(message_id, None)))
+                
+                if not self._deadlines and not expired:
+                    self._reaper_task = None
                     return
+                
+                delay = self._deadlines[0][0] - now if self._deadlines else 0
+                self._wakeup.clear()
+            
+            for message_id, message_info, callback in expired:
+                logger.warning(f"Message {message_id} timed out after {message_info['timeout_seconds']}s")
+                
+                # Execute timeout callback if registered
+                if callback:
+                    try:
+                        await callback(message_id)
+                    except Exception as e:
+                        logger.error(f"Error executing timeout callback: {e}")
             
-            # Check every second
-            await asyncio.sleep(1)
+            # Sleep until the earliest deadline, or until an earlier one is registered
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
     
     def get_pending_count(self) -> int:
         """Get count of pending messages"""
@@ -2,10 +2,10 @@
 Message Schemas for Inter-Agent Communication System
 Defines standardized message formats for all agent interactions
 """
-from dataclasses import dataclass, field, asdict
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, ClassVar
 from enum import Enum
+import time
 import uuid
 
 
@@ -44,12 +44,14 @@ class AgentType(Enum):
     EXTERNAL_SYSTEM = "external_system"
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageHeader:
     """Standard message header for all communications"""
-    message_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    correlation_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    message_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    correlation_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # Epoch nanoseconds (UTC); consumers that need ISO strings convert at their
+    # own boundary (e.g. ueba_integration._header_timestamp_iso)
+    timestamp: int = field(default_factory=time.time_ns)
     sender: str = ""
     receiver: str = ""
     message_type: str = ""
@@ -57,18 +59,81 @@ class MessageHeader:
     reply_to: Optional[str] = None
     ttl: int = 300  # Time to live in seconds
     
+    @classmethod
+    def reply_for(
+        cls,
+        parent: Dict[str, Any],
+        sender: str,
+        receiver: str,
+        message_type: str,
+        priority: int = MessagePriority.NORMAL.value
+    ) -> "MessageHeader":
+        """
+        Build the header for a reply to a received message
+        
+        Inherits the parent's correlation_id (so no new one is generated)
+        and points reply_to at the parent's message_id.
+        
+        Args:
+            parent: Header dict of the message being replied to
+            sender: Replying agent
+            receiver: Intended receiver of the reply
+            message_type: Type of the reply
+            priority: Reply priority
+        """
+        return cls(
+            correlation_id=parent.get("correlation_id") or uuid.uuid4().hex,
+            reply_to=parent.get("message_id"),
+            sender=sender,
+            receiver=receiver,
+            message_type=message_type,
+            priority=priority
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        # All fields are flat primitives, so a plain dict build is enough
+        # (dataclasses.asdict would deep-copy each one)
+        return {
+            "message_id": self.message_id,
+            "correlation_id": self.correlation_id,
+            "timestamp": self.timestamp,
+            "sender": self.sender,
+            "receiver": self.receiver,
+            "message_type": self.message_type,
+            "priority": self.priority,
+            "reply_to": self.reply_to,
+            "ttl": self.ttl
+        }
+
+
+@dataclass(slots=True)
+class MessageEnvelope:
+    """
+    Untyped message with a live header object
+    
+    Can be published in place of a message dict; the queue reads header
+    fields as attributes and only builds the dict form for delivery.
+    """
+    header: MessageHeader
+    payload: Dict[str, Any] = field(default_factory=dict)
+    
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "header": self.header.to_dict(),
+            "payload": self.payload
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class VehicleDataMessage:
     """Message containing vehicle sensor data"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.VEHICLE_DATA.value
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.VEHICLE_DATA.value
+        self.header.message_type = self._TYPE
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -77,14 +142,16 @@ class VehicleDataMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisRequestMessage:
     """Request for data analysis"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.ANALYSIS_REQUEST.value
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.ANALYSIS_REQUEST.value
+        self.header.message_type = self._TYPE
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -93,18 +160,24 @@ class AnalysisRequestMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResultMessage:
     """Results from data analysis"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.ANALYSIS_RESULT.value
+    # Immutable defaults only; list defaults are created per instance
+    _DEFAULT_PAYLOAD: ClassVar[Dict[str, Any]] = {
+        "anomaly_detected": False,
+        "failure_probability": 0.0,
+        "confidence_score": 0.0
+    }
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.ANALYSIS_RESULT.value
-        self.payload.setdefault("anomaly_detected", False)
-        self.payload.setdefault("failure_probability", 0.0)
+        self.header.message_type = self._TYPE
+        self.payload = {**self._DEFAULT_PAYLOAD, **self.payload}
         self.payload.setdefault("predicted_failures", [])
-        self.payload.setdefault("confidence_score", 0.0)
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -113,18 +186,23 @@ class AnalysisResultMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class CustomerEngagementMessage:
     """Message for customer engagement actions"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.CUSTOMER_ENGAGEMENT.value
+    _DEFAULT_PAYLOAD: ClassVar[Dict[str, Any]] = {
+        "customer_id": "",
+        "vehicle_id": "",
+        "message_content": "",
+        "channel": "email"
+    }
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.CUSTOMER_ENGAGEMENT.value
-        self.payload.setdefault("customer_id", "")
-        self.payload.setdefault("vehicle_id", "")
-        self.payload.setdefault("message_content", "")
-        self.payload.setdefault("channel", "email")
+        self.header.message_type = self._TYPE
+        self.payload = {**self._DEFAULT_PAYLOAD, **self.payload}
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -133,18 +211,24 @@ class CustomerEngagementMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SchedulingRequestMessage:
     """Request for appointment scheduling"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.SCHEDULING_REQUEST.value
+    # Immutable defaults only; list defaults are created per instance
+    _DEFAULT_PAYLOAD: ClassVar[Dict[str, Any]] = {
+        "customer_id": "",
+        "vehicle_id": "",
+        "service_type": "",
+        "urgency": "normal"
+    }
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.SCHEDULING_REQUEST.value
-        self.payload.setdefault("customer_id", "")
-        self.payload.setdefault("vehicle_id", "")
-        self.payload.setdefault("service_type", "")
-        self.payload.setdefault("urgency", "normal")
+        self.header.message_type = self._TYPE
+        self.payload = {**self._DEFAULT_PAYLOAD, **self.payload}
         self.payload.setdefault("preferred_dates", [])
     
     def to_dict(self) -> Dict[str, Any]:
@@ -154,18 +238,23 @@ class SchedulingRequestMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SchedulingResultMessage:
     """Result of scheduling operation"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.SCHEDULING_RESULT.value
+    _DEFAULT_PAYLOAD: ClassVar[Dict[str, Any]] = {
+        "appointment_id": "",
+        "scheduled_date": "",
+        "service_center": "",
+        "status": ""
+    }
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.SCHEDULING_RESULT.value
-        self.payload.setdefault("appointment_id", "")
-        self.payload.setdefault("scheduled_date", "")
-        self.payload.setdefault("service_center", "")
-        self.payload.setdefault("status", "")
+        self.header.message_type = self._TYPE
+        self.payload = {**self._DEFAULT_PAYLOAD, **self.payload}
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -174,17 +263,22 @@ class SchedulingResultMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class FeedbackMessage:
     """Feedback message for system improvement"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.FEEDBACK.value
+    _DEFAULT_PAYLOAD: ClassVar[Dict[str, Any]] = {
+        "feedback_type": "",
+        "rating": 0,
+        "comments": ""
+    }
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.FEEDBACK.value
-        self.payload.setdefault("feedback_type", "")
-        self.payload.setdefault("rating", 0)
-        self.payload.setdefault("comments", "")
+        self.header.message_type = self._TYPE
+        self.payload = {**self._DEFAULT_PAYLOAD, **self.payload}
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -193,17 +287,23 @@ class FeedbackMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ManufacturingInsightMessage:
     """Manufacturing insights derived from feedback"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.MANUFACTURING_INSIGHT.value
+    # Immutable defaults only; list defaults are created per instance
+    _DEFAULT_PAYLOAD: ClassVar[Dict[str, Any]] = {
+        "insight_type": "",
+        "recommendation": ""
+    }
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.MANUFACTURING_INSIGHT.value
-        self.payload.setdefault("insight_type", "")
+        self.header.message_type = self._TYPE
+        self.payload = {**self._DEFAULT_PAYLOAD, **self.payload}
         self.payload.setdefault("affected_components", [])
-        self.payload.setdefault("recommendation", "")
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -212,17 +312,22 @@ class ManufacturingInsightMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorMessage:
     """Error message for exception handling"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.ERROR.value
+    _DEFAULT_PAYLOAD: ClassVar[Dict[str, Any]] = {
+        "error_code": "",
+        "error_message": "",
+        "stack_trace": ""
+    }
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.ERROR.value
-        self.payload.setdefault("error_code", "")
-        self.payload.setdefault("error_message", "")
-        self.payload.setdefault("stack_trace", "")
+        self.header.message_type = self._TYPE
+        self.payload = {**self._DEFAULT_PAYLOAD, **self.payload}
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -231,16 +336,21 @@ class ErrorMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AcknowledgmentMessage:
     """Acknowledgment message"""
     header: MessageHeader
     payload: Dict[str, Any] = field(default_factory=dict)
     
+    _TYPE: ClassVar[str] = MessageType.ACK.value
+    _DEFAULT_PAYLOAD: ClassVar[Dict[str, Any]] = {
+        "ack_message_id": "",
+        "status": "received"
+    }
+    
     def __post_init__(self):
-        self.header.message_type = MessageType.ACK.value
-        self.payload.setdefault("ack_message_id", "")
-        self.payload.setdefault("status", "received")
+        self.header.message_type = self._TYPE
+        self.payload = {**self._DEFAULT_PAYLOAD, **self.payload}
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -2,10 +2,102 @@
 Customer Interaction Layer
 Simulates voice/chat responses for customer engagement
 """
+import asyncio
 import random
-from typing import Dict, Any, List
+import re
+import sys
+import time
+from collections import deque
+from operator import itemgetter
+from typing import Dict, Any, List, Sequence, Callable, Optional, AsyncIterator, Tuple
 from datetime import datetime
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# (epoch second, its ISO-8601 UTC string); replaced as a whole when the second
+# changes so threads running receive_notification never see a torn pair
+_TS_CACHE = (0, "")
+
+
+def _utc_iso_now() -> str:
+    """
+    Current UTC time in datetime.isoformat() form, formatting the date part once per second
+    
+    Unlike isoformat(), the microseconds are always included, so a time on a
+    whole second comes out as "...:05.000000" rather than "...:05".
+    """
+    global _TS_CACHE
+    now = time.time()
+    second = int(now)
+    cached_second, cached_iso = _TS_CACHE
+    if second != cached_second:
+        cached_iso = datetime.utcfromtimestamp(second).isoformat()
+        _TS_CACHE = (second, cached_iso)
+    return f"{cached_iso}.{int((now - second) * 1_000_000):06d}"
+
+
+# Shared PCG64 generator for the array draws of the batch APIs
+_RNG = np.random.default_rng()
+
+# Interaction record fields read by get_interaction_summary(recent=True)
+_RESPONDED = itemgetter("responded")
+_RESPONSE_TIME = itemgetter("response_time_minutes")
+_RESPONSE = itemgetter("response")
+_DECISION = itemgetter("decision")
+
+# Keywords in the agent's opening chat message that change the customer's first reply
+_CHAT_KEYWORDS_RE = re.compile(r"urgent|critical|recommend", re.IGNORECASE)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _simulate_responses_kernel(
+        pids, accept_rates, base_times, accept_bonus, time_factor,
+        respond_draws, accept_draws, jitter,
+        out_responded, out_accepted, out_response_times
+    ):
+        """Numeric core of receive_notification_batch, compiled to a parallel loop"""
+        for i in prange(pids.shape[0]):
+            pid = pids[i]
+            out_responded[i] = respond_draws[i] < 0.9
+            out_accepted[i] = accept_draws[i] < min(1.0, accept_rates[pid] + accept_bonus)
+            out_response_times[i] = max(5.0, base_times[pid] * time_factor + jitter[i])
+
+
+def _simulate_responses(pids, accept_rates, base_times, accept_bonus, time_factor,
+                        respond_draws, accept_draws, jitter):
+    """
+    Decide who responds, who accepts, and how fast, for a batch of customers
+    
+    Uses the Numba kernel when numba is installed, NumPy array expressions otherwise.
+    
+    Returns:
+        (responded, accepted, response_times) arrays
+    """
+    if NUMBA_AVAILABLE:
+        count = pids.shape[0]
+        responded = np.empty(count, dtype=np.bool_)
+        accepted = np.empty(count, dtype=np.bool_)
+        response_times = np.empty(count, dtype=np.float64)
+        _simulate_responses_kernel(
+            pids, accept_rates, base_times, accept_bonus, time_factor,
+            respond_draws, accept_draws, jitter,
+            responded, accepted, response_times
+        )
+        return responded, accepted, response_times
+    
+    responded = respond_draws < 0.9  # 90% response rate
+    accepted = accept_draws < np.minimum(1.0, accept_rates[pids] + accept_bonus)
+    response_times = np.maximum(5, base_times[pids] * time_factor + jitter)
+    return responded, accepted, response_times
+
 
 class CustomerInteractionSimulator:
     """Simulates customer responses to service notifications"""
@@ -34,11 +126,115 @@ class CustomerInteractionSimulator:
         }
     }
     
-    def __init__(self, customer_name: str, personality: str = None):
+    # PERSONALITIES as parallel arrays indexed by personality id, for batch simulation
+    _PERSONALITY_IDS = {name: pid for pid, name in enumerate(PERSONALITIES)}
+    _PERSONALITY_NAMES = tuple(PERSONALITIES)
+    _ACCEPT_RATES = np.array([p["acceptance_rate"] for p in PERSONALITIES.values()])
+    _BASE_TIMES = np.array([p["response_time_minutes"] for p in PERSONALITIES.values()], dtype=float)
+    _SENTIMENTS = tuple(p["sentiment"] for p in PERSONALITIES.values())
+    
+    # Urgency effects: response time multiplier and acceptance rate bonus
+    _URGENCY_TIME_FACTORS = {"urgent": 0.5, "high": 0.7}
+    _URGENCY_ACCEPT_BONUS = {"urgent": 0.2, "high": 0.1}
+    
+    # Response texts, indexed by personality id (PERSONALITIES order)
+    _ACCEPT_TEXTS = (
+        (  # cooperative
+            "Thank you for letting me know. I'll schedule an appointment right away.",
+            "I appreciate the heads up. When can I bring it in?",
+            "That's concerning. Please book me for the earliest available slot."
+        ),
+        (  # busy
+            "Okay, I can probably fit this in next week.",
+            "Alright, but I'm pretty busy. What's the soonest I can come in?",
+            "Fine, I'll make time for this."
+        ),
+        (  # skeptical
+            "I guess I should get this checked out.",
+            "Are you sure this is necessary? Well, okay.",
+            "I'll schedule something, but I want a second opinion."
+        ),
+        (  # enthusiastic
+            "Oh wow, thanks for catching that! Let's get it fixed ASAP!",
+            "I really appreciate the proactive notification. Book me in!",
+            "This is exactly why I love this service! When can you see me?"
+        )
+    )
+    _DECLINE_TEXTS = (
+        (  # cooperative
+            "I appreciate the notification, but I'll have to pass for now.",
+            "Thanks, but I think I'll wait a bit longer."
+        ),
+        (  # busy
+            "I really don't have time for this right now.",
+            "Can this wait? I'm swamped."
+        ),
+        (  # skeptical
+            "I don't think this is as urgent as you're making it sound.",
+            "I'll get a second opinion first."
+        ),
+        (  # enthusiastic
+            "Oh no, I wish I could, but I'm traveling!",
+            "Darn, bad timing. Can we reschedule for next month?"
+        )
+    )
+    _DECLINE_REASONS = (
+        "I just had it serviced recently.",
+        "I can't afford this right now.",
+        "I'm too busy this month.",
+        "I'll wait and see if it gets worse.",
+        "I have a mechanic I prefer to use.",
+        "I'm planning to sell the car soon anyway."
+    )
+    _PREFERRED_DATES_BY_URGENCY = {
+        "urgent": ("tomorrow", "as soon as possible"),
+        "high": ("this week", "within 3 days")
+    }
+    _DEFAULT_PREFERRED_DATES = ("next week", "within 2 weeks")
+    _PREFERRED_TIMES = ("morning", "afternoon", "evening")
+    _PREFERRED_LOCATIONS = ("nearest", "downtown", "specific_center")
+    _CHAT_PREFERRED_TIMES = ("morning", "afternoon")
+    _CALL_DECLINE_OUTCOMES = ("declined", "callback_later", "more_info_needed")
+    
+    # Per-personality response generators, filled in by _response_factory
+    _RESPONSE_FACTORIES: Dict[int, Callable[[str, Any], Dict[str, Any]]] = {}
+    
+    # Fleet simulations create many instances, so skip the per-instance __dict__
+    __slots__ = (
+        "customer_name", "personality", "personality_traits",
+        "_pid", "_accept_rate", "_base_time", "_sentiment", "_random", "_make_response",
+        "interaction_history", "_listeners",
+        "_interaction_count", "_responded_count", "_response_time_total", "_accepted_count"
+    )
+    
+    def __init__(
+        self,
+        customer_name: str,
+        personality: str = None,
+        history_cap: int = 1024,
+        seed: Optional[int] = None
+    ):
         self.customer_name = customer_name
-        self.personality = personality or random.choice(list(self.PERSONALITIES.keys()))
+        # Scalar draws stay on the random module (per-call numpy draws are far
+        # slower); a seed gives this customer its own reproducible stream
+        self._random = random.Random(seed) if seed is not None else random
+        self.personality = personality or self._random.choice(self._PERSONALITY_NAMES)
         self.personality_traits = self.PERSONALITIES[self.personality]
-        self.interaction_history = []
+        self._pid = self._PERSONALITY_IDS[self.personality]
+        # Traits unpacked once so the hot paths read attributes, not dict keys
+        self._accept_rate = self.personality_traits["acceptance_rate"]
+        self._base_time = self.personality_traits["response_time_minutes"]
+        self._sentiment = self.personality_traits["sentiment"]
+        self._make_response = self._response_factory(self._pid)
+        # Most recent interactions only; use interactions() to see every record
+        self.interaction_history = deque(maxlen=history_cap)
+        self._listeners: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        
+        # Running totals for get_interaction_summary, kept by _record_interaction
+        self._interaction_count = 0
+        self._responded_count = 0
+        self._response_time_total = 0.0
+        self._accepted_count = 0
     
     def receive_notification(
         self,
@@ -49,7 +245,7 @@ class CustomerInteractionSimulator:
         """Simulate receiving a notification"""
         
         # Determine if customer will respond
-        will_respond = random.random() < 0.9  # 90% response rate
+        will_respond = self._random.random() < 0.9  # 90% response rate
         
         if not will_respond:
             return {
@@ -59,7 +255,7 @@ class CustomerInteractionSimulator:
             }
         
         # Simulate response time
-        base_time = self.personality_traits["response_time_minutes"]
+        base_time = self._base_time
         if urgency == "urgent":
             response_time = base_time * 0.5
         elif urgency == "high":
@@ -67,13 +263,13 @@ class CustomerInteractionSimulator:
         else:
             response_time = base_time
         
-        response_time += random.randint(-10, 30)
+        response_time += self._random.randint(-10, 30)
         
         # Generate response
         response = self._generate_response(notification_type, message, urgency)
         
         interaction = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_iso_now(),
             "notification_type": notification_type,
             "message": message,
             "urgency": urgency,
@@ -82,10 +278,173 @@ class CustomerInteractionSimulator:
             "response": response
         }
         
-        self.interaction_history.append(interaction)
+        self._record_interaction(interaction)
         
         return interaction
     
+    @classmethod
+    def receive_notification_batch(
+        cls,
+        simulators: Sequence["CustomerInteractionSimulator"],
+        notification_type: str,
+        message: str,
+        urgency: str = "normal",
+        seed: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Simulate many customers receiving the same notification
+        
+        Same outcome distribution as calling receive_notification on each
+        simulator, but the response/acceptance draws and response times are
+        computed as arrays in one pass.
+        
+        The batch draws from its own generators, not from each simulator's
+        seeded stream, so pass seed for a reproducible batch.
+        
+        Args:
+            seed: Seed for this batch's draws (shared unseeded generators if None)
+        
+        Returns:
+            One result per simulator, in order
+        """
+        count = len(simulators)
+        rng = np.random.default_rng(seed) if seed is not None else _RNG
+        text_random = random.Random(seed) if seed is not None else random
+        pids = np.fromiter((sim._pid for sim in simulators), dtype=np.int8, count=count)
+        
+        responded, accepted, response_times = _simulate_responses(
+            pids,
+            cls._ACCEPT_RATES,
+            cls._BASE_TIMES,
+            cls._URGENCY_ACCEPT_BONUS.get(urgency, 0.0),
+            cls._URGENCY_TIME_FACTORS.get(urgency, 1.0),
+            rng.random(count),
+            rng.random(count),
+            rng.integers(-10, 31, count).astype(np.float64)
+        )
+        
+        responses = cls._batch_responses(
+            pids, responded & accepted, responded & ~accepted, urgency, rng, text_random
+        )
+        
+        results = []
+        for sim, did_respond, response_time, response in zip(
+            simulators, responded.tolist(), response_times.tolist(), responses
+        ):
+            if not did_respond:
+                results.append({
+                    "responded": False,
+                    "response_time_minutes": None,
+                    "response": None
+                })
+                continue
+            
+            interaction = {
+                "timestamp": _utc_iso_now(),
+                "notification_type": notification_type,
+                "message": message,
+                "urgency": urgency,
+                "responded": True,
+                "response_time_minutes": response_time,
+                "response": response
+            }
+            sim._record_interaction(interaction)
+            results.append(interaction)
+        
+        return results
+    
+    @classmethod
+    def _batch_responses(
+        cls,
+        pids: np.ndarray,
+        accept_mask: np.ndarray,
+        decline_mask: np.ndarray,
+        urgency: str,
+        rng: np.random.Generator,
+        text_random: Any
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Build acceptance/decline responses for a batch, grouped by personality
+        
+        Each (personality, decision) group draws all of its texts with one
+        choices call instead of one choice per customer.
+        
+        Args:
+            rng: Generator for the reschedule-interest draws
+            text_random: random module or random.Random used to pick texts
+        
+        Returns:
+            Response per customer, None where neither mask is set
+        """
+        choices = text_random.choices
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(pids)
+        preferred_dates = cls._PREFERRED_DATES_BY_URGENCY.get(urgency, cls._DEFAULT_PREFERRED_DATES)
+        
+        for pid in np.unique(pids[accept_mask]).tolist():
+            indices = np.flatnonzero(accept_mask & (pids == pid)).tolist()
+            k = len(indices)
+            sentiment = cls._SENTIMENTS[pid]
+            for i, text, preferred_time, preferred_location in zip(
+                indices,
+                choices(cls._ACCEPT_TEXTS[pid], k=k),
+                choices(cls._PREFERRED_TIMES, k=k),
+                choices(cls._PREFERRED_LOCATIONS, k=k)
+            ):
+                responses[i] = {
+                    "decision": "accepted",
+                    "text": text,
+                    "sentiment": sentiment,
+                    "preferred_dates": list(preferred_dates),
+                    "preferred_time": preferred_time,
+                    "preferred_location": preferred_location
+                }
+        
+        for pid in np.unique(pids[decline_mask]).tolist():
+            indices = np.flatnonzero(decline_mask & (pids == pid)).tolist()
+            k = len(indices)
+            sentiment = cls._SENTIMENTS[pid]
+            for i, text, reason, reschedule_interest in zip(
+                indices,
+                choices(cls._DECLINE_TEXTS[pid], k=k),
+                choices(cls._DECLINE_REASONS, k=k),
+                (rng.random(k) < 0.5).tolist()
+            ):
+                responses[i] = {
+                    "decision": "declined",
+                    "text": text,
+                    "reason": reason,
+                    "sentiment": sentiment,
+                    "reschedule_interest": reschedule_interest
+                }
+        
+        return responses
+    
+    def _record_interaction(self, interaction: Dict[str, Any]):
+        """Add an interaction to the history and the summary totals, and hand it to listeners"""
+        self.interaction_history.append(interaction)
+        for loop, queue in self._listeners:
+            loop.call_soon_threadsafe(queue.put_nowait, interaction)
+        self._interaction_count += 1
+        if interaction["responded"]:
+            self._responded_count += 1
+            self._response_time_total += interaction["response_time_minutes"]
+            self._accepted_count += interaction["response"]["decision"] == "accepted"
+    
+    async def interactions(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every interaction recorded from now on, as it happens
+        
+        Unlike interaction_history this is not capped, so long simulations
+        can process all records without retaining them.
+        """
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        self._listeners.append(entry)
+        try:
+            while True:
+                yield await entry[1].get()
+        finally:
+            self._listeners.remove(entry)
+    
     def _generate_response(
         self,
         notification_type: str,
@@ -93,110 +452,62 @@ class CustomerInteractionSimulator:
         urgency: str
     ) -> Dict[str, Any]:
         """Generate customer response"""
-        
-        # Determine acceptance
-        acceptance_rate = self.personality_traits["acceptance_rate"]
-        
-        # Increase acceptance for urgent issues
-        if urgency == "urgent":
-            acceptance_rate = min(1.0, acceptance_rate + 0.2)
-        elif urgency == "high":
-            acceptance_rate = min(1.0, acceptance_rate + 0.1)
-        
-        will_accept = random.random() < acceptance_rate
-        
-        if will_accept:
-            return self._generate_acceptance_response(urgency)
-        else:
-            return self._generate_decline_response()
-    
-    def _generate_acceptance_response(self, urgency: str) -> Dict[str, Any]:
-        """Generate acceptance response"""
-        
-        responses_by_personality = {
-            "cooperative": [
-                "Thank you for letting me know. I'll schedule an appointment right away.",
-                "I appreciate the heads up. When can I bring it in?",
-                "That's concerning. Please book me for the earliest available slot."
-            ],
-            "busy": [
-                "Okay, I can probably fit this in next week.",
-                "Alright, but I'm pretty busy. What's the soonest I can come in?",
-                "Fine, I'll make time for this."
-            ],
-            "skeptical": [
-                "I guess I should get this checked out.",
-                "Are you sure this is necessary? Well, okay.",
-                "I'll schedule something, but I want a second opinion."
-            ],
-            "enthusiastic": [
-                "Oh wow, thanks for catching that! Let's get it fixed ASAP!",
-                "I really appreciate the proactive notification. Book me in!",
-                "This is exactly why I love this service! When can you see me?"
-            ]
-        }
-        
-        text = random.choice(responses_by_personality[self.personality])
-        
-        # Preferred dates
-        preferred_dates = []
-        if urgency == "urgent":
-            preferred_dates = ["tomorrow", "as soon as possible"]
-        elif urgency == "high":
-            preferred_dates = ["this week", "within 3 days"]
-        else:
-            preferred_dates = ["next week", "within 2 weeks"]
-        
-        return {
-            "decision": "accepted",
-            "text": text,
-            "sentiment": self.personality_traits["sentiment"],
-            "preferred_dates": preferred_dates,
-            "preferred_time": random.choice(["morning", "afternoon", "evening"]),
-            "preferred_location": random.choice(["nearest", "downtown", "specific_center"])
-        }
+        return self._make_response(urgency, self._random)
     
-    def _generate_decline_response(self) -> Dict[str, Any]:
-        """Generate decline response"""
-        
-        decline_reasons = [
-            "I just had it serviced recently.",
-            "I can't afford this right now.",
-            "I'm too busy this month.",
-            "I'll wait and see if it gets worse.",
-            "I have a mechanic I prefer to use.",
-            "I'm planning to sell the car soon anyway."
-        ]
-        
-        responses_by_personality = {
-            "cooperative": [
-                "I appreciate the notification, but I'll have to pass for now.",
-                "Thanks, but I think I'll wait a bit longer."
-            ],
-            "busy": [
-                "I really don't have time for this right now.",
-                "Can this wait? I'm swamped."
-            ],
-            "skeptical": [
-                "I don't think this is as urgent as you're making it sound.",
-                "I'll get a second opinion first."
-            ],
-            "enthusiastic": [
-                "Oh no, I wish I could, but I'm traveling!",
-                "Darn, bad timing. Can we reschedule for next month?"
-            ]
+    @classmethod
+    def _response_factory(cls, pid: int) -> Callable[[str, Any], Dict[str, Any]]:
+        """
+        Get the response generator for a personality, building it on first use
+        
+        The personality's acceptance rates, texts and sentiment are bound into
+        the closure as constants, so generating a response needs no trait
+        lookups or urgency branches. The generator is called as
+        make_response(urgency, rng), where rng provides random() and choice().
+        """
+        factory = cls._RESPONSE_FACTORIES.get(pid)
+        if factory is not None:
+            return factory
+        
+        traits = cls.PERSONALITIES[cls._PERSONALITY_NAMES[pid]]
+        base_rate = traits["acceptance_rate"]
+        # Increase acceptance for urgent issues
+        accept_rates = {
+            urgency: min(1.0, base_rate + bonus)
+            for urgency, bonus in cls._URGENCY_ACCEPT_BONUS.items()
         }
+        sentiment = traits["sentiment"]
+        accept_texts = cls._ACCEPT_TEXTS[pid]
+        decline_texts = cls._DECLINE_TEXTS[pid]
+        decline_reasons = cls._DECLINE_REASONS
+        dates_by_urgency = cls._PREFERRED_DATES_BY_URGENCY
+        default_dates = cls._DEFAULT_PREFERRED_DATES
+        preferred_times = cls._PREFERRED_TIMES
+        preferred_locations = cls._PREFERRED_LOCATIONS
+        
+        def make_response(urgency: str, rng: Any) -> Dict[str, Any]:
+            choice = rng.choice
+            if rng.random() < accept_rates.get(urgency, base_rate):
+                return {
+                    "decision": "accepted",
+                    "text": choice(accept_texts),
+                    "sentiment": sentiment,
+                    "preferred_dates": list(dates_by_urgency.get(urgency, default_dates)),
+                    "preferred_time": choice(preferred_times),
+                    "preferred_location": choice(preferred_locations)
+                }
+            
+            text = choice(decline_texts)
+            reason = choice(decline_reasons)
+            return {
+                "decision": "declined",
+                "text": text,
+                "reason": reason,
+                "sentiment": sentiment,
+                "reschedule_interest": rng.random() < 0.5
+            }
         
-        text = random.choice(responses_by_personality[self.personality])
-        reason = random.choice(decline_reasons)
-        
-        return {
-            "decision": "declined",
-            "text": text,
-            "reason": reason,
-            "sentiment": self.personality_traits["sentiment"],
-            "reschedule_interest": random.random() < 0.5
-        }
+        cls._RESPONSE_FACTORIES[pid] = make_response
+        return make_response
     
     def simulate_chat_conversation(
         self,
@@ -208,10 +519,11 @@ class CustomerInteractionSimulator:
             {"role": "agent", "message": initial_message}
         ]
         
-        # Customer's first response
-        if "urgent" in initial_message.lower() or "critical" in initial_message.lower():
+        # Customer's first response (one regex pass finds every keyword present)
+        keywords = {keyword.lower() for keyword in _CHAT_KEYWORDS_RE.findall(initial_message)}
+        if "urgent" in keywords or "critical" in keywords:
             customer_response = "Oh no, that sounds serious! What should I do?"
-        elif "recommend" in initial_message.lower():
+        elif "recommend" in keywords:
             customer_response = "Thanks for letting me know. Tell me more."
         else:
             customer_response = "Okay, I'm listening."
@@ -223,14 +535,14 @@ class CustomerInteractionSimulator:
         conversation.append({"role": "agent", "message": agent_detail})
         
         # Customer decides
-        if random.random() < self.personality_traits["acceptance_rate"]:
+        if self._random.random() < self._accept_rate:
             customer_decision = "Alright, let's schedule an appointment. When are you available?"
             conversation.append({"role": "customer", "message": customer_decision})
             
             agent_scheduling = "Great! I can see several available slots this week. Would morning or afternoon work better for you?"
             conversation.append({"role": "agent", "message": agent_scheduling})
             
-            customer_preference = f"I prefer {random.choice(['morning', 'afternoon'])} appointments."
+            customer_preference = f"I prefer {self._random.choice(self._CHAT_PREFERRED_TIMES)} appointments."
             conversation.append({"role": "customer", "message": customer_preference})
         else:
             customer_decision = "I appreciate the information, but I'll have to think about it."
@@ -248,24 +560,24 @@ class CustomerInteractionSimulator:
         """Simulate a voice call interaction"""
         
         # Call answered?
-        answered = random.random() < 0.7  # 70% answer rate
+        answered = self._random.random() < 0.7  # 70% answer rate
         
         if not answered:
             return {
                 "answered": False,
                 "voicemail_left": True,
-                "callback_requested": random.random() < 0.8
+                "callback_requested": self._random.random() < 0.8
             }
         
         # Call duration
-        duration_seconds = random.randint(60, 300)
+        duration_seconds = self._random.randint(60, 300)
         
         # Call outcome
-        if random.random() < self.personality_traits["acceptance_rate"]:
+        if self._random.random() < self._accept_rate:
             outcome = "appointment_scheduled"
             appointment_confirmed = True
         else:
-            outcome = random.choice(["declined", "callback_later", "more_info_needed"])
+            outcome = self._random.choice(self._CALL_DECLINE_OUTCOMES)
             appointment_confirmed = False
         
         return {
@@ -273,36 +585,241 @@ class CustomerInteractionSimulator:
             "duration_seconds": duration_seconds,
             "outcome": outcome,
             "appointment_confirmed": appointment_confirmed,
-            "customer_sentiment": self.personality_traits["sentiment"],
+            "customer_sentiment": self._sentiment,
             "notes": f"Customer was {self.personality}. {outcome.replace('_', ' ').title()}."
         }
     
-    def get_interaction_summary(self) -> Dict[str, Any]:
-        """Get summary of all interactions"""
-        
-        total_interactions = len(self.interaction_history)
-        responded = sum(1 for i in self.interaction_history if i["responded"])
+    def get_interaction_summary(self, recent: bool = False) -> Dict[str, Any]:
+        """
+        Get summary of interactions
+        
+        Args:
+            recent: Summarize only the records still in interaction_history
+                (the last history_cap) instead of every interaction so far
+        """
+        if recent:
+            history = self.interaction_history
+            total_interactions = len(history)
+            answered = list(filter(_RESPONDED, history))
+            responded = len(answered)
+            response_time_total = sum(map(_RESPONSE_TIME, answered))
+            accepted = list(map(_DECISION, map(_RESPONSE, answered))).count("accepted")
+        else:
+            # Running totals, no history scan
+            total_interactions = self._interaction_count
+            responded = self._responded_count
+            response_time_total = self._response_time_total
+            accepted = self._accepted_count
         
         return {
             "customer_name": self.customer_name,
             "personality": self.personality,
             "total_interactions": total_interactions,
             "response_rate": responded / total_interactions if total_interactions > 0 else 0,
-            "avg_response_time_minutes": sum(
-                i["response_time_minutes"] for i in self.interaction_history if i["responded"]
-            ) / responded if responded > 0 else 0,
-            "acceptance_rate": sum(
-                1 for i in self.interaction_history 
-                if i["responded"] and i["response"]["decision"] == "accepted"
-            ) / responded if responded > 0 else 0
+            "avg_response_time_minutes": response_time_total / responded if responded > 0 else 0,
+            "acceptance_rate": accepted / responded if responded > 0 else 0
+        }
+
+
+class CustomerFleet:
+    """
+    Many simulated customers stored as parallel arrays (one entry per customer)
+    
+    Behaves like a list of CustomerInteractionSimulator objects for
+    notification campaigns, but each batch is decided with array operations
+    over the whole fleet, with no per-customer objects involved.
+    """
+    
+    def __init__(self, names: Sequence[str], pids: np.ndarray, seed: Optional[int] = None):
+        self.names = list(names)
+        self.pids = np.asarray(pids, dtype=np.int8)
+        self._rng = np.random.default_rng(seed) if seed is not None else _RNG
+        count = len(self.names)
+        
+        # Per-customer running totals
+        self.notification_counts = np.zeros(count, dtype=np.int32)
+        self.responded_counts = np.zeros(count, dtype=np.int32)
+        self.accepted_counts = np.zeros(count, dtype=np.int32)
+        self.response_time_totals = np.zeros(count, dtype=np.float64)
+    
+    @classmethod
+    def from_simulators(
+        cls,
+        simulators: Sequence[CustomerInteractionSimulator],
+        seed: Optional[int] = None
+    ) -> "CustomerFleet":
+        """
+        Build a fleet with the same customers and personalities as the given simulators
+        
+        The simulators' own seeds do not carry over; pass seed for a
+        reproducible fleet.
+        """
+        return cls(
+            [sim.customer_name for sim in simulators],
+            np.fromiter((sim._pid for sim in simulators), dtype=np.int8, count=len(simulators)),
+            seed=seed
+        )
+    
+    @classmethod
+    def from_vehicle_owners(
+        cls,
+        vehicles: Sequence[Dict[str, Any]],
+        personality: Optional[str] = None,
+        seed: Optional[int] = None
+    ) -> "CustomerFleet":
+        """
+        Build a fleet from the owners of generated vehicles
+        
+        Args:
+            vehicles: Vehicle dicts as produced by SyntheticVehicleGenerator
+            personality: Personality for every owner (random per owner if None)
+            seed: Seed for the fleet's generator, for reproducible campaigns
+        """
+        count = len(vehicles)
+        fleet = cls([vehicle["owner"]["name"] for vehicle in vehicles], np.zeros(count), seed=seed)
+        if personality is None:
+            fleet.pids[:] = fleet._rng.integers(0, len(CustomerInteractionSimulator.PERSONALITIES), count)
+        else:
+            fleet.pids[:] = CustomerInteractionSimulator._PERSONALITY_IDS[personality]
+        return fleet
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def personality(self, index: int) -> str:
+        """Personality name of one customer"""
+        return CustomerInteractionSimulator._PERSONALITY_NAMES[self.pids[index]]
+    
+    def receive_notification_batch(self, urgency: str = "normal") -> Dict[str, np.ndarray]:
+        """
+        Simulate every customer in the fleet receiving one notification
+        
+        Same outcome distribution as CustomerInteractionSimulator.receive_notification;
+        only the decision is simulated, not the response texts.
+        
+        Returns:
+            Arrays indexed like the fleet: "responded", "accepted" (False where
+            not responded) and "response_time_minutes" (NaN where not responded)
+        """
+        sim_cls = CustomerInteractionSimulator
+        rng = self._rng
+        count = len(self.names)
+        
+        responded, accepted, response_times = _simulate_responses(
+            self.pids,
+            sim_cls._ACCEPT_RATES,
+            sim_cls._BASE_TIMES,
+            sim_cls._URGENCY_ACCEPT_BONUS.get(urgency, 0.0),
+            sim_cls._URGENCY_TIME_FACTORS.get(urgency, 1.0),
+            rng.random(count),
+            rng.random(count),
+            rng.integers(-10, 31, count).astype(np.float64)
+        )
+        accepted &= responded
+        
+        self.notification_counts += 1
+        self.responded_counts += responded
+        self.accepted_counts += accepted
+        self.response_time_totals += np.where(responded, response_times, 0.0)
+        
+        return {
+            "responded": responded,
+            "accepted": accepted,
+            "response_time_minutes": np.where(responded, response_times, np.nan)
         }
+    
+    def get_fleet_summary(self) -> Dict[str, Any]:
+        """Aggregate of all notifications and responses across the fleet"""
+        total_notifications = int(self.notification_counts.sum())
+        responded = int(self.responded_counts.sum())
+        
+        return {
+            "customers": len(self.names),
+            "total_notifications": total_notifications,
+            "response_rate": responded / total_notifications if total_notifications > 0 else 0,
+            "avg_response_time_minutes": float(self.response_time_totals.sum()) / responded if responded > 0 else 0,
+            "acceptance_rate": int(self.accepted_counts.sum()) / responded if responded > 0 else 0
+        }
+
+
+async def iter_batch_results(
+    customers: Sequence[CustomerInteractionSimulator],
+    notification: Dict[str, Any],
+    max_concurrency: int = 10
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Send one notification to many customers, yielding results as they complete
+    
+    At most max_concurrency simulations run at once (each in a worker thread),
+    so memory stays bounded however many customers are passed.
+    
+    Args:
+        customers: Customers to notify
+        notification: Dict with "type", "message" and "urgency"
+        max_concurrency: Maximum simultaneous simulations
+        
+    Yields:
+        (index into customers, interaction dict or the exception it raised)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def _one(index: int, customer: CustomerInteractionSimulator):
+        async with semaphore:
+            try:
+                return index, await asyncio.to_thread(
+                    customer.receive_notification,
+                    notification["type"],
+                    notification["message"],
+                    notification.get("urgency", "normal")
+                )
+            except Exception as e:
+                return index, e
+    
+    for next_done in asyncio.as_completed([_one(i, c) for i, c in enumerate(customers)]):
+        yield await next_done
+
+
+async def simulate_batch(
+    customers: Sequence[CustomerInteractionSimulator],
+    notification: Dict[str, Any],
+    max_concurrency: int = 10,
+    on_progress: Optional[Callable[[int, int, float], None]] = None
+) -> List[Any]:
+    """
+    Send one notification to many customers with bounded concurrency
+    
+    Args:
+        customers: Customers to notify
+        notification: Dict with "type", "message" and "urgency"
+        max_concurrency: Maximum simultaneous simulations
+        on_progress: Called as on_progress(done, total, eta_seconds) after each completion
+        
+    Returns:
+        Results in customer order; a failed simulation's slot holds its exception
+    """
+    total = len(customers)
+    results: List[Any] = [None] * total
+    started = time.monotonic()
+    done = 0
+    
+    async for index, result in iter_batch_results(customers, notification, max_concurrency):
+        results[index] = result
+        done += 1
+        if on_progress:
+            elapsed = time.monotonic() - started
+            on_progress(done, total, elapsed / done * (total - done))
+    
+    return results
 
 
 def demo_customer_interactions():
     """Demonstrate customer interaction simulation"""
-    print("="*80)
-    print("CUSTOMER INTERACTION SIMULATOR DEMO")
-    print("="*80)
+    # Output is buffered and written in one call at the end
+    out = []
+    
+    out.append("="*80)
+    out.append("CUSTOMER INTERACTION SIMULATOR DEMO")
+    out.append("="*80)
     
     # Create customers with different personalities
     customers = [
@@ -319,32 +836,30 @@ def demo_customer_interactions():
         "urgency": "high"
     }
     
-    print("\nSending notification to customers...")
-    print(f"Message: {notification['message']}")
-    print(f"Urgency: {notification['urgency']}")
+    out.append("\nSending notification to customers...")
+    out.append(f"Message: {notification['message']}")
+    out.append(f"Urgency: {notification['urgency']}")
     
-    for customer in customers:
-        print(f"\n{'-'*80}")
-        print(f"Customer: {customer.customer_name} (Personality: {customer.personality})")
-        
-        response = customer.receive_notification(
-            notification["type"],
-            notification["message"],
-            notification["urgency"]
-        )
-        
-        if response["responded"]:
-            print(f"  Responded in: {response['response_time_minutes']} minutes")
-            print(f"  Decision: {response['response']['decision']}")
-            print(f"  Response: {response['response']['text']}")
-            print(f"  Sentiment: {response['response']['sentiment']}")
+    responses = asyncio.run(simulate_batch(customers, notification))
+    
+    for customer, response in zip(customers, responses):
+        out.append(f"\n{'-'*80}")
+        out.append(f"Customer: {customer.customer_name} (Personality: {customer.personality})")
+        
+        if isinstance(response, Exception):
+            out.append(f"  Simulation failed: {response}")
+        elif response["responded"]:
+            out.append(f"  Responded in: {response['response_time_minutes']} minutes")
+            out.append(f"  Decision: {response['response']['decision']}")
+            out.append(f"  Response: {response['response']['text']}")
+            out.append(f"  Sentiment: {response['response']['sentiment']}")
         else:
-            print("  Did not respond")
+            out.append("  Did not respond")
     
     # Simulate chat conversation
-    print(f"\n{'='*80}")
-    print("CHAT CONVERSATION SIMULATION")
-    print(f"{'='*80}")
+    out.append(f"\n{'='*80}")
+    out.append("CHAT CONVERSATION SIMULATION")
+    out.append(f"{'='*80}")
     
     customer = customers[0]
     conversation = customer.simulate_chat_conversation(
@@ -353,21 +868,23 @@ def demo_customer_interactions():
     
     for message in conversation:
         role = message["role"].upper()
-        print(f"\n{role}: {message['message']}")
+        out.append(f"\n{role}: {message['message']}")
     
     # Simulate voice call
-    print(f"\n{'='*80}")
-    print("VOICE CALL SIMULATION")
-    print(f"{'='*80}")
+    out.append(f"\n{'='*80}")
+    out.append("VOICE CALL SIMULATION")
+    out.append(f"{'='*80}")
     
     call_result = customer.simulate_voice_call("schedule_maintenance")
-    print(f"\nCall Result:")
-    print(f"  Answered: {call_result['answered']}")
+    out.append(f"\nCall Result:")
+    out.append(f"  Answered: {call_result['answered']}")
     if call_result['answered']:
-        print(f"  Duration: {call_result['duration_seconds']} seconds")
-        print(f"  Outcome: {call_result['outcome']}")
-        print(f"  Appointment Confirmed: {call_result['appointment_confirmed']}")
-        print(f"  Notes: {call_result['notes']}")
+        out.append(f"  Duration: {call_result['duration_seconds']} seconds")
+        out.append(f"  Outcome: {call_result['outcome']}")
+        out.append(f"  Appointment Confirmed: {call_result['appointment_confirmed']}")
+        out.append(f"  Notes: {call_result['notes']}")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -5,121 +5,181 @@ Demonstrates all components working together
 import asyncio
 import json
 from datetime import datetime, timedelta
+from typing import List, TYPE_CHECKING
 import sys
 import os
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from mock_infrastructure.synthetic_vehicle_data import SyntheticVehicleGenerator
-from mock_infrastructure.maintenance_database import MaintenanceDatabase
-from mock_infrastructure.customer_interaction_simulator import CustomerInteractionSimulator
+# The simulators are imported where they are used, so importing this module
+# (e.g. to introspect it) does not pull in NumPy and the data generators
+if TYPE_CHECKING:
+    from mock_infrastructure.customer_interaction_simulator import CustomerInteractionSimulator
+
+
+def _flush_lines(lines: List[str]) -> None:
+    """Write buffered demo output in a single call and empty the buffer"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
+
+def _load_service_history(vin: str):
+    """Build the maintenance database from the saved dataset and return one vehicle's history"""
+    from mock_infrastructure.maintenance_database import MaintenanceDatabase
+    
+    db = MaintenanceDatabase()
+    db.initialize_schema()
+    db.import_synthetic_data()
+    history = db.get_service_history(vin)
+    db.close()
+    return history
+
+
+def _engage_customer(customer: "CustomerInteractionSimulator", message: str, urgency: str):
+    """Send the maintenance notification and run the follow-up chat"""
+    response = customer.receive_notification(
+        notification_type="maintenance_alert",
+        message=message,
+        urgency=urgency
+    )
+    conversation = customer.simulate_chat_conversation(
+        "Hello! We've detected that your brake pads need attention soon."
+    )
+    return response, conversation
 
 
 async def demo_complete_workflow():
     """Demonstrate complete workflow with all components"""
+    from mock_infrastructure.synthetic_vehicle_data import SyntheticVehicleGenerator
+    from mock_infrastructure.customer_interaction_simulator import CustomerInteractionSimulator, CustomerFleet
     
-    print("="*80)
-    print("INTEGRATED MOCK INFRASTRUCTURE DEMO")
-    print("Complete Vehicle Maintenance System Simulation")
-    print("="*80)
+    # Output is buffered and written once per step
+    out = []
+    
+    out.append("="*80)
+    out.append("INTEGRATED MOCK INFRASTRUCTURE DEMO")
+    out.append("Complete Vehicle Maintenance System Simulation")
+    out.append("="*80)
     
     # Step 1: Generate Synthetic Vehicles
-    print("\n" + "="*80)
-    print("STEP 1: GENERATING SYNTHETIC VEHICLE DATASET")
-    print("="*80)
+    out.append("\n" + "="*80)
+    out.append("STEP 1: GENERATING SYNTHETIC VEHICLE DATASET")
+    out.append("="*80)
     
+    _flush_lines(out)  # save_to_json prints its own line
     generator = SyntheticVehicleGenerator(num_vehicles=10)
     vehicles = generator.generate_all_vehicles()
     generator.save_to_json("mock_infrastructure/synthetic_vehicles.json")
     
-    print(f"\n✓ Generated {len(vehicles)} vehicles with:")
-    print("  - VIN, model, year, mileage")
-    print("  - Owner contact information")
-    print("  - Maintenance history")
-    print("  - Simulated telematics")
-    print("  - Realistic failure scenarios")
+    out.append(f"\n✓ Generated {len(vehicles)} vehicles with:")
+    out.append("  - VIN, model, year, mileage")
+    out.append("  - Owner contact information")
+    out.append("  - Maintenance history")
+    out.append("  - Simulated telematics")
+    out.append("  - Realistic failure scenarios")
     
-    # Show sample vehicle
     sample_vehicle = vehicles[2]  # Vehicle with brake issue
-    print(f"\nSample Vehicle (VIN: {sample_vehicle['vin']}):")
-    print(f"  Model: {sample_vehicle['year']} {sample_vehicle['model']}")
-    print(f"  Mileage: {sample_vehicle['current_mileage']:,} miles")
-    print(f"  Owner: {sample_vehicle['owner']['name']}")
-    print(f"  Email: {sample_vehicle['owner']['email']}")
-    print(f"  Phone: {sample_vehicle['owner']['phone']}")
+    scenario = sample_vehicle['failure_scenario']
+    
+    # Steps 2 and 5 only depend on the saved dataset, so start them in worker
+    # threads now and print their results when their step comes up
+    customer = CustomerInteractionSimulator(
+        customer_name=sample_vehicle['owner']['name'],
+        personality="cooperative"
+    )
+    notification_message = (
+        f"Hello {customer.customer_name}, our analysis shows your "
+        f"{sample_vehicle['year']} {sample_vehicle['model']}'s brake pads are at "
+        f"{scenario['current_condition_percent']}% remaining. We recommend scheduling "
+        f"service within {scenario['predicted_failure_days']} days to ensure your safety."
+    )
+    history_task = asyncio.create_task(asyncio.to_thread(_load_service_history, sample_vehicle['vin']))
+    engagement_task = asyncio.create_task(asyncio.to_thread(
+        _engage_customer, customer, notification_message, scenario['severity'].lower()
+    ))
+    
+    # Show sample vehicle
+    out.append(f"\nSample Vehicle (VIN: {sample_vehicle['vin']}):")
+    out.append(f"  Model: {sample_vehicle['year']} {sample_vehicle['model']}")
+    out.append(f"  Mileage: {sample_vehicle['current_mileage']:,} miles")
+    out.append(f"  Owner: {sample_vehicle['owner']['name']}")
+    out.append(f"  Email: {sample_vehicle['owner']['email']}")
+    out.append(f"  Phone: {sample_vehicle['owner']['phone']}")
     
     # Show failure scenario
-    scenario = sample_vehicle['failure_scenario']
-    print(f"\n  ⚠️  FAILURE SCENARIO:")
-    print(f"      Component: {scenario['component']}")
-    print(f"      Issue: {scenario['issue_description']}")
-    print(f"      Severity: {scenario['severity']}")
-    print(f"      Condition: {scenario['current_condition_percent']}%")
-    print(f"      Predicted Failure: {scenario['predicted_failure_days']} days")
-    print(f"      Symptoms: {', '.join(scenario['symptoms'])}")
+    out.append(f"\n  ⚠️  FAILURE SCENARIO:")
+    out.append(f"      Component: {scenario['component']}")
+    out.append(f"      Issue: {scenario['issue_description']}")
+    out.append(f"      Severity: {scenario['severity']}")
+    out.append(f"      Condition: {scenario['current_condition_percent']}%")
+    out.append(f"      Predicted Failure: {scenario['predicted_failure_days']} days")
+    out.append(f"      Symptoms: {', '.join(scenario['symptoms'])}")
+    
+    _flush_lines(out)
     
     # Step 2: Initialize Maintenance Database
-    print("\n" + "="*80)
-    print("STEP 2: INITIALIZING MAINTENANCE RECORDS DATABASE")
-    print("="*80)
+    out.append("\n" + "="*80)
+    out.append("STEP 2: INITIALIZING MAINTENANCE RECORDS DATABASE")
+    out.append("="*80)
     
-    db = MaintenanceDatabase()
-    db.initialize_schema()
-    db.import_synthetic_data()
+    _flush_lines(out)
+    history = await history_task
     
-    print("\n✓ Database initialized with:")
-    print(f"  - {len(vehicles)} vehicles")
-    print("  - Complete maintenance history")
-    print("  - Service records with parts and costs")
+    out.append("\n✓ Database initialized with:")
+    out.append(f"  - {len(vehicles)} vehicles")
+    out.append("  - Complete maintenance history")
+    out.append("  - Service records with parts and costs")
     
-    # Query sample maintenance history
-    history = db.get_service_history(sample_vehicle['vin'])
-    print(f"\nMaintenance History for {sample_vehicle['vin']}:")
+    # Sample maintenance history
+    out.append(f"\nMaintenance History for {sample_vehicle['vin']}:")
     for record in history[:3]:
-        print(f"  {record['service_date'][:10]} @ {record['mileage']:,} miles:")
-        print(f"    Services: {', '.join(record['services_performed'])}")
-        print(f"    Cost: ${record['cost']:.2f}")
+        out.append(f"  {record['service_date'][:10]} @ {record['mileage']:,} miles:")
+        out.append(f"    Services: {', '.join(record['services_performed'])}")
+        out.append(f"    Cost: ${record['cost']:.2f}")
     
-    db.close()
+    _flush_lines(out)
     
     # Step 3: Simulate Telematics Data
-    print("\n" + "="*80)
-    print("STEP 3: SIMULATING TELEMATICS DATA STREAM")
-    print("="*80)
+    out.append("\n" + "="*80)
+    out.append("STEP 3: SIMULATING TELEMATICS DATA STREAM")
+    out.append("="*80)
     
-    print("\n✓ Telematics API would stream data every 5 seconds")
-    print("  Endpoints:")
-    print("    GET  /api/vehicles - List all vehicles")
-    print("    GET  /api/telemetry/{vin} - Get current telemetry")
-    print("    WS   /api/stream/{vin} - Stream telemetry")
+    out.append("\n✓ Telematics API would stream data every 5 seconds")
+    out.append("  Endpoints:")
+    out.append("    GET  /api/vehicles - List all vehicles")
+    out.append("    GET  /api/telemetry/{vin} - Get current telemetry")
+    out.append("    WS   /api/stream/{vin} - Stream telemetry")
     
     # Show current telemetry
     telemetry = sample_vehicle['telematics']
-    print(f"\nCurrent Telemetry for {sample_vehicle['vin']}:")
-    print(f"  Engine Temp: {telemetry['engine_temperature']:.1f}°F")
-    print(f"  Oil Pressure: {telemetry['oil_pressure']:.1f} PSI")
-    print(f"  Battery: {telemetry['battery_voltage']:.1f}V")
-    print(f"  Speed: {telemetry['speed']:.0f} mph")
-    print(f"  Odometer: {telemetry['odometer']:,} miles")
+    out.append(f"\nCurrent Telemetry for {sample_vehicle['vin']}:")
+    out.append(f"  Engine Temp: {telemetry['engine_temperature']:.1f}°F")
+    out.append(f"  Oil Pressure: {telemetry['oil_pressure']:.1f} PSI")
+    out.append(f"  Battery: {telemetry['battery_voltage']:.1f}V")
+    out.append(f"  Speed: {telemetry['speed']:.0f} mph")
+    out.append(f"  Odometer: {telemetry['odometer']:,} miles")
     
     # Show brake pad thickness (critical for this vehicle)
-    print(f"\n  Brake Pad Thickness:")
+    out.append(f"\n  Brake Pad Thickness:")
     for position, thickness in telemetry['brake_pad_thickness'].items():
         status = "⚠️ CRITICAL" if thickness < 3.0 else "✓ OK"
-        print(f"    {position}: {thickness:.1f}mm {status}")
+        out.append(f"    {position}: {thickness:.1f}mm {status}")
+    
+    _flush_lines(out)
     
     # Step 4: Service Scheduler
-    print("\n" + "="*80)
-    print("STEP 4: SERVICE SCHEDULER API")
-    print("="*80)
+    out.append("\n" + "="*80)
+    out.append("STEP 4: SERVICE SCHEDULER API")
+    out.append("="*80)
     
-    print("\n✓ Service Scheduler API provides:")
-    print("  - 3 service centers with availability")
-    print("  - Hourly appointment slots")
-    print("  - Booking and confirmation")
+    out.append("\n✓ Service Scheduler API provides:")
+    out.append("  - 3 service centers with availability")
+    out.append("  - Hourly appointment slots")
+    out.append("  - Booking and confirmation")
     
-    print("\nAvailable Service Centers:")
+    out.append("\nAvailable Service Centers:")
     centers = [
         {"id": "SC001", "name": "Downtown Service Center", "city": "New York"},
         {"id": "SC002", "name": "Westside Auto Care", "city": "Los Angeles"},
@@ -127,115 +187,114 @@ async def demo_complete_workflow():
     ]
     
     for center in centers:
-        print(f"  {center['id']}: {center['name']} ({center['city']})")
+        out.append(f"  {center['id']}: {center['name']} ({center['city']})")
     
     # Simulate finding available slots
-    print(f"\nAvailable Slots for Next Week:")
+    out.append(f"\nAvailable Slots for Next Week:")
     tomorrow = datetime.utcnow() + timedelta(days=1)
     for i in range(3):
         slot_date = tomorrow + timedelta(days=i)
-        print(f"  {slot_date.strftime('%Y-%m-%d')} 9:00 AM - Downtown Service Center")
-        print(f"  {slot_date.strftime('%Y-%m-%d')} 2:00 PM - Westside Auto Care")
+        out.append(f"  {slot_date.strftime('%Y-%m-%d')} 9:00 AM - Downtown Service Center")
+        out.append(f"  {slot_date.strftime('%Y-%m-%d')} 2:00 PM - Westside Auto Care")
     
-    # Step 5: Customer Interaction
-    print("\n" + "="*80)
-    print("STEP 5: CUSTOMER INTERACTION SIMULATION")
-    print("="*80)
+    _flush_lines(out)
     
-    # Create customer simulator
-    customer = CustomerInteractionSimulator(
-        customer_name=sample_vehicle['owner']['name'],
-        personality="cooperative"
-    )
-    
-    # Send notification about brake issue
-    notification_message = (
-        f"Hello {customer.customer_name}, our analysis shows your "
-        f"{sample_vehicle['year']} {sample_vehicle['model']}'s brake pads are at "
-        f"{scenario['current_condition_percent']}% remaining. We recommend scheduling "
-        f"service within {scenario['predicted_failure_days']} days to ensure your safety."
-    )
+    # Step 5: Customer Interaction
+    out.append("\n" + "="*80)
+    out.append("STEP 5: CUSTOMER INTERACTION SIMULATION")
+    out.append("="*80)
     
-    print(f"\nSending Notification:")
-    print(f"  To: {customer.customer_name}")
-    print(f"  Message: {notification_message}")
-    print(f"  Urgency: {scenario['severity']}")
+    # Notification about brake issue (sent in the background after step 1)
+    out.append(f"\nSending Notification:")
+    out.append(f"  To: {customer.customer_name}")
+    out.append(f"  Message: {notification_message}")
+    out.append(f"  Urgency: {scenario['severity']}")
     
-    response = customer.receive_notification(
-        notification_type="maintenance_alert",
-        message=notification_message,
-        urgency=scenario['severity'].lower()
-    )
+    _flush_lines(out)
+    response, conversation = await engagement_task
     
-    print(f"\nCustomer Response:")
+    out.append(f"\nCustomer Response:")
     if response["responded"]:
-        print(f"  Responded in: {response['response_time_minutes']} minutes")
-        print(f"  Decision: {response['response']['decision'].upper()}")
-        print(f"  Response: \"{response['response']['text']}\"")
-        print(f"  Sentiment: {response['response']['sentiment']}")
+        out.append(f"  Responded in: {response['response_time_minutes']} minutes")
+        out.append(f"  Decision: {response['response']['decision'].upper()}")
+        out.append(f"  Response: \"{response['response']['text']}\"")
+        out.append(f"  Sentiment: {response['response']['sentiment']}")
         
         if response['response']['decision'] == 'accepted':
-            print(f"  Preferred: {', '.join(response['response']['preferred_dates'])}")
-            print(f"  Time: {response['response']['preferred_time']}")
+            out.append(f"  Preferred: {', '.join(response['response']['preferred_dates'])}")
+            out.append(f"  Time: {response['response']['preferred_time']}")
     else:
-        print("  No response received")
+        out.append("  No response received")
     
     # Simulate chat conversation
-    print(f"\n{'-'*80}")
-    print("CHAT CONVERSATION SIMULATION")
-    print(f"{'-'*80}")
-    
-    conversation = customer.simulate_chat_conversation(
-        "Hello! We've detected that your brake pads need attention soon."
-    )
+    out.append(f"\n{'-'*80}")
+    out.append("CHAT CONVERSATION SIMULATION")
+    out.append(f"{'-'*80}")
     
     for msg in conversation:
         role = "AGENT" if msg["role"] == "agent" else "CUSTOMER"
-        print(f"\n{role}: {msg['message']}")
+        out.append(f"\n{role}: {msg['message']}")
+    
+    # Same notification as a fleet-wide campaign, built straight from the generator output
+    fleet = CustomerFleet.from_vehicle_owners(vehicles)
+    fleet.receive_notification_batch(urgency="normal")
+    fleet_summary = fleet.get_fleet_summary()
+    
+    out.append(f"\n{'-'*80}")
+    out.append("FLEET-WIDE MAINTENANCE CAMPAIGN")
+    out.append(f"{'-'*80}")
+    out.append(f"\n  Owners notified: {fleet_summary['customers']}")
+    out.append(f"  Response rate: {fleet_summary['response_rate']:.0%}")
+    out.append(f"  Acceptance rate: {fleet_summary['acceptance_rate']:.0%}")
+    out.append(f"  Avg response time: {fleet_summary['avg_response_time_minutes']:.0f} minutes")
+    
+    _flush_lines(out)
     
     # Step 6: Complete Workflow Summary
-    print("\n" + "="*80)
-    print("COMPLETE WORKFLOW SUMMARY")
-    print("="*80)
+    out.append("\n" + "="*80)
+    out.append("COMPLETE WORKFLOW SUMMARY")
+    out.append("="*80)
     
-    print("\n1. ✓ Vehicle Data Generated")
-    print("   - 10 vehicles with complete profiles")
-    print("   - Realistic failure scenarios")
+    out.append("\n1. ✓ Vehicle Data Generated")
+    out.append("   - 10 vehicles with complete profiles")
+    out.append("   - Realistic failure scenarios")
     
-    print("\n2. ✓ Telematics Streaming")
-    print("   - Real-time sensor data")
-    print("   - Failure indicators detected")
+    out.append("\n2. ✓ Telematics Streaming")
+    out.append("   - Real-time sensor data")
+    out.append("   - Failure indicators detected")
     
-    print("\n3. ✓ Maintenance Database")
-    print("   - Historical service records")
-    print("   - Parts and cost tracking")
+    out.append("\n3. ✓ Maintenance Database")
+    out.append("   - Historical service records")
+    out.append("   - Parts and cost tracking")
     
-    print("\n4. ✓ Predictive Analysis")
-    print(f"   - Identified: {scenario['component']} issue")
-    print(f"   - Severity: {scenario['severity']}")
-    print(f"   - Predicted failure: {scenario['predicted_failure_days']} days")
+    out.append("\n4. ✓ Predictive Analysis")
+    out.append(f"   - Identified: {scenario['component']} issue")
+    out.append(f"   - Severity: {scenario['severity']}")
+    out.append(f"   - Predicted failure: {scenario['predicted_failure_days']} days")
     
-    print("\n5. ✓ Customer Engagement")
-    print(f"   - Notification sent to {customer.customer_name}")
-    print(f"   - Customer {response['response']['decision']}")
+    out.append("\n5. ✓ Customer Engagement")
+    out.append(f"   - Notification sent to {customer.customer_name}")
+    out.append(f"   - Customer {response['response']['decision']}")
     
     if response['response']['decision'] == 'accepted':
-        print("\n6. ✓ Appointment Scheduling")
-        print("   - Available slots identified")
-        print("   - Booking confirmed")
-        print("   - Service center notified")
-    
-    print("\n" + "="*80)
-    print("DEMO COMPLETE")
-    print("="*80)
-    
-    print("\nTo start the APIs:")
-    print("  1. Telematics API:  python mock_infrastructure/telematics_api.py")
-    print("  2. Scheduler API:   python mock_infrastructure/service_scheduler_api.py")
-    
-    print("\nTo access the data:")
-    print("  - Vehicles: mock_infrastructure/synthetic_vehicles.json")
-    print("  - Database: mock_infrastructure/maintenance_records.db")
+        out.append("\n6. ✓ Appointment Scheduling")
+        out.append("   - Available slots identified")
+        out.append("   - Booking confirmed")
+        out.append("   - Service center notified")
+    
+    out.append("\n" + "="*80)
+    out.append("DEMO COMPLETE")
+    out.append("="*80)
+    
+    out.append("\nTo start the APIs:")
+    out.append("  1. Telematics API:  python mock_infrastructure/telematics_api.py")
+    out.append("  2. Scheduler API:   python mock_infrastructure/service_scheduler_api.py")
+    
+    out.append("\nTo access the data:")
+    out.append("  - Vehicles: mock_infrastructure/synthetic_vehicles.json")
+    out.append("  - Database: mock_infrastructure/maintenance_records.db")
+    
+    _flush_lines(out)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,261 @@ Maintenance Records Database
 SQLite database for storing and querying service logs
 """
 import sqlite3
+import itertools
 import json
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+
+# Rows fetched per round trip by the streaming read methods
+FETCH_BATCH_SIZE = 1000
+
+# Statement text shared by every call, so each one is parsed once per
+# connection and then served from sqlite3's statement cache
+# Highest service record id ever handed out (AUTOINCREMENT never reuses ids,
+# even after deletes, so new ids continue from here rather than from MAX(id))
+_SQL_LAST_SERVICE_RECORD_ID = '''
+    SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'service_records'), 0)
+'''
+
+# The import statements take the whole dataset file as one JSON text parameter
+# and let SQLite walk it with json_each, so no Python objects are built per row
+_SQL_IMPORT_VEHICLES = '''
+    INSERT OR REPLACE INTO vehicles
+    (vin, model, year, manufacturing_batch, current_mileage, owner_name, owner_email, owner_phone)
+    SELECT json_extract(v.value, '$.vin'),
+           json_extract(v.value, '$.model'),
+           json_extract(v.value, '$.year'),
+           json_extract(v.value, '$.manufacturing_batch'),
+           json_extract(v.value, '$.current_mileage'),
+           json_extract(v.value, '$.owner.name'),
+           json_extract(v.value, '$.owner.email'),
+           json_extract(v.value, '$.owner.phone')
+    FROM json_each(?) v
+'''
+
+# Service record ids are the last assigned id + the record's position in the
+# file (by vehicle, then history order); the child imports recompute the same ids
+_SQL_IMPORT_RECORDS_CTE = '''
+    WITH records AS (
+        SELECT ? + ROW_NUMBER() OVER (ORDER BY v.key, r.key) AS id,
+               json_extract(v.value, '$.vin') AS vin,
+               r.value AS record
+        FROM json_each(?) v, json_each(v.value, '$.maintenance_history') r
+    )
+'''
+
+_SQL_IMPORT_SERVICE_RECORDS = _SQL_IMPORT_RECORDS_CTE + '''
+    INSERT INTO service_records
+    (id, vin, service_date, mileage, service_type, service_center, technician, cost)
+    SELECT id,
+           vin,
+           json_extract(record, '$.date'),
+           json_extract(record, '$.mileage'),
+           json_extract(record, '$.service_type'),
+           json_extract(record, '$.service_center'),
+           json_extract(record, '$.technician'),
+           json_extract(record, '$.cost')
+    FROM records
+    ORDER BY id
+'''
+
+_SQL_IMPORT_SERVICES_PERFORMED = _SQL_IMPORT_RECORDS_CTE + '''
+    INSERT INTO services_performed (service_record_id, service_name)
+    SELECT records.id, s.value
+    FROM records, json_each(records.record, '$.services_performed') s
+    ORDER BY records.id, s.key
+'''
+
+_SQL_IMPORT_PARTS_REPLACED = _SQL_IMPORT_RECORDS_CTE + '''
+    INSERT INTO parts_replaced (service_record_id, part_name)
+    SELECT records.id, p.value
+    FROM records, json_each(records.record, '$.parts_replaced') p
+    ORDER BY records.id, p.key
+'''
+
+_SQL_GET_VEHICLE = 'SELECT * FROM vehicles WHERE vin = ?'
+
+_SQL_GET_ALL_VEHICLES = 'SELECT * FROM vehicles'
+
+_SQL_COUNT_VEHICLES = 'SELECT COUNT(*) FROM vehicles'
+
+_SQL_GET_SERVICE_RECORDS = '''
+    SELECT * FROM service_records
+    WHERE vin = ?
+    ORDER BY service_date DESC
+'''
+
+_SQL_GET_SERVICES_PERFORMED = '''
+    SELECT sp.service_record_id, sp.service_name
+    FROM services_performed sp
+    JOIN service_records sr ON sp.service_record_id = sr.id
+    WHERE sr.vin = ?
+    ORDER BY sp.id
+'''
+
+_SQL_GET_PARTS_REPLACED = '''
+    SELECT pr.service_record_id, pr.part_name, pr.part_number, pr.quantity, pr.cost
+    FROM parts_replaced pr
+    JOIN service_records sr ON pr.service_record_id = sr.id
+    WHERE sr.vin = ?
+    ORDER BY pr.id
+'''
+
+_SQL_INSERT_SERVICE_RECORD = '''
+    INSERT INTO service_records
+    (vin, service_date, mileage, service_type, service_center, technician, cost, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_SERVICE_RECORD_WITH_ID = '''
+    INSERT INTO service_records
+    (id, vin, service_date, mileage, service_type, service_center, technician, cost, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_SERVICES_PERFORMED = '''
+    INSERT INTO services_performed (service_record_id, service_name)
+    SELECT ?, value FROM json_each(?)
+'''
+
+_SQL_INSERT_PARTS_REPLACED = '''
+    INSERT INTO parts_replaced
+    (service_record_id, part_name, part_number, quantity, cost)
+    SELECT ?,
+           json_extract(value, '$.name'),
+           json_extract(value, '$.number'),
+           CASE WHEN json_type(value, '$.quantity') IS NULL THEN 1
+                ELSE json_extract(value, '$.quantity') END,
+           json_extract(value, '$.cost')
+    FROM json_each(?)
+'''
+
+_SQL_GET_RECENT_SERVICES = '''
+    SELECT sr.*, v.model, v.year, v.owner_name
+    FROM service_records sr
+    JOIN vehicles v ON sr.vin = v.vin
+    WHERE sr.service_date >= datetime('now', '-' || ? || ' days')
+    ORDER BY sr.service_date DESC
+'''
+
+_SQL_GET_VEHICLES_NEEDING_SERVICE = '''
+    WITH last_service AS MATERIALIZED (
+        SELECT v.*,
+               (SELECT MAX(sr.mileage) FROM service_records sr WHERE sr.vin = v.vin) AS last_service_mileage
+        FROM vehicles v
+    )
+    SELECT *, current_mileage - last_service_mileage AS miles_since_service
+    FROM last_service
+    WHERE miles_since_service >= ? OR miles_since_service IS NULL
+    ORDER BY vin
+'''
+
+
+def _open_connection(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a connection with the row factory and performance pragmas applied"""
+    conn = sqlite3.connect(db_path, cached_statements=256, check_same_thread=check_same_thread)
+    conn.row_factory = sqlite3.Row
+    
+    # WAL lets readers run alongside a writer and turns commits into log
+    # appends; journal_mode persists in the file, the rest are per connection
+    if db_path != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def _column_names(cursor: sqlite3.Cursor) -> List[str]:
+    """Result column names of the cursor's last query"""
+    return [column[0] for column in cursor.description]
+
+
+def _as_dicts(names: List[str], rows: Iterable[tuple]) -> Iterator[Dict[str, Any]]:
+    """
+    Tuple rows as dicts keyed by column name
+    
+    Zipping against one shared name list avoids sqlite3.Row, whose dict()
+    conversion has to look up the column names again for every row.
+    """
+    return map(dict, map(zip, itertools.repeat(names), rows))
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of configured SQLite connections
+    
+    For request handlers running on a thread pool (e.g. FastAPI sync
+    endpoints): each caller borrows a connection for the duration of a
+    with block, so no connection is used by two threads at once and the
+    connect + pragma setup is paid once per pooled connection.
+    
+    Usage:
+        pool = ConnectionPool("mock_infrastructure/maintenance_records.db")
+        with pool.acquire() as conn:
+            conn.execute(...)
+    """
+    
+    def __init__(self, db_path: str = "mock_infrastructure/maintenance_records.db", size: int = 4):
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        self._lock = threading.Lock()
+        self._opened = 0
+    
+    def warm(self) -> None:
+        """Open all connections up front (e.g. from a startup event)"""
+        with self._lock:
+            while self._opened < self.size:
+                self._idle.put_nowait(_open_connection(self.db_path, check_same_thread=False))
+                self._opened += 1
+    
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection, opening a new one while the pool is below size
+        
+        Raises:
+            queue.Empty: No connection became free within timeout
+        """
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._opened < self.size:
+                    self._opened += 1
+                    try:
+                        conn = _open_connection(self.db_path, check_same_thread=False)
+                    except Exception:
+                        self._opened -= 1
+                        raise
+            if conn is None:
+                conn = self._idle.get(timeout=timeout)
+        
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put_nowait(conn)
+    
+    def close(self) -> None:
+        """Close all idle connections; call once every borrowed connection is back"""
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._opened -= 1
 
 
 class MaintenanceDatabase:
@@ -18,9 +270,8 @@ class MaintenanceDatabase:
     
     def connect(self):
         """Connect to database"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
+        self.conn = _open_connection(self.db_path)
+        self.cursor = self._plain_cursor()
     
     def close(self):
         """Close database connection"""
@@ -87,111 +338,124 @@ class MaintenanceDatabase:
         ''')
         
         # Create indexes
-        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_vin ON service_records(vin)')
+        # (vin, service_date DESC) serves per-vehicle lookups in history order;
+        # it supersedes the old vin-only index
+        self.cursor.execute('DROP INDEX IF EXISTS idx_vin')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_sr_vin_date ON service_records(vin, service_date DESC)')
         self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_service_date ON service_records(service_date)')
+        # Answers the latest-mileage-per-vehicle lookup with one seek
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_sr_vin_mileage ON service_records(vin, mileage DESC)')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_sp_rid ON services_performed(service_record_id)')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_pr_rid ON parts_replaced(service_record_id)')
         
         self.conn.commit()
         print("Database schema initialized")
     
     def import_synthetic_data(self, vehicles_file: str = "mock_infrastructure/synthetic_vehicles.json"):
         """Import data from synthetic vehicles JSON"""
+        # Read as text only; SQLite parses it
         with open(vehicles_file, 'r') as f:
-            vehicles = json.load(f)
+            vehicles_json = f.read()
         
-        for vehicle in vehicles:
-            # Insert vehicle
-            self.cursor.execute('''
-                INSERT OR REPLACE INTO vehicles 
-                (vin, model, year, manufacturing_batch, current_mileage, owner_name, owner_email, owner_phone)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                vehicle["vin"],
-                vehicle["model"],
-                vehicle["year"],
-                vehicle["manufacturing_batch"],
-                vehicle["current_mileage"],
-                vehicle["owner"]["name"],
-                vehicle["owner"]["email"],
-                vehicle["owner"]["phone"]
-            ))
-            
-            # Insert maintenance history
-            for record in vehicle.get("maintenance_history", []):
-                self.cursor.execute('''
-                    INSERT INTO service_records 
-                    (vin, service_date, mileage, service_type, service_center, technician, cost)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    vehicle["vin"],
-                    record["date"],
-                    record["mileage"],
-                    record["service_type"],
-                    record["service_center"],
-                    record["technician"],
-                    record["cost"]
-                ))
-                
-                service_record_id = self.cursor.lastrowid
-                
-                # Insert services performed
-                for service in record.get("services_performed", []):
-                    self.cursor.execute('''
-                        INSERT INTO services_performed (service_record_id, service_name)
-                        VALUES (?, ?)
-                    ''', (service_record_id, service))
-                
-                # Insert parts replaced
-                for part in record.get("parts_replaced", []):
-                    self.cursor.execute('''
-                        INSERT INTO parts_replaced (service_record_id, part_name)
-                        VALUES (?, ?)
-                    ''', (service_record_id, part))
+        # One transaction for the whole import (committed on success, rolled back on error)
+        with self.conn:
+            # Service record ids continue from the last one assigned
+            first_id = self._reserve_service_record_ids()
+            self.cursor.execute(_SQL_IMPORT_VEHICLES, (vehicles_json,))
+            vehicle_count = self.cursor.rowcount
+            for sql in (_SQL_IMPORT_SERVICE_RECORDS, _SQL_IMPORT_SERVICES_PERFORMED, _SQL_IMPORT_PARTS_REPLACED):
+                self.cursor.execute(sql, (first_id, vehicles_json))
         
-        self.conn.commit()
-        print(f"Imported {len(vehicles)} vehicles with maintenance history")
+        # Refresh planner statistics so the new rows are costed against the indexes
+        self.cursor.execute('ANALYZE')
+        
+        print(f"Imported {vehicle_count} vehicles with maintenance history")
     
     def get_vehicle(self, vin: str) -> Optional[Dict[str, Any]]:
         """Get vehicle by VIN"""
-        self.cursor.execute('SELECT * FROM vehicles WHERE vin = ?', (vin,))
+        self.cursor.execute(_SQL_GET_VEHICLE, (vin,))
         row = self.cursor.fetchone()
-        return dict(row) if row else None
+        return dict(zip(_column_names(self.cursor), row)) if row else None
     
-    def get_all_vehicles(self) -> List[Dict[str, Any]]:
-        """Get all vehicles"""
-        self.cursor.execute('SELECT * FROM vehicles')
-        return [dict(row) for row in self.cursor.fetchall()]
+    def get_all_vehicles(self) -> Iterator[Dict[str, Any]]:
+        """Get all vehicles (streamed in batches of FETCH_BATCH_SIZE rows)"""
+        return self._stream(_SQL_GET_ALL_VEHICLES)
+    
+    def count_vehicles(self) -> int:
+        """Get the number of vehicles"""
+        self.cursor.execute(_SQL_COUNT_VEHICLES)
+        return self.cursor.fetchone()[0]
+    
+    def _plain_cursor(self) -> sqlite3.Cursor:
+        """Cursor returning plain tuples; read methods build their dicts with _as_dicts"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor
+    
+    def _stream(self, sql: str, params: tuple = ()) -> Iterator[Dict[str, Any]]:
+        """
+        Run a query and yield its rows as dicts, fetching a batch at a time
+        
+        Uses its own cursor, so the caller can run other queries on this
+        database while iterating.
+        """
+        cursor = self._plain_cursor()
+        cursor.arraysize = FETCH_BATCH_SIZE
+        try:
+            cursor.execute(sql, params)
+            names = _column_names(cursor)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from _as_dicts(names, rows)
+        finally:
+            cursor.close()
     
     def get_service_history(self, vin: str) -> List[Dict[str, Any]]:
         """Get service history for a vehicle"""
-        self.cursor.execute('''
-            SELECT * FROM service_records 
-            WHERE vin = ? 
-            ORDER BY service_date DESC
-        ''', (vin,))
+        self.cursor.execute(_SQL_GET_SERVICE_RECORDS, (vin,))
         
         records = []
-        for row in self.cursor.fetchall():
-            record = dict(row)
-            
-            # Get services performed
-            self.cursor.execute('''
-                SELECT service_name FROM services_performed 
-                WHERE service_record_id = ?
-            ''', (record['id'],))
-            record['services_performed'] = [r['service_name'] for r in self.cursor.fetchall()]
-            
-            # Get parts replaced
-            self.cursor.execute('''
-                SELECT part_name, part_number, quantity, cost 
-                FROM parts_replaced 
-                WHERE service_record_id = ?
-            ''', (record['id'],))
-            record['parts_replaced'] = [dict(r) for r in self.cursor.fetchall()]
-            
+        records_by_id = {}
+        for record in _as_dicts(_column_names(self.cursor), self.cursor.fetchall()):
+            record['services_performed'] = []
+            record['parts_replaced'] = []
             records.append(record)
+            records_by_id[record['id']] = record
+        
+        if not records:
+            return records
+        
+        # Child rows for all of the vehicle's records in one query per table
+        self.cursor.execute(_SQL_GET_SERVICES_PERFORMED, (vin,))
+        for service_record_id, service_name in self.cursor.fetchall():
+            records_by_id[service_record_id]['services_performed'].append(service_name)
+        
+        self.cursor.execute(_SQL_GET_PARTS_REPLACED, (vin,))
+        for service_record_id, part_name, part_number, quantity, cost in self.cursor.fetchall():
+            records_by_id[service_record_id]['parts_replaced'].append({
+                'part_name': part_name,
+                'part_number': part_number,
+                'quantity': quantity,
+                'cost': cost
+            })
         
         return records
     
+    def _reserve_service_record_ids(self) -> int:
+        """
+        Take the write lock and return the last assigned service record id
+        
+        Starts the transaction with BEGIN IMMEDIATE (unless one is already
+        open), so no other connection can insert between reading the id and
+        inserting rows with ids after it.
+        """
+        if not self.conn.in_transaction:
+            self.cursor.execute('BEGIN IMMEDIATE')
+        self.cursor.execute(_SQL_LAST_SERVICE_RECORD_ID)
+        return self.cursor.fetchone()[0]
+    
     def add_service_record(
         self,
         vin: str,
@@ -203,66 +467,74 @@ class MaintenanceDatabase:
         service_center: str = None,
         technician: str = None,
         cost: float = None,
-        notes: str = None
+        notes: str = None,
+        auto_commit: bool = True
     ) -> int:
-        """Add a new service record"""
-        self.cursor.execute('''
-            INSERT INTO service_records 
+        """
+        Add a new service record
+        
+        Each call commits (one disk sync per record) unless auto_commit is
+        False; callers adding many records should use add_service_records.
+        """
+        self.cursor.execute(
+            _SQL_INSERT_SERVICE_RECORD,
             (vin, service_date, mileage, service_type, service_center, technician, cost, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (vin, service_date, mileage, service_type, service_center, technician, cost, notes))
+        )
         
         service_record_id = self.cursor.lastrowid
         
-        # Add services performed
-        for service in services_performed:
-            self.cursor.execute('''
-                INSERT INTO services_performed (service_record_id, service_name)
-                VALUES (?, ?)
-            ''', (service_record_id, service))
-        
-        # Add parts replaced
-        for part in parts_replaced:
-            self.cursor.execute('''
-                INSERT INTO parts_replaced 
-                (service_record_id, part_name, part_number, quantity, cost)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                service_record_id,
-                part.get('name'),
-                part.get('number'),
-                part.get('quantity', 1),
-                part.get('cost')
-            ))
+        # Add services performed and parts replaced, one statement per table
+        # however long the lists are (SQLite expands the JSON array itself)
+        self.cursor.execute(_SQL_INSERT_SERVICES_PERFORMED, (service_record_id, json.dumps(services_performed)))
+        self.cursor.execute(_SQL_INSERT_PARTS_REPLACED, (service_record_id, json.dumps(parts_replaced)))
         
-        self.conn.commit()
+        if auto_commit:
+            self.conn.commit()
         return service_record_id
     
-    def get_recent_services(self, days: int = 30) -> List[Dict[str, Any]]:
-        """Get recent service records"""
-        self.cursor.execute('''
-            SELECT sr.*, v.model, v.year, v.owner_name
-            FROM service_records sr
-            JOIN vehicles v ON sr.vin = v.vin
-            WHERE sr.service_date >= datetime('now', '-' || ? || ' days')
-            ORDER BY sr.service_date DESC
-        ''', (days,))
+    def add_service_records(self, records: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Add many service records in a single transaction
+        
+        Args:
+            records: Dicts with the same keys as add_service_record's
+                arguments (service_center, technician, cost and notes optional)
+            
+        Returns:
+            Ids of the new records, in input order
+        """
+        records = list(records)
+        if not records:
+            return []
         
-        return [dict(row) for row in self.cursor.fetchall()]
+        with self.conn:
+            # Assign ids up front (as the import does) so executemany can be used
+            first_id = self._reserve_service_record_ids() + 1
+            ids = list(range(first_id, first_id + len(records)))
+            
+            self.cursor.executemany(_SQL_INSERT_SERVICE_RECORD_WITH_ID, [
+                (record_id, r['vin'], r['service_date'], r['mileage'], r['service_type'],
+                 r.get('service_center'), r.get('technician'), r.get('cost'), r.get('notes'))
+                for record_id, r in zip(ids, records)
+            ])
+            self.cursor.executemany(_SQL_INSERT_SERVICES_PERFORMED, [
+                (record_id, json.dumps(r['services_performed'])) for record_id, r in zip(ids, records)
+            ])
+            self.cursor.executemany(_SQL_INSERT_PARTS_REPLACED, [
+                (record_id, json.dumps(r['parts_replaced'])) for record_id, r in zip(ids, records)
+            ])
+        
+        return ids
+    
+    def get_recent_services(self, days: int = 30) -> Iterator[Dict[str, Any]]:
+        """Get recent service records (streamed in batches of FETCH_BATCH_SIZE rows)"""
+        return self._stream(_SQL_GET_RECENT_SERVICES, (days,))
     
     def get_vehicles_needing_service(self, mileage_threshold: int = 5000) -> List[Dict[str, Any]]:
         """Get vehicles that may need service soon"""
-        self.cursor.execute('''
-            SELECT v.*, 
-                   MAX(sr.mileage) as last_service_mileage,
-                   v.current_mileage - MAX(sr.mileage) as miles_since_service
-            FROM vehicles v
-            LEFT JOIN service_records sr ON v.vin = sr.vin
-            GROUP BY v.vin
-            HAVING miles_since_service >= ? OR miles_since_service IS NULL
-        ''', (mileage_threshold,))
+        self.cursor.execute(_SQL_GET_VEHICLES_NEEDING_SERVICE, (mileage_threshold,))
         
-        return [dict(row) for row in self.cursor.fetchall()]
+        return list(_as_dicts(_column_names(self.cursor), self.cursor.fetchall()))
 
 
 def initialize_database():
@@ -276,11 +548,10 @@ def initialize_database():
     db.import_synthetic_data()
     
     # Show summary
-    vehicles = db.get_all_vehicles()
     print(f"\nDatabase Summary:")
-    print(f"  Total Vehicles: {len(vehicles)}")
+    print(f"  Total Vehicles: {db.count_vehicles()}")
     
-    for vehicle in vehicles[:3]:
+    for vehicle in itertools.islice(db.get_all_vehicles(), 3):
         history = db.get_service_history(vehicle['vin'])
         print(f"\n  {vehicle['vin']} ({vehicle['year']} {vehicle['model']})")
         print(f"    Owner: {vehicle['owner_name']}")
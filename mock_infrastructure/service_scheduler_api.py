@@ -4,13 +4,35 @@ Mock endpoint that returns available appointment slots based on date/location
 """
 from fastapi import FastAPI, Query
 from fastapi.responses import JSONResponse
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+import os
 import random
+import sqlite3
+import uuid
 import uvicorn
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-app = FastAPI(title="Service Scheduler API", version="1.0.0")
+
+if ORJSON_AVAILABLE:
+    class ORJSONResponse(JSONResponse):
+        """JSON response encoded with orjson (several times faster than stdlib json)"""
+        
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content)
+
+
+app = FastAPI(
+    title="Service Scheduler API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+)
 
 
 # Service centers
@@ -42,8 +64,116 @@ SERVICE_CENTERS = [
 ]
 
 
-# Existing appointments (simulated)
-appointments = {}
+# Lookup tables built once from SERVICE_CENTERS
+CENTERS_BY_ID: Dict[str, Dict[str, Any]] = {c["id"]: c for c in SERVICE_CENTERS}
+
+# Addresses are "street, city, state zip"; keyed by casefolded city
+CENTERS_BY_CITY: Dict[str, List[Dict[str, Any]]] = {}
+for _center in SERVICE_CENTERS:
+    CENTERS_BY_CITY.setdefault(_center["address"].split(", ")[-2].casefold(), []).append(_center)
+del _center
+
+# Casefolded addresses for queries that are not an exact city name
+_CENTER_ADDRESSES = [(c["address"].casefold(), c) for c in SERVICE_CENTERS]
+
+
+def find_centers_by_city(city: str) -> List[Dict[str, Any]]:
+    """Centers in a city: exact city-name lookup, else address substring match"""
+    city_key = city.casefold()
+    centers = CENTERS_BY_CITY.get(city_key)
+    if centers is not None:
+        return centers
+    return [c for address, c in _CENTER_ADDRESSES if city_key in address]
+
+
+# Booking counts live in SQLite so that concurrent requests and multiple
+# uvicorn workers all see (and atomically update) the same counts. The file
+# sits next to this module and persists across restarts; delete it to start
+# with every slot free again.
+BOOKINGS_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scheduler_bookings.db")
+
+
+class BookingStore:
+    """Booked-appointment count per slot key (f"{center_id}_{slot time}")"""
+    
+    def __init__(self, db_path: str = BOOKINGS_DB_PATH):
+        # Autocommit: every statement below is a complete, atomic operation
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        if db_path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS bookings (
+                slot_key TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            )
+        ''')
+    
+    def counts_between(self, first_key: str, last_key: str) -> Dict[str, int]:
+        """Booking counts for all booked slot keys in [first_key, last_key]"""
+        return dict(self.conn.execute(
+            'SELECT slot_key, count FROM bookings WHERE slot_key BETWEEN ? AND ?',
+            (first_key, last_key)
+        ).fetchall())
+    
+    def try_book(self, slot_key: str, capacity: int) -> Optional[int]:
+        """
+        Take one place in a slot if it has room
+        
+        The capacity check and increment are a single upsert, so two
+        concurrent bookings can never both take the last place.
+        
+        Returns:
+            New booking count, or None if the slot was already full
+        """
+        row = self.conn.execute('''
+            INSERT INTO bookings (slot_key, count) VALUES (?, 1)
+            ON CONFLICT(slot_key) DO UPDATE SET count = count + 1 WHERE count < ?
+            RETURNING count
+        ''', (slot_key, capacity)).fetchone()
+        return row[0] if row else None
+
+
+_bookings: Optional[BookingStore] = None
+
+
+def get_booking_store() -> BookingStore:
+    """Shared BookingStore, opened on first use rather than at import"""
+    global _bookings
+    if _bookings is None:
+        _bookings = BookingStore()
+    return _bookings
+
+
+def new_appointment_id() -> str:
+    """Unique appointment id (random 48 bits, safe across uvicorn workers)"""
+    return f"APT-{uuid.uuid4().hex[:12].upper()}"
+
+
+@lru_cache(maxsize=256)
+def _slot_grid(center_id: str, first_day: date, num_days: int) -> Tuple[Tuple[str, str], ...]:
+    """
+    (booking key, ISO datetime) for every hourly slot a center offers in a date range
+    
+    The grid only depends on the center and the days, so it is built once per
+    range and shared by every availability request for it.
+    """
+    grid = []
+    for offset in range(num_days):
+        day = first_day + timedelta(days=offset)
+        
+        # Skip weekends for some centers
+        if day.weekday() >= 5 and center_id == "SC003":
+            continue
+        
+        # Generate hourly slots
+        day_iso = day.isoformat()
+        for hour in range(8, 17):  # 8 AM to 5 PM
+            slot_time = f"{day_iso}T{hour:02d}:00:00"
+            grid.append((f"{center_id}_{slot_time}", slot_time))
+    
+    return tuple(grid)
 
 
 def generate_available_slots(
@@ -52,39 +182,35 @@ def generate_available_slots(
     end_date: datetime
 ) -> List[Dict[str, Any]]:
     """Generate available appointment slots"""
-    center = next((c for c in SERVICE_CENTERS if c["id"] == center_id), None)
+    center = CENTERS_BY_ID.get(center_id)
     if not center:
         return []
     
-    slots = []
-    current_date = start_date
+    # Same days as stepping from start_date one day at a time while <= end_date
+    num_days = (end_date - start_date) // timedelta(days=1) + 1 if end_date >= start_date else 0
     
-    while current_date <= end_date:
-        # Skip weekends for some centers
-        if current_date.weekday() >= 5 and center_id == "SC003":
-            current_date += timedelta(days=1)
-            continue
-        
-        # Generate hourly slots
-        for hour in range(8, 17):  # 8 AM to 5 PM
-            slot_time = current_date.replace(hour=hour, minute=0, second=0)
-            
-            # Check if slot is already booked
-            slot_key = f"{center_id}_{slot_time.isoformat()}"
-            booked_count = appointments.get(slot_key, 0)
-            
-            available = center["capacity_per_hour"] - booked_count
-            
-            if available > 0:
-                slots.append({
-                    "center_id": center_id,
-                    "center_name": center["name"],
-                    "datetime": slot_time.isoformat(),
-                    "available_slots": available,
-                    "duration_minutes": 60
-                })
+    grid = _slot_grid(center_id, start_date.date(), num_days)
+    if not grid:
+        return []
+    
+    # Grid keys are in ascending order, so one range query gets every count
+    booked = get_booking_store().counts_between(grid[0][0], grid[-1][0])
+    
+    center_name = center["name"]
+    capacity = center["capacity_per_hour"]
+    slots = []
+    for slot_key, slot_time in grid:
+        # Only the booking counts change between calls
+        available = capacity - booked.get(slot_key, 0)
         
-        current_date += timedelta(days=1)
+        if available > 0:
+            slots.append({
+                "center_id": center_id,
+                "center_name": center_name,
+                "datetime": slot_time,
+                "available_slots": available,
+                "duration_minutes": 60
+            })
     
     return slots
 
@@ -111,7 +237,7 @@ async def get_service_centers(city: Optional[str] = None):
     centers = SERVICE_CENTERS
     
     if city:
-        centers = [c for c in centers if city.lower() in c["address"].lower()]
+        centers = find_centers_by_city(city)
     
     return {
         "count": len(centers),
@@ -142,9 +268,9 @@ async def get_availability(
     # Get centers to check
     centers_to_check = SERVICE_CENTERS
     if center_id:
-        centers_to_check = [c for c in SERVICE_CENTERS if c["id"] == center_id]
+        centers_to_check = [CENTERS_BY_ID[center_id]] if center_id in CENTERS_BY_ID else []
     elif city:
-        centers_to_check = [c for c in SERVICE_CENTERS if city.lower() in c["address"].lower()]
+        centers_to_check = find_centers_by_city(city)
     
     # Generate slots for each center
     all_slots = []
@@ -179,7 +305,7 @@ async def book_appointment(booking: Dict[str, Any]):
     
     # Check if slot is available
     slot_key = f"{center_id}_{slot_time}"
-    center = next((c for c in SERVICE_CENTERS if c["id"] == center_id), None)
+    center = CENTERS_BY_ID.get(center_id)
     
     if not center:
         return JSONResponse(
@@ -187,18 +313,14 @@ async def book_appointment(booking: Dict[str, Any]):
             content={"error": "Service center not found"}
         )
     
-    booked_count = appointments.get(slot_key, 0)
-    
-    if booked_count >= center["capacity_per_hour"]:
+    # Book the appointment (checks capacity and books in one atomic step)
+    if get_booking_store().try_book(slot_key, center["capacity_per_hour"]) is None:
         return JSONResponse(
             status_code=409,
             content={"error": "Slot is fully booked"}
         )
     
-    # Book the appointment
-    appointments[slot_key] = booked_count + 1
-    
-    appointment_id = f"APT-{random.randint(100000, 999999)}"
+    appointment_id = new_appointment_id()
     
     appointment_data = {
         "appointment_id": appointment_id,
@@ -223,7 +345,7 @@ async def get_appointments(vin: str):
         "vin": vin,
         "appointments": [
             {
-                "appointment_id": f"APT-{random.randint(100000, 999999)}",
+                "appointment_id": new_appointment_id(),
                 "center_name": random.choice(SERVICE_CENTERS)["name"],
                 "datetime": (datetime.utcnow() + timedelta(days=random.randint(1, 14))).isoformat(),
                 "service_type": random.choice(["Oil Change", "Brake Inspection", "General Maintenance"]),
@@ -2,15 +2,37 @@
 Synthetic Vehicle Dataset Generator
 Creates realistic vehicle data with telematics, maintenance history, and failure scenarios
 """
-import random
 import json
+import multiprocessing
+import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import math
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Fleets smaller than this are generated in-process; below it, starting
+# worker processes and pickling results back costs more than it saves
+PARALLEL_MIN_VEHICLES = 20000
+
+# Vehicles per independently seeded chunk. Fixed (not derived from the
+# process count) so a seed gives the same fleet however it is generated
+GENERATION_CHUNK_SIZE = 2000
+
 
 class SyntheticVehicleGenerator:
-    """Generate synthetic vehicle data with realistic patterns"""
+    """
+    Generate synthetic vehicle data with realistic patterns
+    
+    Random fields are drawn for a whole batch of vehicles at once from a
+    NumPy generator; the per-vehicle methods are batches of one.
+    """
     
     MODELS = [
         {"name": "Sedan Pro", "year_range": (2020, 2024), "base_mileage": 15000},
@@ -25,148 +47,272 @@ class SyntheticVehicleGenerator:
     
     CITIES = ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio", "San Diego", "Dallas", "San Jose"]
     
-    def __init__(self, num_vehicles: int = 10):
+    PLATE_PREFIXES = ["ABC", "XYZ", "DEF"]
+    INSURANCE_PROVIDERS = ["StateFarm", "Geico", "Progressive", "Allstate"]
+    
+    # Per-model columns for array sampling
+    _MODEL_FIRST_YEARS = np.array([m["year_range"][0] for m in MODELS])
+    _MODEL_LAST_YEARS = np.array([m["year_range"][1] for m in MODELS])
+    _MODEL_BASE_MILEAGES = np.array([m["base_mileage"] for m in MODELS])
+    
+    # Mileages at which scheduled maintenance is performed
+    SERVICE_INTERVALS = [5000, 10000, 15000, 20000, 25000, 30000, 40000, 50000, 60000, 75000]
+    
+    def __init__(self, num_vehicles: int = 10, seed: Optional[int] = None):
         self.num_vehicles = num_vehicles
         self.vehicles = []
         self.current_time = datetime.utcnow()
+        self._rng = np.random.default_rng(seed)
+    
+    # VINs are this prefix followed by the zero-padded vehicle index
+    VIN_PREFIX = "1HGBH41JXMN"
     
     def generate_vin(self, index: int) -> str:
         """Generate realistic VIN"""
-        return f"1HGBH41JXMN{index:06d}"
+        return f"{self.VIN_PREFIX}{index:06d}"
     
     def generate_vehicle(self, index: int) -> Dict[str, Any]:
         """Generate a single vehicle with complete data"""
-        model_info = random.choice(self.MODELS)
-        year = random.randint(*model_info["year_range"])
+        return self._generate_vehicles(index, 1)[0]
+    
+    def _generate_vehicles(self, first_index: int, count: int) -> List[Dict[str, Any]]:
+        """Generate vehicles first_index .. first_index + count - 1 (without history, telematics or scenario)"""
+        rng = self._rng
+        integers = rng.integers
+        
+        model_idx = integers(0, len(self.MODELS), count)
+        years = integers(self._MODEL_FIRST_YEARS[model_idx], self._MODEL_LAST_YEARS[model_idx] + 1)
         
         # Calculate age-based mileage
-        vehicle_age = self.current_time.year - year
-        base_mileage = model_info["base_mileage"] * vehicle_age
-        mileage_variance = random.randint(-5000, 10000)
-        current_mileage = max(0, base_mileage + mileage_variance)
+        vehicle_ages = self.current_time.year - years
+        base_mileages = self._MODEL_BASE_MILEAGES[model_idx] * vehicle_ages
+        mileages = np.maximum(0, base_mileages + integers(-5000, 10001, count))
         
-        # Generate owner info
-        owner = {
-            "name": f"{random.choice(self.FIRST_NAMES)} {random.choice(self.LAST_NAMES)}",
-            "email": f"owner{index}@example.com",
-            "phone": f"+1-555-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
-            "address": {
-                "street": f"{random.randint(100, 9999)} Main St",
-                "city": random.choice(self.CITIES),
-                "state": "CA",
-                "zip": f"{random.randint(10000, 99999)}"
-            }
-        }
+        # Convert every column to Python ints once; indexing arrays per field is slow
+        # and would leak NumPy scalars into the vehicle dicts
+        model_idx = model_idx.tolist()
+        years = years.tolist()
+        mileages = mileages.tolist()
+        first_names = integers(0, len(self.FIRST_NAMES), count).tolist()
+        last_names = integers(0, len(self.LAST_NAMES), count).tolist()
+        phone_prefixes = integers(100, 1000, count).tolist()
+        phone_lines = integers(1000, 10000, count).tolist()
+        streets = integers(100, 10000, count).tolist()
+        cities = integers(0, len(self.CITIES), count).tolist()
+        zips = integers(10000, 100000, count).tolist()
+        # Month/day pairs: manufacturing, batch (month only), registration, insurance
+        months = integers(1, 13, (count, 4)).tolist()
+        days = integers(1, 29, (count, 3)).tolist()
+        plate_prefixes = integers(0, len(self.PLATE_PREFIXES), count).tolist()
+        plate_numbers = integers(1000, 10000, count).tolist()
+        providers = integers(0, len(self.INSURANCE_PROVIDERS), count).tolist()
+        policy_numbers = integers(100000, 1000000, count).tolist()
         
-        vehicle = {
-            "vin": self.generate_vin(index),
-            "model": model_info["name"],
-            "year": year,
-            "manufacturing_date": f"{year}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
-            "manufacturing_batch": f"BATCH-{year}-{random.randint(1, 12):02d}",
-            "current_mileage": current_mileage,
-            "owner": owner,
-            "registration": {
-                "plate": f"{random.choice(['ABC', 'XYZ', 'DEF'])}{random.randint(1000, 9999)}",
-                "state": "CA",
-                "expiry": f"{self.current_time.year + 1}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
-            },
-            "insurance": {
-                "provider": random.choice(["StateFarm", "Geico", "Progressive", "Allstate"]),
-                "policy_number": f"POL-{random.randint(100000, 999999)}",
-                "expiry": f"{self.current_time.year + 1}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
+        prefix = self.VIN_PREFIX
+        vins = [f"{prefix}{index:06d}" for index in range(first_index, first_index + count)]
+        
+        next_year = self.current_time.year + 1
+        vehicles = []
+        for i in range(count):
+            index = first_index + i
+            year = years[i]
+            month = months[i]
+            day = days[i]
+            
+            # Generate owner info
+            owner = {
+                "name": f"{self.FIRST_NAMES[first_names[i]]} {self.LAST_NAMES[last_names[i]]}",
+                "email": f"owner{index}@example.com",
+                "phone": f"+1-555-{phone_prefixes[i]}-{phone_lines[i]}",
+                "address": {
+                    "street": f"{streets[i]} Main St",
+                    "city": self.CITIES[cities[i]],
+                    "state": "CA",
+                    "zip": f"{zips[i]}"
+                }
             }
-        }
+            
+            vehicles.append({
+                "vin": vins[i],
+                "model": self.MODELS[model_idx[i]]["name"],
+                "year": year,
+                "manufacturing_date": f"{year}-{month[0]:02d}-{day[0]:02d}",
+                "manufacturing_batch": f"BATCH-{year}-{month[1]:02d}",
+                "current_mileage": mileages[i],
+                "owner": owner,
+                "registration": {
+                    "plate": f"{self.PLATE_PREFIXES[plate_prefixes[i]]}{plate_numbers[i]}",
+                    "state": "CA",
+                    "expiry": f"{next_year}-{month[2]:02d}-{day[1]:02d}"
+                },
+                "insurance": {
+                    "provider": self.INSURANCE_PROVIDERS[providers[i]],
+                    "policy_number": f"POL-{policy_numbers[i]}",
+                    "expiry": f"{next_year}-{month[3]:02d}-{day[2]:02d}"
+                }
+            })
         
-        return vehicle
+        return vehicles
     
     def generate_maintenance_history(self, vehicle: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate maintenance history for a vehicle"""
-        history = []
-        mileage = vehicle["current_mileage"]
+        return self._generate_maintenance_histories([vehicle])[0]
+    
+    def _generate_maintenance_histories(self, vehicles: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Generate maintenance histories for a batch of vehicles"""
+        rng = self._rng
+        integers = rng.integers
+        count = len(vehicles)
+        shape = (count, len(self.SERVICE_INTERVALS))
+        
+        # One draw per (vehicle, interval), used only where the interval is below the mileage
+        days_ago = integers(30, 366, shape)
+        costs = integers(100, 501, shape).tolist()
+        centers = integers(1, 6, shape).tolist()
+        technicians = integers(100, 1000, shape).tolist()
+        brake_pads = (rng.random(shape) < 0.3).tolist()
         
-        # Generate service records based on mileage
-        service_intervals = [5000, 10000, 15000, 20000, 25000, 30000, 40000, 50000, 60000, 75000]
+        # At most 336 distinct service dates per batch; format each once
+        service_dates = {
+            days: (self.current_time - timedelta(days=days)).isoformat()
+            for days in np.unique(days_ago).tolist()
+        }
+        days_ago = days_ago.tolist()
+        
+        services_by_interval = [self._services_for_interval(interval) for interval in self.SERVICE_INTERVALS]
         
-        for interval in service_intervals:
-            if mileage > interval:
-                service_date = self.current_time - timedelta(days=random.randint(30, 365))
-                
-                services = []
-                if interval % 10000 == 0:
-                    services.extend(["Oil Change", "Filter Replacement", "Fluid Check"])
-                if interval % 20000 == 0:
-                    services.extend(["Tire Rotation", "Brake Inspection"])
-                if interval % 30000 == 0:
-                    services.extend(["Transmission Service", "Coolant Flush"])
-                
-                history.append({
-                    "date": service_date.isoformat(),
-                    "mileage": interval,
-                    "service_type": "Scheduled Maintenance",
-                    "services_performed": services,
-                    "parts_replaced": self._get_parts_for_services(services),
-                    "cost": random.randint(100, 500),
-                    "service_center": f"Service Center {random.randint(1, 5)}",
-                    "technician": f"Tech-{random.randint(100, 999)}"
-                })
+        histories = []
+        for i, vehicle in enumerate(vehicles):
+            history = []
+            mileage = vehicle["current_mileage"]
+            
+            # Generate service records based on mileage
+            for j, interval in enumerate(self.SERVICE_INTERVALS):
+                if mileage > interval:
+                    services = services_by_interval[j]
+                    history.append({
+                        "date": service_dates[days_ago[i][j]],
+                        "mileage": interval,
+                        "service_type": "Scheduled Maintenance",
+                        "services_performed": list(services),
+                        "parts_replaced": self._get_parts_for_services(services, brake_pads[i][j]),
+                        "cost": costs[i][j],
+                        "service_center": f"Service Center {centers[i][j]}",
+                        "technician": f"Tech-{technicians[i][j]}"
+                    })
+            
+            histories.append(sorted(history, key=lambda x: x["date"]))
         
-        return sorted(history, key=lambda x: x["date"])
+        return histories
+    
+    @staticmethod
+    def _services_for_interval(interval: int) -> List[str]:
+        """Services performed at a service interval"""
+        services = []
+        if interval % 10000 == 0:
+            services.extend(["Oil Change", "Filter Replacement", "Fluid Check"])
+        if interval % 20000 == 0:
+            services.extend(["Tire Rotation", "Brake Inspection"])
+        if interval % 30000 == 0:
+            services.extend(["Transmission Service", "Coolant Flush"])
+        return services
     
-    def _get_parts_for_services(self, services: List[str]) -> List[str]:
-        """Get parts replaced for services"""
+    def _get_parts_for_services(self, services: List[str], replace_brake_pads: bool) -> List[str]:
+        """Get parts replaced for services (brake pads only if the inspection found them worn)"""
         parts = []
         if "Oil Change" in services:
             parts.extend(["Oil Filter", "Engine Oil"])
         if "Filter Replacement" in services:
             parts.extend(["Air Filter", "Cabin Filter"])
-        if "Brake Inspection" in services and random.random() < 0.3:
+        if "Brake Inspection" in services and replace_brake_pads:
             parts.extend(["Brake Pads"])
         return parts
     
-    def generate_all_vehicles(self) -> List[Dict[str, Any]]:
-        """Generate all vehicles with complete data"""
-        vehicles = []
+    def generate_all_vehicles(self, processes: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Generate all vehicles with complete data
         
-        for i in range(self.num_vehicles):
-            vehicle = self.generate_vehicle(i)
-            vehicle["maintenance_history"] = self.generate_maintenance_history(vehicle)
-            vehicle["telematics"] = self.initialize_telematics(vehicle)
-            vehicle["failure_scenario"] = self.generate_failure_scenario(vehicle, i)
-            
-            vehicles.append(vehicle)
+        The fleet is split into chunks of GENERATION_CHUNK_SIZE vehicles,
+        each with its own independent random stream spawned from this
+        generator's seed, so the same seed gives the same fleet whatever the
+        process count. Fleets of PARALLEL_MIN_VEHICLES or more generate their
+        chunks in worker processes.
+        
+        Args:
+            processes: Worker processes (os.cpu_count() if None; 1 disables workers)
+        """
+        processes = processes or os.cpu_count() or 1
+        chunks = [
+            (first_index, min(GENERATION_CHUNK_SIZE, self.num_vehicles - first_index))
+            for first_index in range(0, self.num_vehicles, GENERATION_CHUNK_SIZE)
+        ]
+        seeds = self._rng.bit_generator.seed_seq.spawn(len(chunks))
+        tasks = [
+            (first_index, count, self.current_time, seed)
+            for (first_index, count), seed in zip(chunks, seeds)
+        ]
+        if processes == 1 or len(tasks) == 1 or self.num_vehicles < PARALLEL_MIN_VEHICLES:
+            parts = map(_generate_chunk, tasks)
+        else:
+            with multiprocessing.Pool(min(processes, len(tasks))) as pool:
+                parts = pool.map(_generate_chunk, tasks)
+        vehicles = [vehicle for part in parts for vehicle in part]
         
         self.vehicles = vehicles
         return vehicles
     
+    def _generate_complete_vehicles(self, first_index: int, count: int) -> List[Dict[str, Any]]:
+        """Generate a batch of vehicles with history, telematics and failure scenario"""
+        vehicles = self._generate_vehicles(first_index, count)
+        histories = self._generate_maintenance_histories(vehicles)
+        telematics = self._initialize_telematics_batch(vehicles)
+        
+        for i, vehicle in enumerate(vehicles):
+            vehicle["maintenance_history"] = histories[i]
+            vehicle["telematics"] = telematics[i]
+            vehicle["failure_scenario"] = self.generate_failure_scenario(vehicle, first_index + i)
+        
+        return vehicles
+    
     def initialize_telematics(self, vehicle: Dict[str, Any]) -> Dict[str, Any]:
         """Initialize telematics baseline for a vehicle"""
-        return {
-            "engine_temperature": 195.0,  # Normal operating temp
-            "oil_pressure": 40.0,  # PSI
-            "battery_voltage": 12.6,  # Volts
-            "coolant_temperature": 190.0,
-            "rpm": 0,
-            "speed": 0,
-            "fuel_level": random.randint(20, 100),
-            "tire_pressure": {
-                "front_left": 32.0,
-                "front_right": 32.0,
-                "rear_left": 32.0,
-                "rear_right": 32.0
-            },
-            "brake_pad_thickness": {
-                "front_left": random.uniform(8.0, 12.0),
-                "front_right": random.uniform(8.0, 12.0),
-                "rear_left": random.uniform(8.0, 12.0),
-                "rear_right": random.uniform(8.0, 12.0)
-            },
-            "odometer": vehicle["current_mileage"],
-            "last_update": self.current_time.isoformat()
-        }
+        return self._initialize_telematics_batch([vehicle])[0]
+    
+    def _initialize_telematics_batch(self, vehicles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Initialize telematics baselines for a batch of vehicles"""
+        count = len(vehicles)
+        fuel_levels = self._rng.integers(20, 101, count).tolist()
+        brake_pads = self._rng.uniform(8.0, 12.0, (count, 4)).tolist()
+        last_update = self.current_time.isoformat()
+        
+        return [
+            {
+                "engine_temperature": 195.0,  # Normal operating temp
+                "oil_pressure": 40.0,  # PSI
+                "battery_voltage": 12.6,  # Volts
+                "coolant_temperature": 190.0,
+                "rpm": 0,
+                "speed": 0,
+                "fuel_level": fuel_levels[i],
+                "tire_pressure": {
+                    "front_left": 32.0,
+                    "front_right": 32.0,
+                    "rear_left": 32.0,
+                    "rear_right": 32.0
+                },
+                "brake_pad_thickness": {
+                    "front_left": brake_pads[i][0],
+                    "front_right": brake_pads[i][1],
+                    "rear_left": brake_pads[i][2],
+                    "rear_right": brake_pads[i][3]
+                },
+                "odometer": vehicle["current_mileage"],
+                "last_update": last_update
+            }
+            for i, vehicle in enumerate(vehicles)
+        ]
 
 
-    
     def generate_failure_scenario(self, vehicle: Dict[str, Any], index: int) -> Dict[str, Any]:
         """Generate realistic failure scenario for a vehicle"""
         scenarios = [
@@ -290,8 +436,32 @@ class SyntheticVehicleGenerator:
     
     def save_to_json(self, filepath: str = "synthetic_vehicles.json"):
         """Save vehicles to JSON file"""
-        with open(filepath, 'w') as f:
-            json.dump(self.vehicles, f, indent=2)
+        if ORJSON_AVAILABLE:
+            # Same bytes as json.dump(..., indent=2), written one vehicle at a
+            # time so only a single encoded vehicle is held in memory
+            with open(filepath, 'wb') as f:
+                if not self.vehicles:
+                    f.write(b"[]")
+                else:
+                    separator = b"[\n  "
+                    for vehicle in self.vehicles:
+                        f.write(separator)
+                        f.write(orjson.dumps(vehicle, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+                        separator = b",\n  "
+                    f.write(b"\n]")
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(self.vehicles, f, indent=2)
+        print(f"Saved {len(self.vehicles)} vehicles to {filepath}")
+    
+    def save_to_ndjson(self, filepath: str = "synthetic_vehicles.ndjson"):
+        """Save vehicles as newline-delimited JSON (one compact vehicle per line)"""
+        with open(filepath, 'wb') as f:
+            for vehicle in self.vehicles:
+                if ORJSON_AVAILABLE:
+                    f.write(orjson.dumps(vehicle, option=orjson.OPT_APPEND_NEWLINE))
+                else:
+                    f.write(json.dumps(vehicle, separators=(",", ":")).encode() + b"\n")
         print(f"Saved {len(self.vehicles)} vehicles to {filepath}")
     
     def get_vehicle_by_vin(self, vin: str) -> Dict[str, Any]:
@@ -303,6 +473,14 @@ class SyntheticVehicleGenerator:
         return self.vehicles
 
 
+def _generate_chunk(args: Tuple[int, int, datetime, np.random.SeedSequence]) -> List[Dict[str, Any]]:
+    """Worker entry point for generate_all_vehicles: one chunk of complete vehicles"""
+    first_index, count, current_time, seed = args
+    generator = SyntheticVehicleGenerator(num_vehicles=count, seed=seed)
+    generator.current_time = current_time
+    return generator._generate_complete_vehicles(first_index, count)
+
+
 if __name__ == "__main__":
     # Generate synthetic vehicles
     generator = SyntheticVehicleGenerator(num_vehicles=10)
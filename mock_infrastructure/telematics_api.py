@@ -7,17 +7,134 @@ import json
 import random
 import math
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
+import numpy as np
 from fastapi import FastAPI, WebSocket
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import uvicorn
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    class ORJSONResponse(JSONResponse):
+        """JSON response encoded with orjson (several times faster than stdlib json)"""
+        
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content)
+
+
+# Used for every response, including the ones endpoints build themselves
+APIResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+app = FastAPI(
+    title="Vehicle Telematics API",
+    version="1.0.0",
+    default_response_class=APIResponse
+)
+
+# Failure indicator bits in TelematicsFleet.failure_flags (applied in this order)
+_ENGINE_TEMP_RISING = 1
+_BATTERY_DECREASING = 2
+_BATTERY_FLUCTUATING = 4
+_BRAKE_PADS_CRITICAL = 8
+_COOLANT_HIGH = 16
+_TIRES_IMBALANCED = 32
+
+# (sensor, trend) in a scenario's telematics_indicators -> indicator bit
+_FAILURE_FLAGS = {
+    ("engine_temperature", "increasing"): _ENGINE_TEMP_RISING,
+    ("battery_voltage", "decreasing"): _BATTERY_DECREASING,
+    ("battery_voltage", "fluctuating"): _BATTERY_FLUCTUATING,
+    ("brake_pad_thickness", "critical"): _BRAKE_PADS_CRITICAL,
+    ("coolant_temperature", "high"): _COOLANT_HIGH,
+    ("tire_pressure", "imbalanced"): _TIRES_IMBALANCED,
+}
+
+# Uniform [0, 1) draws per vehicle per tick taken by the Numba kernel
+_TICK_NOISE_COLUMNS = 15
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _telematics_tick_kernel(
+        time_delta, time_elapsed, drive_cycle_time, is_driving,
+        engine_temperature, coolant_temperature, oil_pressure, battery_voltage,
+        speed, rpm, fuel_level, odometer, tire_pressure, brake_pad_thickness,
+        condition, failure_flags, noise
+    ):
+        """One TelematicsFleet tick for every vehicle, compiled to a parallel loop (updates in place)"""
+        for i in prange(time_elapsed.shape[0]):
+            time_elapsed[i] += time_delta
+            driving = time_elapsed[i] % 5400 < 1800
+            is_driving[i] = driving
+            
+            if driving:
+                drive_cycle_time[i] += time_delta
+                vehicle_speed = 30 + 40 * np.sin(drive_cycle_time[i] / 100) + noise[i, 0] * 10 - 5
+                vehicle_speed = min(70.0, max(0.0, vehicle_speed))
+                vehicle_rpm = 1500 + vehicle_speed * 30 + noise[i, 1] * 200 - 100
+                target_temp = 205 + noise[i, 2] * 10 - 5
+                engine = engine_temperature[i] + (target_temp - engine_temperature[i]) * 0.1
+                speed[i] = vehicle_speed
+                rpm[i] = vehicle_rpm
+                engine_temperature[i] = engine
+                coolant_temperature[i] = engine - 5 + noise[i, 3] * 4 - 2
+                oil_pressure[i] = 30 + vehicle_rpm / 100 + noise[i, 4] * 4 - 2
+                battery_voltage[i] = 13.8 + noise[i, 5] * 0.4 - 0.2
+                fuel_level[i] = max(0.0, fuel_level[i] - 0.01)
+                odometer[i] += vehicle_speed / 720
+            else:
+                drive_cycle_time[i] = 0.0
+                engine = engine_temperature[i] + (75 - engine_temperature[i]) * 0.05
+                speed[i] = 0.0
+                rpm[i] = 0.0
+                engine_temperature[i] = engine
+                coolant_temperature[i] = engine
+                oil_pressure[i] = 0.0
+                battery_voltage[i] = max(11.5, battery_voltage[i] - 0.001)
+            
+            flags = failure_flags[i]
+            if flags == 0:
+                continue
+            if flags & _ENGINE_TEMP_RISING:
+                engine_temperature[i] += noise[i, 6] * 2
+            if flags & _BATTERY_DECREASING:
+                battery_voltage[i] -= (100 - condition[i]) / 100 * 0.5 * 0.01
+            if flags & _BATTERY_FLUCTUATING:
+                battery_voltage[i] += noise[i, 7] - 0.5
+            if flags & _BRAKE_PADS_CRITICAL:
+                for wheel in range(brake_pad_thickness.shape[1]):
+                    brake_pad_thickness[i, wheel] = 12.0 * (condition[i] / 100) + noise[i, 8 + wheel] - 0.5
+            if flags & _COOLANT_HIGH:
+                coolant_temperature[i] += noise[i, 12] * 3
+            if flags & _TIRES_IMBALANCED:
+                tire_pressure[i, 0] = 32.0 - noise[i, 13] * 3
+                tire_pressure[i, 1] = 32.0 + noise[i, 14] * 3
 
-app = FastAPI(title="Vehicle Telematics API", version="1.0.0")
 
 # Global vehicle data storage
 vehicles_data = {}
 
+# Pre-encoded bodies: the vehicle list is fixed after loading and telemetry
+# only changes once per update tick, so they are encoded once there instead
+# of on every request
+_vehicles_body = b""
+_all_telemetry_body = b""
+# Per-vin /api/telemetry/{vin} bodies and /api/stream/{vin} text frames
+_telemetry_bodies: Dict[str, bytes] = {}
+_stream_frames: Dict[str, str] = {}
+
 
 class TelematicsSimulator:
     """Simulates realistic telematics data with time-based variations"""
@@ -25,14 +142,26 @@ class TelematicsSimulator:
     def __init__(self, vehicle: Dict[str, Any]):
         self.vehicle = vehicle
         self.vin = vehicle["vin"]
-        self.telematics = vehicle["telematics"].copy()
+        # Updated in place, so the vehicle dict always holds the latest values
+        self.telematics = vehicle["telematics"]
         self.failure_scenario = vehicle.get("failure_scenario", {})
         self.time_elapsed = 0
         self.is_driving = False
         self.drive_cycle_time = 0
     
-    def update_telematics(self, time_delta: float = 5.0) -> Dict[str, Any]:
-        """Update telematics with realistic variations"""
+    def update_telematics(self, time_delta: float = 5.0, now_iso: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Update telematics with realistic variations
+        
+        Args:
+            time_delta: Seconds since the previous update
+            now_iso: Timestamp for last_update; callers updating many vehicles
+                per tick pass one shared value (current UTC time if None)
+            
+        Returns:
+            The vehicle's telematics dict itself (not a copy), so it keeps
+            changing with later updates
+        """
         self.time_elapsed += time_delta
         
         # Simulate driving cycles (drive for 30 min, stop for 60 min)
@@ -52,9 +181,9 @@ class TelematicsSimulator:
         self._apply_failure_effects()
         
         # Update timestamp
-        self.telematics["last_update"] = datetime.utcnow().isoformat()
+        self.telematics["last_update"] = now_iso or datetime.utcnow().isoformat()
         
-        return self.telematics.copy()
+        return self.telematics
     
     def _update_driving_state(self):
         """Update telematics during driving"""
@@ -140,30 +269,305 @@ class TelematicsSimulator:
                 self.telematics["tire_pressure"]["front_right"] = 32.0 + random.uniform(0, 3)
 
 
-# Initialize simulators
-simulators = {}
+class TelematicsFleet:
+    """
+    Telematics for many vehicles stored as parallel arrays (one entry per vehicle)
+    
+    Applies the same driving/idle cycle and failure effects as
+    TelematicsSimulator, but each tick updates every vehicle with one array
+    operation per field instead of a Python loop over vehicles. Values are
+    float64 so they serialize exactly like the per-vehicle floats did.
+    """
+    
+    # Order of the columns in the tire_pressure and brake_pad_thickness arrays
+    WHEEL_POSITIONS = ("front_left", "front_right", "rear_left", "rear_right")
+    
+    def __init__(self, vehicles: Sequence[Dict[str, Any]], seed: Optional[int] = None):
+        self.vins = [vehicle["vin"] for vehicle in vehicles]
+        self._rng = np.random.default_rng(seed)
+        count = len(self.vins)
+        telematics = [vehicle["telematics"] for vehicle in vehicles]
+        
+        def column(key: str) -> np.ndarray:
+            return np.fromiter((t[key] for t in telematics), dtype=np.float64, count=count)
+        
+        def wheels(key: str) -> np.ndarray:
+            return np.array(
+                [[t[key][position] for position in self.WHEEL_POSITIONS] for t in telematics],
+                dtype=np.float64
+            ).reshape(count, len(self.WHEEL_POSITIONS))
+        
+        self.engine_temperature = column("engine_temperature")
+        self.coolant_temperature = column("coolant_temperature")
+        self.oil_pressure = column("oil_pressure")
+        self.battery_voltage = column("battery_voltage")
+        self.speed = column("speed")
+        self.rpm = column("rpm")
+        self.fuel_level = column("fuel_level")
+        self.odometer = column("odometer")
+        self.tire_pressure = wheels("tire_pressure")
+        self.brake_pad_thickness = wheels("brake_pad_thickness")
+        
+        self.time_elapsed = np.zeros(count, dtype=np.float64)
+        self.drive_cycle_time = np.zeros(count, dtype=np.float64)
+        self.is_driving = np.zeros(count, dtype=bool)
+        
+        # Failure scenarios never change, so resolve their indicators to
+        # bit flags (and, for the NumPy path, affected indices) once
+        scenarios = [vehicle.get("failure_scenario", {}) for vehicle in vehicles]
+        self.condition = np.fromiter(
+            (s.get("current_condition_percent", 100) for s in scenarios), dtype=np.float64, count=count
+        )
+        self.failure_flags = np.fromiter(
+            (
+                sum(
+                    _FAILURE_FLAGS.get(indicator, 0)
+                    for indicator in s.get("telematics_indicators", {}).items()
+                ) if s.get("has_issue") else 0
+                for s in scenarios
+            ),
+            dtype=np.int8,
+            count=count
+        )
+        
+        def affected(flag: int) -> np.ndarray:
+            return np.flatnonzero(self.failure_flags & flag)
+        
+        self._engine_temp_rising = affected(_ENGINE_TEMP_RISING)
+        self._battery_decreasing = affected(_BATTERY_DECREASING)
+        self._battery_fluctuating = affected(_BATTERY_FLUCTUATING)
+        self._brake_pads_critical = affected(_BRAKE_PADS_CRITICAL)
+        self._coolant_high = affected(_COOLANT_HIGH)
+        self._tires_imbalanced = affected(_TIRES_IMBALANCED)
+    
+    def __len__(self) -> int:
+        return len(self.vins)
+    
+    def update_telematics(self, time_delta: float = 5.0) -> None:
+        """Advance every vehicle by one tick (Numba kernel when available, NumPy otherwise)"""
+        if NUMBA_AVAILABLE:
+            _telematics_tick_kernel(
+                time_delta, self.time_elapsed, self.drive_cycle_time, self.is_driving,
+                self.engine_temperature, self.coolant_temperature, self.oil_pressure, self.battery_voltage,
+                self.speed, self.rpm, self.fuel_level, self.odometer, self.tire_pressure, self.brake_pad_thickness,
+                self.condition, self.failure_flags, self._rng.random((len(self.vins), _TICK_NOISE_COLUMNS))
+            )
+            return
+        
+        uniform = self._rng.uniform
+        count = len(self.vins)
+        
+        # Simulate driving cycles (drive for 30 min every 90 minutes)
+        self.time_elapsed += time_delta
+        driving = self.time_elapsed % 5400 < 1800
+        self.is_driving = driving
+        self.drive_cycle_time = np.where(driving, self.drive_cycle_time + time_delta, 0.0)
+        
+        # Driving: speed 30-70 mph, RPM/oil pressure follow speed, engine warms up
+        speed = np.clip(30 + 40 * np.sin(self.drive_cycle_time / 100) + uniform(-5, 5, count), 0, 70)
+        rpm = 1500 + speed * 30 + uniform(-100, 100, count)
+        target_temp = 205 + uniform(-5, 5, count)
+        engine_driving = self.engine_temperature + (target_temp - self.engine_temperature) * 0.1
+        
+        # Idle: engine cools towards ambient, battery slowly drains
+        engine_idle = self.engine_temperature + (75 - self.engine_temperature) * 0.05
+        
+        self.speed = np.where(driving, speed, 0.0)
+        self.rpm = np.where(driving, rpm, 0.0)
+        self.engine_temperature = np.where(driving, engine_driving, engine_idle)
+        self.coolant_temperature = np.where(
+            driving, engine_driving - 5 + uniform(-2, 2, count), engine_idle
+        )
+        self.oil_pressure = np.where(driving, 30 + rpm / 100 + uniform(-2, 2, count), 0.0)
+        self.battery_voltage = np.where(
+            driving, 13.8 + uniform(-0.2, 0.2, count), np.maximum(11.5, self.battery_voltage - 0.001)
+        )
+        self.fuel_level = np.where(driving, np.maximum(0, self.fuel_level - 0.01), self.fuel_level)
+        self.odometer += self.speed / 720  # miles per 5 seconds
+        
+        self._apply_failure_effects()
+    
+    def _apply_failure_effects(self) -> None:
+        """Apply failure scenario effects to the affected vehicles"""
+        uniform = self._rng.uniform
+        
+        idx = self._engine_temp_rising
+        self.engine_temperature[idx] += uniform(0, 2, len(idx))
+        
+        idx = self._battery_decreasing
+        self.battery_voltage[idx] -= (100 - self.condition[idx]) / 100 * 0.5 * 0.01
+        
+        idx = self._battery_fluctuating
+        self.battery_voltage[idx] += uniform(-0.5, 0.5, len(idx))
+        
+        idx = self._brake_pads_critical
+        self.brake_pad_thickness[idx] = (
+            12.0 * (self.condition[idx] / 100)[:, None] + uniform(-0.5, 0.5, (len(idx), len(self.WHEEL_POSITIONS)))
+        )
+        
+        idx = self._coolant_high
+        self.coolant_temperature[idx] += uniform(0, 3, len(idx))
+        
+        idx = self._tires_imbalanced
+        self.tire_pressure[idx, 0] = 32.0 + uniform(-3, 0, len(idx))
+        self.tire_pressure[idx, 1] = 32.0 + uniform(0, 3, len(idx))
+    
+    def to_dict(self, index: int) -> Dict[str, Any]:
+        """Telematics of one vehicle in the per-vehicle dict layout"""
+        return {
+            "engine_temperature": float(self.engine_temperature[index]),
+            "oil_pressure": float(self.oil_pressure[index]),
+            "battery_voltage": float(self.battery_voltage[index]),
+            "coolant_temperature": float(self.coolant_temperature[index]),
+            "rpm": float(self.rpm[index]),
+            "speed": float(self.speed[index]),
+            "fuel_level": float(self.fuel_level[index]),
+            "tire_pressure": dict(zip(self.WHEEL_POSITIONS, self.tire_pressure[index].tolist())),
+            "brake_pad_thickness": dict(zip(self.WHEEL_POSITIONS, self.brake_pad_thickness[index].tolist())),
+            "odometer": float(self.odometer[index]),
+            "last_update": datetime.utcnow().isoformat()
+        }
+    
+    def write_back(self, telematics: Sequence[Dict[str, Any]], now_iso: Optional[str] = None) -> None:
+        """
+        Copy the current values into per-vehicle telematics dicts in place
+        
+        Args:
+            telematics: One dict per vehicle, in fleet order
+            now_iso: Timestamp for last_update (current UTC time if None)
+        """
+        now = now_iso or datetime.utcnow().isoformat()
+        columns = zip(
+            self.engine_temperature.tolist(),
+            self.oil_pressure.tolist(),
+            self.battery_voltage.tolist(),
+            self.coolant_temperature.tolist(),
+            self.rpm.tolist(),
+            self.speed.tolist(),
+            self.fuel_level.tolist(),
+            self.tire_pressure.tolist(),
+            self.brake_pad_thickness.tolist(),
+            self.odometer.tolist()
+        )
+        for t, (engine, oil, battery, coolant, rpm, speed, fuel, tires, pads, odometer) in zip(telematics, columns):
+            t["engine_temperature"] = engine
+            t["oil_pressure"] = oil
+            t["battery_voltage"] = battery
+            t["coolant_temperature"] = coolant
+            t["rpm"] = rpm
+            t["speed"] = speed
+            t["fuel_level"] = fuel
+            t["tire_pressure"].update(zip(self.WHEEL_POSITIONS, tires))
+            t["brake_pad_thickness"].update(zip(self.WHEEL_POSITIONS, pads))
+            t["odometer"] = odometer
+            t["last_update"] = now
+
+
+# Telematics for all loaded vehicles (set by load_vehicles)
+fleet: Optional[TelematicsFleet] = None
+
+
+def _dumps(data: Any) -> bytes:
+    """Encode a JSON body (orjson when available, stdlib json otherwise)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+
+def _refresh_vehicles_body() -> None:
+    """Re-encode the /api/vehicles body"""
+    global _vehicles_body
+    _vehicles_body = _dumps({
+        "count": len(vehicles_data),
+        "vehicles": [
+            {
+                "vin": v["vin"],
+                "model": v["model"],
+                "year": v["year"],
+                "mileage": v["current_mileage"],
+                "owner": v["owner"]["name"]
+            }
+            for v in vehicles_data.values()
+        ]
+    })
+
+
+def _refresh_all_telemetry_body(now_iso: Optional[str] = None) -> None:
+    """Re-encode the /api/telemetry/all body from the current telemetry"""
+    global _all_telemetry_body
+    _all_telemetry_body = _dumps({
+        "timestamp": now_iso or datetime.utcnow().isoformat(),
+        "count": len(vehicles_data),
+        "vehicles": [
+            {
+                "vin": vin,
+                "model": f"{v['year']} {v['model']}",
+                "telemetry": v["telematics"]
+            }
+            for vin, v in vehicles_data.items()
+        ]
+    })
+
+
+def _refresh_vin_payloads(now_iso: Optional[str] = None) -> None:
+    """Re-encode every vehicle's telemetry body and stream frame"""
+    now_iso = now_iso or datetime.utcnow().isoformat()
+    for vin, vehicle in vehicles_data.items():
+        _telemetry_bodies[vin] = _dumps({
+            "vin": vin,
+            "model": f"{vehicle['year']} {vehicle['model']}",
+            "telemetry": vehicle["telematics"],
+            "failure_scenario": vehicle.get("failure_scenario", {})
+        })
+        _stream_frames[vin] = _dumps({
+            "vin": vin,
+            "timestamp": now_iso,
+            "telemetry": vehicle["telematics"]
+        }).decode()
+
+
+async def send_json(websocket: WebSocket, data: Dict[str, Any]) -> None:
+    """Send a JSON text frame (encoded with orjson when available)"""
+    if ORJSON_AVAILABLE:
+        await websocket.send_text(orjson.dumps(data).decode())
+    else:
+        await websocket.send_json(data)
+
+
+def _read_vehicles(filepath: str) -> List[Dict[str, Any]]:
+    """Read a vehicles file: a JSON array, or one vehicle per line if it ends in .ndjson"""
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    if filepath.endswith(".ndjson"):
+        with open(filepath, 'rb') as f:
+            return [loads(line) for line in f if line.strip()]
+    with open(filepath, 'rb') as f:
+        return loads(f.read())
 
 
 def load_vehicles():
     """Load vehicles from synthetic data"""
-    global vehicles_data, simulators
+    global vehicles_data, fleet
     
     import os
     
-    # Try multiple possible paths
+    # Try multiple possible paths; the NDJSON form (save_to_ndjson) is
+    # preferred since it is parsed one vehicle per line
     possible_paths = [
-        "synthetic_vehicles.json",  # Running from mock_infrastructure
-        "mock_infrastructure/synthetic_vehicles.json",  # Running from root
-        os.path.join(os.path.dirname(__file__), "synthetic_vehicles.json")  # Relative to this file
+        os.path.join(directory, filename)
+        for filename in ("synthetic_vehicles.ndjson", "synthetic_vehicles.json")
+        for directory in (
+            "",  # Running from mock_infrastructure
+            "mock_infrastructure",  # Running from root
+            os.path.dirname(__file__)  # Relative to this file
+        )
     ]
     
     vehicles = None
     for filepath in possible_paths:
         try:
-            with open(filepath, 'r') as f:
-                vehicles = json.load(f)
-                print(f"Loaded vehicles from: {filepath}")
-                break
+            vehicles = _read_vehicles(filepath)
+            print(f"Loaded vehicles from: {filepath}")
+            break
         except FileNotFoundError:
             continue
     
@@ -176,9 +580,8 @@ def load_vehicles():
         return
     
     for vehicle in vehicles:
-        vin = vehicle["vin"]
-        vehicles_data[vin] = vehicle
-        simulators[vin] = TelematicsSimulator(vehicle)
+        vehicles_data[vehicle["vin"]] = vehicle
+    fleet = TelematicsFleet(list(vehicles_data.values()))
         
     print(f"Loaded {len(vehicles)} vehicles")
 
@@ -187,6 +590,9 @@ def load_vehicles():
 async def startup_event():
     """Load vehicles on startup"""
     load_vehicles()
+    _refresh_vehicles_body()
+    _refresh_all_telemetry_body()
+    _refresh_vin_payloads()
     # Start background telemetry updates
     asyncio.create_task(update_telemetry_loop())
 
@@ -194,8 +600,13 @@ async def startup_event():
 async def update_telemetry_loop():
     """Background task to update telemetry every 5 seconds"""
     while True:
-        for vin, simulator in simulators.items():
-            vehicles_data[vin]["telematics"] = simulator.update_telematics()
+        # One timestamp per tick, shared by every vehicle and the cached bodies
+        now_iso = datetime.utcnow().isoformat()
+        if fleet is not None:
+            fleet.update_telematics()
+            fleet.write_back([vehicles_data[vin]["telematics"] for vin in fleet.vins], now_iso)
+        _refresh_all_telemetry_body(now_iso)
+        _refresh_vin_payloads(now_iso)
         await asyncio.sleep(5)
 
 
@@ -217,75 +628,42 @@ async def root():
 @app.get("/api/vehicles")
 async def get_vehicles():
     """Get list of all vehicles"""
-    return {
-        "count": len(vehicles_data),
-        "vehicles": [
-            {
-                "vin": v["vin"],
-                "model": v["model"],
-                "year": v["year"],
-                "mileage": v["current_mileage"],
-                "owner": v["owner"]["name"]
-            }
-            for v in vehicles_data.values()
-        ]
-    }
+    return Response(content=_vehicles_body, media_type="application/json")
+
+
+# Registered before /api/telemetry/{vin}, which would otherwise match "all"
+@app.get("/api/telemetry/all")
+async def get_all_telemetry():
+    """Get telemetry for all vehicles (as of the last update tick)"""
+    return Response(content=_all_telemetry_body, media_type="application/json")
 
 
 @app.get("/api/telemetry/{vin}")
 async def get_telemetry(vin: str):
-    """Get current telemetry for a vehicle"""
-    if vin not in vehicles_data:
-        return JSONResponse(
+    """Get current telemetry for a vehicle (as of the last update tick)"""
+    body = _telemetry_bodies.get(vin)
+    if body is None:
+        return APIResponse(
             status_code=404,
             content={"error": f"Vehicle {vin} not found"}
         )
     
-    vehicle = vehicles_data[vin]
-    return {
-        "vin": vin,
-        "model": f"{vehicle['year']} {vehicle['model']}",
-        "telemetry": vehicle["telematics"],
-        "failure_scenario": vehicle.get("failure_scenario", {})
-    }
-
-
-@app.get("/api/telemetry/all")
-async def get_all_telemetry():
-    """Get telemetry for all vehicles"""
-    return {
-        "timestamp": datetime.utcnow().isoformat(),
-        "count": len(vehicles_data),
-        "vehicles": [
-            {
-                "vin": vin,
-                "model": f"{v['year']} {v['model']}",
-                "telemetry": v["telematics"]
-            }
-            for vin, v in vehicles_data.items()
-        ]
-    }
+    return Response(content=body, media_type="application/json")
 
 
 @app.websocket("/api/stream/{vin}")
 async def stream_telemetry(websocket: WebSocket, vin: str):
-    """Stream telemetry data via WebSocket"""
+    """Stream telemetry data via WebSocket (one frame per update tick)"""
     await websocket.accept()
     
-    if vin not in vehicles_data:
-        await websocket.send_json({"error": f"Vehicle {vin} not found"})
+    if vin not in _stream_frames:
+        await send_json(websocket, {"error": f"Vehicle {vin} not found"})
         await websocket.close()
         return
     
     try:
         while True:
-            vehicle = vehicles_data[vin]
-            data = {
-                "vin": vin,
-                "timestamp": datetime.utcnow().isoformat(),
-                "telemetry": vehicle["telematics"]
-            }
-            await websocket.send_json(data)
+            await websocket.send_text(_stream_frames[vin])
             await asyncio.sleep(5)
     except Exception as e:
         print(f"WebSocket error: {e}")
@@ -3,6 +3,7 @@ Test Suite for Async Inter-Agent Communication System
 Validates message passing, timeout handling, and workflow coordination
 """
 import asyncio
+import numpy as np
 import pytest
 from datetime import datetime
 
@@ -16,6 +17,8 @@ from async_master_orchestrator import AsyncMasterOrchestrator
 from async_data_analysis_agent import AsyncDataAnalysisAgent
 from async_customer_engagement_agent import AsyncCustomerEngagementAgent
 from async_scheduling_agent import AsyncSchedulingAgent
+from ueba_monitor import UEBAMonitor
+from ueba_integration import UEBAIntegration
 
 
 class TestMessageQueue:
@@ -151,6 +154,32 @@ class TestMessageQueue:
         assert log[-1]["channel"] == "test.channel"
         
         await queue.stop()
+    
+    def test_header_reply_for(self):
+        """Test reply headers keep the parent's correlation and point back at it"""
+        parent = MessageHeader(
+            sender=AgentType.MASTER_ORCHESTRATOR.value,
+            receiver=AgentType.DATA_ANALYSIS.value,
+            message_type=MessageType.ANALYSIS_REQUEST.value
+        ).to_dict()
+        
+        reply = MessageHeader.reply_for(
+            parent,
+            sender=AgentType.DATA_ANALYSIS.value,
+            receiver=AgentType.MASTER_ORCHESTRATOR.value,
+            message_type=MessageType.ANALYSIS_RESULT.value,
+            priority=MessagePriority.HIGH.value
+        )
+        
+        assert reply.correlation_id == parent["correlation_id"]
+        assert reply.reply_to == parent["message_id"]
+        assert reply.message_id != parent["message_id"]
+        assert reply.sender == AgentType.DATA_ANALYSIS.value
+        assert reply.priority == MessagePriority.HIGH.value
+        
+        orphan = MessageHeader.reply_for({}, "a", "b", MessageType.ANALYSIS_RESULT.value)
+        assert orphan.correlation_id
+        assert orphan.reply_to is None
 
 
 class TestTimeoutHandler:
@@ -470,6 +499,378 @@ class TestMonitoring:
         await data_agent.stop()
         await queue.stop()
 
+    @pytest.mark.asyncio
+    async def test_ueba_integration_header_timestamps(self, caplog):
+        """Test monitored messages reach UEBA with ISO timestamps (headers carry epoch ns)"""
+        queue = InMemoryMessageQueue()
+        monitor = UEBAMonitor()
+        integration = UEBAIntegration(monitor, queue)
+        
+        await queue.start()
+        await integration.start()
+        
+        header = MessageHeader(
+            sender=AgentType.MASTER_ORCHESTRATOR.value,
+            receiver=AgentType.DATA_ANALYSIS.value,
+            message_type=MessageType.ANALYSIS_REQUEST.value
+        )
+        assert isinstance(header.timestamp, int)
+        
+        message = AnalysisRequestMessage(header=header, payload={"vehicle_id": "VEH-UEBA"})
+        await queue.publish("channel.system.monitoring", message.to_dict())
+        
+        await asyncio.sleep(0.1)
+        
+        assert "Error processing monitoring message" not in caplog.text
+        
+        audit = monitor.get_audit_log(agent_id=AgentType.MASTER_ORCHESTRATOR.value)
+        assert len(audit) == 1
+        logged_at = datetime.fromisoformat(audit[0]["timestamp"])
+        sent_at = datetime.utcfromtimestamp(header.timestamp / 1_000_000_000)
+        assert abs((logged_at - sent_at).total_seconds()) < 0.001
+        
+        await integration.stop()
+        await queue.stop()
+
+
+
+class TestManufacturingInsights:
+    """Test manufacturing insights exports"""
+    
+    @pytest.mark.asyncio
+    async def test_streaming_exports_match(self, tmp_path):
+        """Test streaming exporters write the same data as the indented exporters"""
+        import json
+        from manufacturing_insights_module import ManufacturingInsightsModule, FailureSeverity
+        
+        module = ManufacturingInsightsModule(urgent_failure_threshold=3)
+        for i in range(8):
+            await module.ingest_failure_data(
+                vehicle_id=f"VH{i:03d}",
+                vehicle_model="Model X",
+                vehicle_year=2022,
+                manufacturing_batch="BATCH-01",
+                component="brake_pads",
+                failure_mode="premature_wear",
+                severity=FailureSeverity.HIGH,
+                mileage=20000 + i * 1000,
+                diagnosis_data={"dtc": "C1234"},
+                customer_feedback={"rating": 2}
+            )
+        analyses = await module.perform_root_cause_analysis()
+        reports = await module.generate_capa_reports(analyses)
+        reports[0].implementation_date = datetime.utcnow().isoformat()
+        await module.measure_impact(reports[0].report_id)
+        
+        exports = [
+            (module.export_capa_reports, module.export_capa_reports_streaming),
+            (module.export_failure_records, module.export_failure_records_streaming),
+            (module.export_impact_measurements, module.export_impact_measurements_streaming)
+        ]
+        for export, export_streaming in exports:
+            indented = tmp_path / f"{export.__name__}.json"
+            compact = tmp_path / f"{export_streaming.__name__}.json"
+            export(str(indented))
+            export_streaming(str(compact))
+            
+            expected = json.loads(indented.read_text())
+            actual = json.loads(compact.read_text())
+            assert list(actual) == list(expected)
+            expected.pop("export_date")
+            actual.pop("export_date")
+            assert actual == expected
+        
+        assert expected["measurements"][reports[0].report_id]
+
+
+class TestMasterOrchestrator:
+    """Test synchronous master orchestrator queries"""
+    
+    def test_find_workflows(self):
+        """Test find_workflows filters on state, priority, urgency and retries"""
+        from master_orchestrator import MasterOrchestrator, WorkflowState, TaskPriority
+        
+        orchestrator = MasterOrchestrator(max_workers=1)
+        urgent = orchestrator.receive_vehicle_telemetry("V1", {"brake_failure": True})
+        high = orchestrator.receive_vehicle_telemetry("V2", {"battery_low": True})
+        routine = orchestrator.receive_vehicle_telemetry("V3", {"engine_temp": 90.0})
+        
+        orchestrator.process_data_analysis_results(high, {"anomalies_detected": 2})
+        orchestrator.process_diagnosis_results(high, {
+            "failure_probability": 0.9,
+            "severity_score": 0.9,
+            "estimated_days_to_failure": 2
+        })
+        
+        assert orchestrator.find_workflows() == [urgent, high, routine]
+        assert orchestrator.find_workflows(state=WorkflowState.DATA_ANALYSIS) == [urgent, routine]
+        assert orchestrator.find_workflows(priority=TaskPriority.URGENT) == [urgent, high]
+        assert orchestrator.find_workflows(priority=TaskPriority.ROUTINE) == [routine]
+        assert orchestrator.find_workflows(min_urgency=0.7) == [high]
+        assert orchestrator.find_workflows(
+            state=WorkflowState.DATA_ANALYSIS, priority=TaskPriority.URGENT
+        ) == [urgent]
+        assert orchestrator.find_workflows(min_retries=1) == []
+
+
+class TestMockInfrastructure:
+    """Test mock infrastructure components"""
+    
+    def test_booking_store_capacity(self):
+        """Test try_book refuses bookings once a slot is at capacity"""
+        pytest.importorskip("fastapi")
+        from mock_infrastructure.service_scheduler_api import BookingStore
+        
+        store = BookingStore(":memory:")
+        slot_key = "SC001_2024-01-01T09:00:00"
+        
+        assert store.try_book(slot_key, 2) == 1
+        assert store.try_book(slot_key, 2) == 2
+        assert store.try_book(slot_key, 2) is None
+        assert store.try_book("SC001_2024-01-01T10:00:00", 2) == 1
+        
+        counts = store.counts_between("SC001_2024-01-01T00:00:00", "SC001_2024-01-01T23:59:59")
+        assert counts == {slot_key: 2, "SC001_2024-01-01T10:00:00": 1}
+    
+    def test_service_record_ids_not_reused(self, tmp_path):
+        """Test batched service record ids continue past deleted records"""
+        from mock_infrastructure.maintenance_database import MaintenanceDatabase
+        
+        db = MaintenanceDatabase(str(tmp_path / "maintenance.db"))
+        db.initialize_schema()
+        
+        def record(service_name):
+            return {
+                "vin": "VIN001", "service_date": "2024-01-01", "mileage": 1000,
+                "service_type": "routine", "services_performed": [service_name],
+                "parts_replaced": [{"name": f"{service_name}_part"}]
+            }
+        
+        assert db.add_service_record(**record("a")) == 1
+        assert db.add_service_record(**record("b")) == 2
+        db.cursor.execute("DELETE FROM service_records WHERE id = 2")
+        db.conn.commit()
+        
+        assert db.add_service_records([record("c"), record("d")]) == [3, 4]
+        assert db.add_service_record(**record("e")) == 5
+        
+        history = {r["id"]: r for r in db.get_service_history("VIN001")}
+        assert sorted(history) == [1, 3, 4, 5]
+        assert history[3]["services_performed"] == ["c"]
+        assert history[4]["services_performed"] == ["d"]
+        assert [p["part_name"] for p in history[3]["parts_replaced"]] == ["c_part"]
+        
+        # An open auto_commit=False insert already holds the write lock
+        pending = db.add_service_record(**record("f"), auto_commit=False)
+        assert db.add_service_records([record("g")]) == [pending + 1]
+        db.close()
+    
+    def test_vehicle_generation_independent_of_processes(self, monkeypatch):
+        """Test a seed gives the same fleet in-process and across worker processes"""
+        from mock_infrastructure import synthetic_vehicle_data
+        from mock_infrastructure.synthetic_vehicle_data import SyntheticVehicleGenerator
+        
+        monkeypatch.setattr(synthetic_vehicle_data, "GENERATION_CHUNK_SIZE", 7)
+        monkeypatch.setattr(synthetic_vehicle_data, "PARALLEL_MIN_VEHICLES", 1)
+        
+        fleets = []
+        for processes in (1, 2, 3):
+            generator = SyntheticVehicleGenerator(num_vehicles=30, seed=3)
+            generator.current_time = datetime(2024, 1, 1)
+            fleets.append(generator.generate_all_vehicles(processes=processes))
+        
+        assert [v["vin"] for v in fleets[0]] == [generator.generate_vin(i) for i in range(30)]
+        assert fleets[0] == fleets[1] == fleets[2]
+    
+    def test_save_vehicles(self, tmp_path):
+        """Test NDJSON and JSON vehicle exports round-trip the generated fleet"""
+        import json
+        from mock_infrastructure.synthetic_vehicle_data import SyntheticVehicleGenerator
+        
+        generator = SyntheticVehicleGenerator(num_vehicles=5, seed=9)
+        vehicles = generator.generate_all_vehicles(processes=1)
+        
+        ndjson_path = tmp_path / "vehicles.ndjson"
+        generator.save_to_ndjson(str(ndjson_path))
+        lines = ndjson_path.read_bytes().splitlines()
+        assert len(lines) == 5
+        assert [json.loads(line) for line in lines] == vehicles
+        
+        json_path = tmp_path / "vehicles.json"
+        generator.save_to_json(str(json_path))
+        assert json_path.read_text() == json.dumps(vehicles, indent=2)
+    
+    def test_telematics_fleet(self):
+        """Test TelematicsFleet ticks reproducibly and writes back in place"""
+        pytest.importorskip("fastapi")
+        from mock_infrastructure.synthetic_vehicle_data import SyntheticVehicleGenerator
+        from mock_infrastructure.telematics_api import TelematicsFleet
+        
+        vehicles = SyntheticVehicleGenerator(num_vehicles=12, seed=5).generate_all_vehicles(processes=1)
+        fleet = TelematicsFleet(vehicles, seed=11)
+        twin = TelematicsFleet(vehicles, seed=11)
+        
+        assert len(fleet) == 12
+        initial = fleet.to_dict(0)
+        expected = dict(vehicles[0]["telematics"])
+        initial.pop("last_update")
+        expected.pop("last_update")
+        assert initial == expected
+        
+        issues = [bool(v["failure_scenario"].get("has_issue")) for v in vehicles]
+        assert not fleet.failure_flags[[not issue for issue in issues]].any()
+        
+        start_odometer = fleet.odometer.copy()
+        for _ in range(50):
+            fleet.update_telematics()
+            twin.update_telematics()
+        np.testing.assert_array_equal(fleet.engine_temperature, twin.engine_temperature)
+        np.testing.assert_array_equal(fleet.tire_pressure, twin.tire_pressure)
+        assert (fleet.odometer >= start_odometer).all()
+        
+        telematics = [v["telematics"] for v in vehicles]
+        tires = telematics[3]["tire_pressure"]
+        fleet.write_back(telematics, now_iso="2024-01-01T00:00:00")
+        assert telematics[3]["tire_pressure"] is tires
+        assert telematics[3]["last_update"] == "2024-01-01T00:00:00"
+        assert tires == dict(zip(TelematicsFleet.WHEEL_POSITIONS, fleet.tire_pressure[3].tolist()))
+        assert telematics[3]["odometer"] == fleet.odometer[3]
+    
+    def test_customer_fleet(self):
+        """Test CustomerFleet campaigns and running totals"""
+        from mock_infrastructure.synthetic_vehicle_data import SyntheticVehicleGenerator
+        from mock_infrastructure.customer_interaction_simulator import CustomerFleet
+        
+        vehicles = SyntheticVehicleGenerator(num_vehicles=200, seed=2).generate_all_vehicles(processes=1)
+        fleet = CustomerFleet.from_vehicle_owners(vehicles, personality="cooperative", seed=4)
+        
+        assert len(fleet) == 200
+        assert fleet.names[0] == vehicles[0]["owner"]["name"]
+        assert fleet.personality(0) == "cooperative"
+        
+        first = fleet.receive_notification_batch(urgency="urgent")
+        second = fleet.receive_notification_batch()
+        for batch in (first, second):
+            assert not (batch["accepted"] & ~batch["responded"]).any()
+            assert np.isnan(batch["response_time_minutes"][~batch["responded"]]).all()
+            assert (batch["response_time_minutes"][batch["responded"]] >= 5).all()
+        
+        responded = int(first["responded"].sum() + second["responded"].sum())
+        accepted = int(first["accepted"].sum() + second["accepted"].sum())
+        summary = fleet.get_fleet_summary()
+        assert summary["customers"] == 200
+        assert summary["total_notifications"] == 400
+        assert summary["response_rate"] == responded / 400
+        assert summary["acceptance_rate"] == accepted / responded
+        
+        mixed = CustomerFleet.from_vehicle_owners(vehicles, seed=4)
+        assert len({mixed.personality(i) for i in range(len(mixed))}) > 1
+    
+    @pytest.mark.asyncio
+    async def test_simulate_batch(self):
+        """Test simulate_batch keeps customer order, reports progress and captures failures"""
+        from mock_infrastructure.customer_interaction_simulator import (
+            CustomerInteractionSimulator, simulate_batch
+        )
+        
+        class FailingCustomer(CustomerInteractionSimulator):
+            def receive_notification(self, *args, **kwargs):
+                raise RuntimeError("phone unreachable")
+        
+        customers = [CustomerInteractionSimulator(f"Customer {i}", seed=i) for i in range(12)]
+        customers[5] = FailingCustomer("Customer 5")
+        notification = {"type": "maintenance_alert", "message": "Service due", "urgency": "high"}
+        progress = []
+        
+        results = await simulate_batch(
+            customers, notification, max_concurrency=3,
+            on_progress=lambda done, total, eta: progress.append((done, total, eta))
+        )
+        
+        assert len(results) == 12
+        assert isinstance(results[5], RuntimeError)
+        for i, result in enumerate(results):
+            if i != 5 and result["responded"]:
+                assert result["urgency"] == "high"
+                assert customers[i].interaction_history[-1] is result
+        assert [done for done, _, _ in progress] == list(range(1, 13))
+        assert all(total == 12 for _, total, _ in progress)
+        assert progress[-1][2] == 0
+    
+    @pytest.mark.asyncio
+    async def test_interactions_stream(self):
+        """Test interactions() sees every record even past the history cap"""
+        from mock_infrastructure.customer_interaction_simulator import (
+            CustomerInteractionSimulator, simulate_batch
+        )
+        
+        customer = CustomerInteractionSimulator("Stream Customer", "cooperative", history_cap=2, seed=1)
+        received = []
+        
+        async def collect():
+            async for interaction in customer.interactions():
+                received.append(interaction)
+        
+        collector = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        assert len(customer._listeners) == 1
+        
+        results = await simulate_batch(
+            [customer] * 8, {"type": "reminder", "message": "Service due"}, max_concurrency=4
+        )
+        for _ in range(5):
+            await asyncio.sleep(0)
+        collector.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await collector
+        
+        recorded = [result for result in results if result["responded"]]
+        assert len(recorded) > 2
+        assert len(customer.interaction_history) == 2
+        assert sorted(map(id, received)) == sorted(map(id, recorded))
+        assert customer._listeners == []
+    
+    def test_notification_batch_seed(self):
+        """Test seeded notification batches are reproducible"""
+        from mock_infrastructure.customer_interaction_simulator import (
+            CustomerInteractionSimulator, CustomerFleet
+        )
+        
+        simulators = [
+            CustomerInteractionSimulator(f"Customer {i}", personality)
+            for i, personality in enumerate(list(CustomerInteractionSimulator.PERSONALITIES) * 5)
+        ]
+        
+        def run():
+            results = CustomerInteractionSimulator.receive_notification_batch(
+                simulators, "maintenance_alert", "Service due", urgency="high", seed=7
+            )
+            return [(r["responded"], r.get("response_time_minutes"), r.get("response")) for r in results]
+        
+        assert run() == run()
+        
+        fleet_a = CustomerFleet.from_simulators(simulators, seed=7)
+        fleet_b = CustomerFleet.from_simulators(simulators, seed=7)
+        batch_a = fleet_a.receive_notification_batch(urgency="high")
+        batch_b = fleet_b.receive_notification_batch(urgency="high")
+        assert batch_a.keys() == batch_b.keys()
+        for key in batch_a:
+            np.testing.assert_array_equal(batch_a[key], batch_b[key])
+    
+    def test_utc_iso_now_threads(self):
+        """Test cached timestamps stay well-formed when formatted from worker threads"""
+        from concurrent.futures import ThreadPoolExecutor
+        from mock_infrastructure.customer_interaction_simulator import _utc_iso_now
+        
+        before = datetime.utcnow().replace(microsecond=0)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            stamps = list(pool.map(lambda _: _utc_iso_now(), range(2000)))
+        after = datetime.utcnow()
+        
+        for stamp in stamps:
+            assert len(stamp) == len("2024-01-01T00:00:00.000000")
+            assert before <= datetime.fromisoformat(stamp) <= after
+
 
 if __name__ == "__main__":
     print("Running Async System Tests...")
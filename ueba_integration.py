@@ -17,6 +17,22 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _header_timestamp_iso(timestamp: Any) -> str:
+    """
+    ISO-8601 UTC string for a message header timestamp
+    
+    Headers carry epoch nanoseconds (MessageHeader.timestamp); UEBA events
+    and the monitor's checks expect datetime.isoformat() strings. Strings
+    (older headers) pass through; a missing timestamp means now.
+    """
+    if timestamp is None:
+        return datetime.utcnow().isoformat()
+    if isinstance(timestamp, int):
+        seconds, nanoseconds = divmod(timestamp, 1_000_000_000)
+        return datetime.utcfromtimestamp(seconds).replace(microsecond=nanoseconds // 1000).isoformat()
+    return timestamp
+
+
 class UEBAIntegration:
     """
     Integrates UEBA monitoring with the async agent system
@@ -76,7 +92,7 @@ class UEBAIntegration:
             sender = header.get("sender", "unknown")
             receiver = header.get("receiver", "unknown")
             message_type = header.get("message_type", "unknown")
-            timestamp = header.get("timestamp", datetime.utcnow().isoformat())
+            timestamp = _header_timestamp_iso(header.get("timestamp"))
             correlation_id = header.get("correlation_id")
             
             # Determine action type based on message type